@@ -0,0 +1,18 @@
+import os, secrets
+from fastapi import Header, HTTPException, Request
+
+# 관리자용 API(/jobs, 채점 작업 등록/조회) 접근 제한
+# - ADMIN_API_KEY 를 지정하면 X-Admin-Key 헤더가 같은 요청만 허용
+# - 지정하지 않으면 서버와 같은 호스트(localhost)에서 온 요청만 허용
+ADMIN_API_KEY = os.getenv('ADMIN_API_KEY')
+LOCAL_HOSTS = {'127.0.0.1', '::1', 'localhost'}
+
+def require_admin(request: Request, x_admin_key: str = Header(None)):
+    """ 관리자 API 의존성: Depends(require_admin) """
+    if ADMIN_API_KEY:
+        if x_admin_key is None or not secrets.compare_digest(x_admin_key, ADMIN_API_KEY):
+            raise HTTPException(status_code=401, detail="관리자 인증이 필요합니다.")
+        return
+
+    if request.client is None or request.client.host not in LOCAL_HOSTS:
+        raise HTTPException(status_code=403, detail="관리자 API 는 서버 내부에서만 호출할 수 있습니다.")
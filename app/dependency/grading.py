@@ -0,0 +1,126 @@
+import sys, uuid, asyncio, threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# 예측 채점 서비스 (스케줄러와 /stock-predict/grade-predictions 가 같이 사용, 채점 로직은 data/GradePredictions.py)
+# - stock_data.csv 의 (종목, 날짜) >> 종가 인덱스와 거래일 달력을 메모리에 유지하고, 파일이 바뀌면 다시 로드
+# - 채점은 백그라운드 스레드 1개에서 차례로 실행, 작업 ID 로 진행 상황 조회
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.append(str(BASE_DIR / 'data'))
+from GradePredictions import CSV_PATH, load_price_index, run_grading
+from TradingCalendar import TradingCalendar, load_holidays
+
+# 메모리에 남겨 두는 끝난 작업 수
+GRADING_JOB_HISTORY = 50
+
+class PriceIndexCache():
+    """ 종가 인덱스와 거래일 달력을 한 번만 만들고 stock_data.csv 의 수정 시각/크기가 바뀐 경우에만 다시 로드 """
+    def __init__(self, csv_path=CSV_PATH):
+        self.csv_path = Path(csv_path)
+        self.signature = None
+        self.index = None
+        self.calendar = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        """ Returns: (종가 인덱스, TradingCalendar) """
+        # 로드 전에 시그니처를 읽음 >> 로드 중에 파일이 바뀌면 다음 호출에서 다시 로드
+        stat = self.csv_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if self.index is None or signature != self.signature:
+                self.index = load_price_index(self.csv_path)
+                self.calendar = TradingCalendar.from_price_index(self.index)
+                self.signature = signature
+                print(f"[Grading] Price index loaded ({len(self.index)} rows, {len(self.calendar.days)} trading days)")
+            return self.index, self.calendar
+
+    def get_calendar(self):
+        """
+        거래일 달력 (stock_data.csv 가 없으면 평일/휴장일 규칙만 사용하는 달력)
+
+        다른 스레드(채점 작업 등)가 다시 로드하는 중이면 기다리지 않고 이전에 로드한 달력 사용
+        """
+        if self.calendar is not None and self.lock.locked():
+            return self.calendar
+        try:
+            return self.get()[1]
+        except FileNotFoundError:
+            return TradingCalendar(holidays=load_holidays())
+
+price_cache = PriceIndexCache()
+executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = 'grading')
+jobs = {}
+futures = {}
+jobs_lock = threading.Lock()
+
+def snapshot(job: dict) -> dict:
+    return dict(job, progress = dict(job['progress']))
+
+def update_job(job_id: str, **fields):
+    with jobs_lock:
+        jobs[job_id].update(fields)
+
+def run_job(job_id: str, client, today):
+    update_job(job_id, status = 'running', started_at = datetime.now().isoformat())
+    try:
+        price_index, calendar = price_cache.get()
+        progress = lambda stage, done, total: update_job(job_id, progress = {'stage': stage, 'done': done, 'total': total})
+        result = run_grading(client, price_index, today, progress = progress, calendar = calendar)
+        update_job(job_id, status = 'done', result = result, finished_at = datetime.now().isoformat())
+        print(f"[Grading] Job {job_id} done: {result['graded']}/{result['pending']} graded ({result['start']} ~ {result['end']})")
+    except Exception as e:
+        update_job(job_id, status = 'failed', error = str(e), finished_at = datetime.now().isoformat())
+        print(f"[Grading] Job {job_id} failed: {e}")
+
+def prune_jobs():
+    """ 끝난 작업은 최근 GRADING_JOB_HISTORY 개만 유지 (jobs_lock 안에서 호출) """
+    finished = [job_id for job_id, job in jobs.items() if job['status'] in ('done', 'failed')]
+    for job_id in finished[:max(0, len(finished) - GRADING_JOB_HISTORY)]:
+        jobs.pop(job_id)
+        futures.pop(job_id, None)
+
+def submit(client, today = None) -> dict:
+    """
+    채점 작업을 등록하고 바로 리턴 (채점은 백그라운드 스레드에서 실행)
+
+    같은 날짜의 작업이 이미 대기/실행 중이면 새로 만들지 않고 그 작업을 리턴
+    Returns: {'job_id', 'status', 'today', 'progress', ...}
+    """
+    today = today or datetime.now().date()
+    with jobs_lock:
+        for job in jobs.values():
+            if job['today'] == today.isoformat() and job['status'] in ('queued', 'running'):
+                return snapshot(job)
+
+        job_id = uuid.uuid4().hex
+        jobs[job_id] = {
+            'job_id': job_id,
+            'status': 'queued',
+            'today': today.isoformat(),
+            'progress': {'stage': 'queued', 'done': 0, 'total': 0},
+            'result': None,
+            'error': None,
+            'created_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None
+        }
+        prune_jobs()
+        job = snapshot(jobs[job_id])
+        futures[job_id] = executor.submit(run_job, job_id, client, today)
+    return job
+
+def get_job(job_id: str) -> dict:
+    """ 작업 상태 (없는 작업 ID 면 None) """
+    with jobs_lock:
+        job = jobs.get(job_id)
+        return snapshot(job) if job else None
+
+async def wait(job_id: str) -> dict:
+    """ 이벤트 루프를 막지 않고 작업이 끝날 때까지 기다린 후 최종 상태 리턴 """
+    with jobs_lock:
+        future = futures.get(job_id)
+    if future is not None:
+        await asyncio.wrap_future(future)
+    return get_job(job_id)
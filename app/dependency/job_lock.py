@@ -0,0 +1,104 @@
+import os, json, time, socket
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# 여러 uvicorn 워커(프로세스)가 같은 스케줄러 작업을 한 번만 실행하도록 하는 파일 잠금
+# - 실행 슬롯: 스케줄 작업 1회(작업 ID + 날짜)를 먼저 파일로 만든 워커만 실행 (O_EXCL, 나머지 워커는 건너뜀)
+# - 실행 잠금: 같은 이름의 작업(스케줄 / /jobs 수동 실행)이 다른 워커에서 실행 중이면 시작하지 않음 (프로세스가 죽으면 OS 가 해제)
+# 서버를 여러 대로 늘릴 때는 JOB_LOCK_DIR 를 모든 서버가 같이 쓰는 경로로 지정
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+# JOB_LOCK_DIR : 실행 슬롯 / 실행 잠금 파일 경로
+# JOB_LOCK_RETENTION_DAYS : 이 기간이 지난 실행 슬롯 파일은 삭제
+JOB_LOCK_DIR = Path(os.getenv('JOB_LOCK_DIR', BASE_DIR / 'cache' / 'job_locks'))
+JOB_LOCK_RETENTION_DAYS = int(os.getenv('JOB_LOCK_RETENTION_DAYS', '7'))
+
+def owner() -> dict:
+    return {'host': socket.gethostname(), 'pid': os.getpid(), 'at': datetime.now().isoformat()}
+
+def claim(slot: str, lock_dir = JOB_LOCK_DIR) -> bool:
+    """ 실행 슬롯 선점. 이미 다른 워커가 선점했으면 False """
+    lock_dir = Path(lock_dir)
+    lock_dir.mkdir(parents = True, exist_ok = True)
+    try:
+        fd = os.open(lock_dir / f"{slot}.claim", os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, 'w', encoding = 'utf-8') as f:
+        json.dump(owner(), f)
+    return True
+
+def claimed_by(slot: str, lock_dir = JOB_LOCK_DIR) -> dict:
+    try:
+        return json.loads((Path(lock_dir) / f"{slot}.claim").read_text(encoding = 'utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+def prune_claims(lock_dir = JOB_LOCK_DIR, retention_days = JOB_LOCK_RETENTION_DAYS):
+    """ 오래된 실행 슬롯 파일 삭제 """
+    cutoff = time.time() - retention_days * 86400
+    for path in Path(lock_dir).glob('*.claim'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+class RunLock():
+    """ 작업 이름별 프로세스 간 잠금 (대기하지 않음). acquire() 가 False 면 다른 워커에서 실행 중 """
+    def __init__(self, name: str, lock_dir = JOB_LOCK_DIR):
+        self.path = Path(lock_dir) / f"{name}.lock"
+        self.file = None
+
+    def acquire(self) -> bool:
+        self.path.parent.mkdir(parents = True, exist_ok = True)
+        file = open(self.path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            file.close()
+            return False
+        file.seek(0)
+        file.truncate()
+        file.write(json.dumps(owner()))
+        file.flush()
+        self.file = file
+        return True
+
+    def release(self):
+        if self.file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+
+def scheduled(job_id: str, func):
+    """
+    스케줄러 작업 래퍼: 작업 ID + 오늘 날짜 슬롯을 선점한 워커에서만 func 실행
+
+    매일 실행하는 작업만 사용 (같은 작업을 하루에 여러 번 실행하면 시각별로 job_id 를 다르게 지정)
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        slot = f"{job_id}_{datetime.now():%Y%m%d}"
+        if not claim(slot):
+            print(f"[JobLock] {slot}: claimed by {claimed_by(slot)} >> skip")
+            return None
+        prune_claims()
+        return await func(*args, **kwargs)
+    return wrapper
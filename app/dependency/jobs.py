@@ -0,0 +1,165 @@
+import os, sys, asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# 파이프라인 작업 실행기 (app/main.py 스케줄러와 /jobs 라우터가 같이 사용)
+# - 명령 작업: asyncio 서브프로세스로 실행 >> 이벤트 루프를 막지 않고, 시간 초과/취소 시 프로세스 종료
+# - 함수 작업: 전용 스레드 풀에서 실행 (동기 Supabase 호출 등). 시간 초과/취소 시 결과만 버리고 스레드는 끝까지 실행
+# - 같은 이름의 작업이 실행 중이면 새로 시작하지 않고 실행 중인 작업의 handle 을 리턴
+# - 다른 uvicorn 워커에서 같은 이름의 작업이 실행 중이면 시작하지 않음 (status: 'locked', job_lock.RunLock)
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.append(str(BASE_DIR / 'data'))
+import Telemetry
+from app.dependency.job_lock import RunLock
+
+# JOB_THREADS : 함수 작업용 스레드 수
+# JOB_TIMEOUT_{NAME} : 작업별 시간 제한(초)
+JOB_THREADS = int(os.getenv('JOB_THREADS', '4'))
+JOB_TIMEOUTS = {
+    'pipeline': float(os.getenv('JOB_TIMEOUT_PIPELINE', '10800')),
+    'news': float(os.getenv('JOB_TIMEOUT_NEWS', '3600')),
+    'predict': float(os.getenv('JOB_TIMEOUT_PREDICT', '7200')),
+    'grading': float(os.getenv('JOB_TIMEOUT_GRADING', '1800')),
+    'reset': float(os.getenv('JOB_TIMEOUT_RESET', '300'))
+}
+# 취소 시 terminate 후 kill 까지 기다리는 시간(초)
+JOB_KILL_GRACE = 10
+JOB_HISTORY = 50
+
+# /jobs/{name} 로 시작할 수 있는 명령 작업
+#   pipeline : 전체 단계 (data/Orchestrator.py 가 의존 관계 순서로 실행, cache/pipeline_state 체크포인트)
+#   news     : 뉴스 수집 >> 감성분석 업로드만 다시 실행
+PIPELINE_COMMANDS = {
+    'pipeline': ['python', './data/Orchestrator.py'],
+    'news': ['python', './data/Orchestrator.py', '--targets', 'sentiment', '--rerun', 'news'],
+    'predict': ['python', './data/PredictModel.py'],
+    'grading': ['python', './data/GradePredictions.py']
+}
+
+executor = ThreadPoolExecutor(max_workers = JOB_THREADS, thread_name_prefix = 'job')
+handles = {}
+history = deque(maxlen = JOB_HISTORY)
+
+class JobHandle():
+    """ 실행 중인 작업. await handle 로 끝날 때까지 기다리고 결과(명령 작업은 종료 코드)를 받음 """
+    def __init__(self, name: str, timeout: float = None):
+        self.name = name
+        self.timeout = timeout
+        self.status = 'running'
+        self.result = None
+        self.error = None
+        self.process = None
+        self.task = None
+        self.lock = None
+        self.started_at = datetime.now().isoformat()
+        self.finished_at = None
+
+    def __await__(self):
+        # 기다리는 쪽이 취소되어도 작업은 계속 실행
+        return asyncio.shield(self.task).__await__()
+
+    def cancel(self) -> bool:
+        return self.task.cancel()
+
+    def info(self) -> dict:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'timeout': self.timeout,
+            'pid': self.process.pid if self.process else None,
+            'result': self.result,
+            'error': self.error,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+async def stop_process(process):
+    """ terminate >> JOB_KILL_GRACE 초 안에 끝나지 않으면 kill """
+    if process.returncode is not None:
+        return
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), JOB_KILL_GRACE)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+async def command_job(handle: JobHandle, args: list, cwd):
+    handle.process = await asyncio.create_subprocess_exec(*args, cwd = str(cwd))
+    try:
+        return await handle.process.wait()
+    finally:
+        # 시간 초과/취소로 여기까지 온 경우 자식 프로세스 정리
+        await stop_process(handle.process)
+
+async def supervise(handle: JobHandle, coro):
+    try:
+        handle.result = await asyncio.wait_for(coro, handle.timeout)
+        handle.status = 'done'
+        if handle.process is not None and handle.result != 0:
+            handle.status = 'failed'
+            handle.error = f"exit code {handle.result}"
+    except asyncio.TimeoutError:
+        handle.status = 'timeout'
+        handle.error = f"Job '{handle.name}' exceeded {handle.timeout}s"
+    except asyncio.CancelledError:
+        handle.status = 'cancelled'
+    except Exception as e:
+        handle.status = 'failed'
+        handle.error = str(e)
+    finally:
+        handle.finished_at = datetime.now().isoformat()
+        handle.lock.release()
+        handles.pop(handle.name, None)
+        history.append(handle.info())
+        print(f"[Jobs] {handle.name}: {handle.status}" + (f" ({handle.error})" if handle.error else ""))
+    return handle.result
+
+def start(name: str, coro_factory, timeout: float = None) -> JobHandle:
+    if name in handles:
+        print(f"[Jobs] {name}: already running >> reuse")
+        return handles[name]
+    handle = JobHandle(name, timeout)
+    handle.lock = RunLock(name)
+    if not handle.lock.acquire():
+        # 다른 워커에서 실행 중 >> 실행하지 않고 끝난 작업으로 기록
+        handle.status = 'locked'
+        handle.error = f"Job '{name}' is running in another worker"
+        handle.finished_at = datetime.now().isoformat()
+        handle.task = asyncio.get_running_loop().create_task(asyncio.sleep(0))
+        history.append(handle.info())
+        print(f"[Jobs] {name}: locked by another worker >> skip")
+        return handle
+    handle.task = asyncio.get_running_loop().create_task(supervise(handle, coro_factory(handle)))
+    handles[name] = handle
+    print(f"[Jobs] {name}: start" + (f" (timeout {timeout:.0f}s)" if timeout else ""))
+    return handle
+
+def run_command(name: str, args: list, timeout: float = None, cwd = BASE_DIR) -> JobHandle:
+    """ 명령을 서브프로세스로 실행 (이벤트 루프에서 호출) """
+    return start(name, lambda handle: command_job(handle, args, cwd), timeout)
+
+def run_function(name: str, func, *args, timeout: float = None) -> JobHandle:
+    """ 동기 함수를 작업용 스레드 풀에서 실행 (이벤트 루프에서 호출) """
+    loop = asyncio.get_running_loop()
+    return start(name, lambda handle: loop.run_in_executor(executor, func, *args), timeout)
+
+def cancel(name: str) -> bool:
+    handle = handles.get(name)
+    return handle.cancel() if handle else False
+
+def status() -> dict:
+    return {'running': [handle.info() for handle in handles.values()], 'recent': list(history)}
+
+async def telemetry(limit: int = 20, name: str = None) -> dict:
+    """ 최근 파이프라인 실행 기록과 단계별 추이 (data/Telemetry.py, 파일 읽기는 스레드 풀에서) """
+    return await asyncio.get_running_loop().run_in_executor(executor, Telemetry.report, limit, name)
+
+async def cancel_all():
+    """ 서버 종료 시: 실행 중인 작업을 모두 취소하고 자식 프로세스 정리가 끝날 때까지 기다림 """
+    running = list(handles.values())
+    for handle in running:
+        handle.cancel()
+    await asyncio.gather(*(handle.task for handle in running), return_exceptions = True)
@@ -0,0 +1,18 @@
+import sys, asyncio
+from pathlib import Path
+
+# data/ModelWorker.py 의 클라이언트(request) 사용 (인증 키 파일은 워커가 시작할 때 만듦)
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.append(str(BASE_DIR / 'data'))
+from ModelWorker import ModelWorkerError, request
+
+async def submit(job: dict, timeout: float = None):
+    """ ModelWorker.request 를 별도 스레드에서 실행하여 이벤트 루프를 막지 않고 결과를 기다림 """
+    return await asyncio.to_thread(request, job, timeout)
+
+async def is_running() -> bool:
+    try:
+        await submit({'op': 'ping'}, timeout = 5)
+        return True
+    except (OSError, TimeoutError, ModelWorkerError):
+        return False
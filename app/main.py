@@ -7,61 +7,91 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from contextlib import asynccontextmanager
 from app.dependency.connect_supabase import connect_supabase
-import asyncio, subprocess
+from app.dependency import jobs, model_worker
+from app.dependency.job_lock import scheduled, RunLock
+import os, sys, asyncio, subprocess
 
 # add router files
-from app.routers import login, quiz, mypage_router, sign_up, point, shop_router, pred_stock, ranking
+from app.routers import login, quiz, mypage_router, sign_up, point, shop_router, pred_stock, ranking, jobs_router
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 
-# --- 기존 함수들 (변경 없음) ---
-def get_news_datas():
-    """ A function to run when the server starts """
+# --- 스케줄러 작업 (작업 실행기 app/dependency/jobs.py 에서 실행) ---
+async def run_data_pipeline():
+    """ 장 마감 후 전체 파이프라인 실행 (주가 >> 기술적 지표 >> DB 동기화 / 모델 / 채점, 뉴스 >> 감성분석) """
+    print("[Function: run_data_pipeline] Start data pipeline (data/Orchestrator.py)")
+    handle = jobs.run_command('pipeline', jobs.PIPELINE_COMMANDS['pipeline'], timeout = jobs.JOB_TIMEOUTS['pipeline'])
+    await handle
+    print(f"Pipeline Complete. ({handle.status})")
+
+async def get_news_datas():
+    """ 뉴스 수집 >> 감성분석 업로드를 작업 실행기에서 서브프로세스로 실행 (이벤트 루프를 막지 않음) """
     print("[Function: get_news_datas] Start News data mining & Sentimental analysis")
-    subprocess.run(['python', './data/DataPipeline.py'])
-    print("Process Complete.")
-
-def run_predict_modeling():
-    """Function to run PredictModel.py"""
-    print("[Function: run_predict_modeling] Start predictive modeling process.")
-    subprocess.run(['python', './data/PredictModel.py'])
-    print("Predictive Modeling Complete.")
-
-def run_auto_grading():
-    """Function to run GradePredictions.py for automatic grading"""
-    print("[Function: run_auto_grading] Start automatic grading process.")
-    subprocess.run(['python', './data/GradePredictions.py'])
-    print("Automatic Grading Complete.")
-
-def reset_day_process():
+    handle = jobs.run_command('news', jobs.PIPELINE_COMMANDS['news'], timeout = jobs.JOB_TIMEOUTS['news'])
+    await handle
+    print(f"Process Complete. ({handle.status})")
+
+async def start_model_worker():
+    """
+    MODEL_WORKER_AUTOSTART=1 이면 서버와 함께 상주 모델 워커 실행 >> (워커 프로세스, 실행 잠금)
+
+    워커 포트는 하나이므로 uvicorn 워커가 여러 개여도 실행 잠금(model_worker)을 잡은 서버 워커 하나에서만 실행
+    이미 응답하는 모델 워커가 있으면(직접 실행한 경우 등) 실행하지 않음
+    """
+    if os.getenv('MODEL_WORKER_AUTOSTART') != '1':
+        return None, None
+
+    lock = RunLock('model_worker')
+    if not lock.acquire():
+        print("[Function: start_model_worker] Model worker is managed by another server worker.")
+        return None, None
+    if await model_worker.is_running():
+        print("[Function: start_model_worker] Model worker is already running.")
+        lock.release()
+        return None, None
+
+    print("[Function: start_model_worker] Start model worker process.")
+    return subprocess.Popen([sys.executable, './data/ModelWorker.py']), lock
+
+def reset_participation():
     """ Function to reset participation values """
-    print("[Function: reset_day_process] Start")
     update_data = {
         'quiz_participation': False,
         'predict_game_participation': False
     }
     supabase = connect_supabase()
-    response = supabase.table('user_info').update(update_data).not_.is_('id', None).execute()
-    return print("[Function: reset_day_process] Success")
+    return supabase.table('user_info').update(update_data).not_.is_('id', None).execute()
+
+async def reset_day_process():
+    """ 동기 Supabase 호출을 작업용 스레드에서 실행 """
+    print("[Function: reset_day_process] Start")
+    handle = jobs.run_function('reset', reset_participation, timeout = jobs.JOB_TIMEOUTS['reset'])
+    await handle
+    print(f"[Function: reset_day_process] {handle.status}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """ A function to run when the server starts """
-    scheduler.add_job(get_news_datas, CronTrigger(hour = 10, minute = 00))      # AM 10:00
-    scheduler.add_job(get_news_datas, CronTrigger(hour = 15, minute = 30))      # PM 3:30
-    scheduler.add_job(run_predict_modeling, CronTrigger(hour = 16, minute = 0)) # PM 4:00
-    scheduler.add_job(run_auto_grading, CronTrigger(hour = 16, minute = 30 ))   # PM 4:30
-    scheduler.add_job(get_news_datas, CronTrigger(hour = 18, minute = 0))      # PM 6:00
-    scheduler.add_job(reset_day_process, CronTrigger(hour = 0, minute = 0))    # AM 12:00
+    # 워커가 여러 개(uvicorn --workers N)여도 각 작업은 실행 슬롯을 먼저 선점한 워커 하나에서만 실행
+    scheduler.add_job(scheduled('news_1000', get_news_datas), CronTrigger(hour = 10, minute = 00))      # AM 10:00
+    # PM 3:30 : 주가 수집이 끝나면 바로 모델/채점 시작 (단계 순서는 Orchestrator 가 의존 관계로 결정)
+    scheduler.add_job(scheduled('pipeline_1530', run_data_pipeline), CronTrigger(hour = 15, minute = 30))   # PM 3:30
+    scheduler.add_job(scheduled('news_1800', get_news_datas), CronTrigger(hour = 18, minute = 0))      # PM 6:00
+    scheduler.add_job(scheduled('reset_0000', reset_day_process), CronTrigger(hour = 0, minute = 0))    # AM 12:00
     scheduler.start()
+    worker_process, worker_lock = await start_model_worker()
     yield
     scheduler.shutdown()
+    await jobs.cancel_all()
+    if worker_process is not None:
+        worker_process.terminate()
+        worker_lock.release()
 
 scheduler = AsyncIOScheduler()
 app = FastAPI(lifespan=lifespan)
 
 
-# --- 라우터 포함 (변경 없음) ---
+# --- 라우터 포함 ---
 app.include_router(login.router)
 app.include_router(quiz.router)
 app.include_router(mypage_router.router)
@@ -70,6 +100,7 @@ app.include_router(point.router)
 app.include_router(shop_router.router)
 app.include_router(pred_stock.router)
 app.include_router(ranking.router)
+app.include_router(jobs_router.router)
 
 
 # 1. 정적 파일 폴더 마운트
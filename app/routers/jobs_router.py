@@ -0,0 +1,48 @@
+# wiz-stock/app/routers/jobs_router.py
+from fastapi import APIRouter, Depends, HTTPException
+from app.dependency import jobs
+from app.dependency.admin import require_admin
+
+# 라우터 설정 (모든 엔드포인트 관리자 전용)
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    dependencies=[Depends(require_admin)]
+)
+
+@router.get("", summary="파이프라인 작업 상태 조회 (관리자용)")
+async def get_jobs():
+    """
+    실행 중인 작업과 최근에 끝난 작업의 상태를 반환합니다.
+    (이벤트 루프에서 바로 응답하므로 작업이 실행 중일 때의 API 응답 시간 측정에도 사용)
+    """
+    return jobs.status()
+
+@router.get("/telemetry", summary="파이프라인 실행 기록 조회 (관리자용)")
+async def get_telemetry(limit: int = 20, name: str = None):
+    """
+    최근 실행(limit 개)의 단계별 시간 / 최대 메모리(RSS) / 처리량 기록과
+    마지막 실행의 단계별 시간을 이전 실행 중앙값과 비교한 추이를 반환합니다.
+    """
+    return await jobs.telemetry(limit, name)
+
+@router.post("/{name}", status_code=202, summary="파이프라인 작업 시작 (관리자용)")
+async def start_job(name: str):
+    """
+    pipeline / news / predict / grading 스크립트를 서브프로세스로 시작하고 바로 반환합니다.
+    같은 작업이 이미 실행 중이면 새로 시작하지 않고 실행 중인 작업 정보를 반환합니다.
+    다른 서버 워커에서 실행 중이면 409 를 반환합니다.
+    """
+    if name not in jobs.PIPELINE_COMMANDS:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 작업입니다: {name}")
+    handle = jobs.run_command(name, jobs.PIPELINE_COMMANDS[name], timeout=jobs.JOB_TIMEOUTS[name])
+    if handle.status == 'locked':
+        raise HTTPException(status_code=409, detail=handle.error)
+    return handle.info()
+
+@router.post("/{name}/cancel", summary="파이프라인 작업 취소 (관리자용)")
+async def cancel_job(name: str):
+    """ 실행 중인 작업을 취소합니다. 명령 작업은 자식 프로세스를 종료합니다. """
+    if not jobs.cancel(name):
+        raise HTTPException(status_code=404, detail=f"실행 중인 작업이 아닙니다: {name}")
+    return {"message": f"{name} 작업을 취소했습니다."}
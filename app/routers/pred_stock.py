@@ -1,11 +1,14 @@
 # wiz-stock/app/router/pred_stock.py
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from supabase import Client
 from datetime import datetime, timedelta
 import traceback
 import pandas as pd
 from app.dependency.connect_supabase import connect_supabase
+from app.dependency import model_worker, grading
+from app.dependency.admin import require_admin
 from pathlib import Path
 import FinanceDataReader as fdr
 
@@ -29,18 +32,25 @@ class ClaimPointsRequest(BaseModel):
 @router.get("/check-participation", summary="주가 예측 게임 참여 가능 여부 확인")
 async def check_participation(user_id: str, db: Client = Depends(connect_supabase)):
     """
-    사용자가 오늘 주가 예측 게임에 참여했는지 여부를 확인
-    오늘 날짜 기준으로 predict_game 테이블에서 직접 확인
+    사용자가 이번 거래일 예측에 참여했는지 여부를 확인
+    주말/휴장일의 예측은 직전 거래일 예측과 같은 다음 거래일 종가로 채점되므로 한 번만 참여 가능
+    (직전 거래일 ~ 오늘 사이의 예측 기록을 predict_game 테이블에서 직접 확인)
     """
     try:
-        today = datetime.now().date().isoformat()
-        
-        # 오늘 날짜로 이미 예측한 기록이 있는지 확인
-        prediction_res = db.table('predict_game').select('id').eq('user_id', user_id).eq('prediction_date', today).execute()
+        today = datetime.now().date()
+        # stock_data.csv 가 바뀌면 다시 로드하므로 이벤트 루프 밖에서 실행
+        calendar = await run_in_threadpool(grading.price_cache.get_calendar)
+        session_start = calendar.on_or_before(today)
+        
+        # 같은 다음 거래일을 맞히는 예측 기록이 있는지 확인
+        prediction_res = db.table('predict_game').select('id').eq('user_id', user_id) \
+            .gte('prediction_date', session_start.isoformat()) \
+            .lte('prediction_date', today.isoformat()) \
+            .execute()
         
         has_participated_today = len(prediction_res.data) > 0
         
-        return {"can_participate": not has_participated_today}
+        return {"can_participate": not has_participated_today, "target_date": calendar.next(today).isoformat()}
     except Exception:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail="서버 오류: 참여 여부 확인에 실패했습니다.")
@@ -197,6 +207,8 @@ async def get_stock_info(stock_code: str, db: Client = Depends(connect_supabase)
             "current_price": current_price,
             "trend_predict": predict_data['trend_predict'],
             "price_predict": predict_data['price_predict'],
+            # 여러 시점 예측 (price_predict_3d, price_predict_5d 등. 도입 전 예측에는 없음)
+            **{key: value for key, value in predict_data.items() if key.startswith('price_predict_')},
             "top_feature": predict_data['top_feature'],
             "sentiment_score": sentiment_data.get('score'), 
             "sentiment_outlook": sentiment_outlook
@@ -205,6 +217,20 @@ async def get_stock_info(stock_code: str, db: Client = Depends(connect_supabase)
         traceback.print_exc()
         raise HTTPException(status_code=500, detail="서버 오류: 종목 정보를 가져오는 데 실패했습니다.")
 
+@router.get("/live-predict", summary="상주 모델 워커로 저장된 모델의 다음 날 종가 예측")
+async def live_predict(stock_code: str):
+    """ 학습 없이 메모리에 올라와 있는 모델로 바로 예측 (DB 저장 없음) """
+    try:
+        results = await model_worker.submit({'op': 'predict', 'codes': [stock_code]}, timeout=60)
+    except (OSError, TimeoutError):
+        raise HTTPException(status_code=503, detail="모델 워커가 실행 중이 아니거나 응답이 없습니다.")
+    except model_worker.ModelWorkerError as e:
+        raise HTTPException(status_code=500, detail=f"서버 오류: 예측에 실패했습니다. {str(e)}")
+
+    if not results:
+        raise HTTPException(status_code=404, detail=f"Model for {stock_code} not found.")
+    return results[0]
+
 @router.post("/submit-prediction", summary="사용자 주가 예측 답변 제출")
 async def submit_prediction(req_body: StockPredictionRequest, request: Request, db: Client = Depends(connect_supabase)):
     """
@@ -342,88 +368,35 @@ async def get_history(user_id: str, db: Client = Depends(connect_supabase)):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"서버 오류: 예측 기록을 가져오는 데 실패했습니다. {str(e)}")
 
-@router.post("/grade-predictions", summary="예측 결과 자동 채점 (관리자용)")
+@router.post("/grade-predictions", status_code=202, dependencies=[Depends(require_admin)], summary="예측 결과 자동 채점 작업 등록 (관리자용)")
 async def grade_predictions_api(db: Client = Depends(connect_supabase)):
     """
-    관리자용: 예측 결과를 자동으로 채점합니다.
-    매일 장 마감 후 실행하여 어제의 예측 결과를 체크합니다.
+    관리자용: 어제의 예측 결과 채점 작업을 백그라운드에 등록하고 바로 작업 ID를 반환합니다.
+    진행 상황은 GET /stock-predict/grade-predictions/{job_id} 로 확인합니다.
     """
     try:
-        # GradePredictions.py의 로직을 여기에 구현
-        import sys
-        from pathlib import Path
-        import pandas as pd
-        
-        # 프로젝트 루트 경로 설정
-        current_path = Path(__file__).resolve()
-        project_root = current_path.parent.parent.parent
-        
-        # stock_data.csv 파일 로드
-        csv_path = project_root / "cache" / "stock_data.csv"
-        if not csv_path.exists():
-            raise HTTPException(status_code=404, detail="stock_data.csv 파일을 찾을 수 없습니다.")
-        
-        stock_df = pd.read_csv(csv_path, dtype={'stock_code': str})
-        stock_df['Date'] = pd.to_datetime(stock_df['Date']).dt.date
-        
-        # 어제의 채점되지 않은 예측들 조회
-        today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-        
-        response = db.table('predict_game').select('*') \
-            .gte('prediction_date', yesterday.isoformat()) \
-            .lt('prediction_date', today.isoformat()) \
-            .eq('is_checked', False) \
-            .execute()
-        
-        pending_predictions = response.data
-        if not pending_predictions:
-            return {"message": "채점할 예측이 없습니다.", "graded_count": 0}
-        
-        # 실제 등락 정보 추출
-        actual_trends = {}
-        unique_stock_codes = list(set(p['stock_code'] for p in pending_predictions))
-        
-        for stock_code in unique_stock_codes:
-            code_df = stock_df[stock_df['stock_code'] == stock_code]
-            yesterday_data = code_df[code_df['Date'] == yesterday]
-            today_data = code_df[code_df['Date'] == today]
-            
-            if not yesterday_data.empty and not today_data.empty:
-                price_t = yesterday_data.iloc[0]['Close']
-                price_t1 = today_data.iloc[0]['Close']
-                actual_trends[stock_code] = "상승" if price_t1 > price_t else "하락"
-        
-        # 각 예측 채점
-        graded_count = 0
-        for pred in pending_predictions:
-            stock_code = pred['stock_code']
-            if stock_code not in actual_trends:
-                continue
-            
-            actual_trend = actual_trends[stock_code]
-            is_correct = (actual_trend == pred['predicted_trend'])
-            
-            # 예측 결과 업데이트
-            db.table('predict_game').update({
-                'is_checked': True,
-                'actual_trend': actual_trend,
-                'result': is_correct,
-                'points_awarded': None  # 사용자가 수동으로 수령
-            }).eq('id', pred['id']).execute()
-            
-            graded_count += 1
-        
+        job = grading.submit(db)
         return {
-            "message": f"{graded_count}개의 예측이 성공적으로 채점되었습니다.",
-            "graded_count": graded_count,
-            "date": yesterday.isoformat()
+            "message": "채점 작업이 등록되었습니다.",
+            "job_id": job['job_id'],
+            "status": job['status'],
+            "progress": job['progress']
         }
-        
     except Exception as e:
-        print(f"[ERROR] 자동 채점 실패: {e}")
+        print(f"[ERROR] 자동 채점 작업 등록 실패: {e}")
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"자동 채점에 실패했습니다. {str(e)}")
+        raise HTTPException(status_code=500, detail=f"자동 채점 작업 등록에 실패했습니다. {str(e)}")
+
+@router.get("/grade-predictions/{job_id}", dependencies=[Depends(require_admin)], summary="예측 결과 채점 작업 상태 조회 (관리자용)")
+async def grade_predictions_status(job_id: str):
+    """
+    채점 작업의 상태(queued / running / done / failed)와 진행 상황을 반환합니다.
+    완료되면 result 에 채점 날짜, 대기 예측 수, 채점한 예측 수가 들어갑니다.
+    """
+    job = grading.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="채점 작업을 찾을 수 없습니다.")
+    return job
 
 @router.post("/claim-points", summary="예측 결과 포인트 수령")
 async def claim_points(req_body: ClaimPointsRequest, request: Request, db: Client = Depends(connect_supabase)):
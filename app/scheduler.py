@@ -1,37 +1,30 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import asyncio
-import subprocess
-from pathlib import Path
+from app.dependency.connect_supabase import connect_supabase
+from app.dependency import grading
+from app.dependency.job_lock import scheduled
 
 scheduler = AsyncIOScheduler()
 
 async def run_daily_grading():
-    """매일 오후 4시에 자동 채점 실행"""
+    """매일 오후 4시에 자동 채점 실행 (채점 서비스에 작업 등록 후 완료까지 대기)"""
     try:
-        project_root = Path(__file__).parent.parent
-        script_path = project_root / "data" / "GradePredictions.py"
-        
-        result = subprocess.run(
-            ["python", str(script_path)], 
-            capture_output=True, 
-            text=True,
-            cwd=str(project_root)
-        )
-        
-        if result.returncode == 0:
-            print(f"[SCHEDULER] 자동 채점 성공: {result.stdout}")
+        job = grading.submit(connect_supabase())
+        job = await grading.wait(job['job_id'])
+
+        if job['status'] == 'done':
+            print(f"[SCHEDULER] 자동 채점 성공: {job['result']}")
         else:
-            print(f"[SCHEDULER] 자동 채점 실패: {result.stderr}")
+            print(f"[SCHEDULER] 자동 채점 실패: {job['error']}")
             
     except Exception as e:
         print(f"[SCHEDULER] 스케줄러 오류: {e}")
 
 def start_scheduler():
     """스케줄러 시작"""
-    # 매일 오후 4시에 실행
+    # 매일 오후 4시에 실행 (워커가 여러 개여도 실행 슬롯을 선점한 워커 하나에서만 실행)
     scheduler.add_job(
-        run_daily_grading,
+        scheduled('daily_grading', run_daily_grading),
         CronTrigger(hour=16, minute=0),  # 16:00
         id="daily_grading",
         replace_existing=True
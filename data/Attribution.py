@@ -0,0 +1,160 @@
+# wiz-stock/data/Attribution.py
+# 예측 결과의 top_feature 를 구하는 Feature 기여도 계산 (모든 종목을 한 번에 계산)
+import os
+import time
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+
+# ATTRIBUTION_METHOD : expected_gradients (기본, shap.GradientExplainer 와 같은 계산을 모든 종목에 대해 한 번에 실행)
+#                      integrated_gradients (기준점 1개 + 적은 step 수, 가장 빠름)
+#                      shap (기존 방식, 종목별 shap.GradientExplainer)
+# SHAP_BACKGROUND : 배경 데이터(학습 시퀀스 샘플) 개수. 모델 버전별로 캐시
+# ATTRIBUTION_SAMPLES : expected_gradients / shap 의 종목별 샘플 수 (shap 기본값 200)
+# ATTRIBUTION_STEPS : integrated_gradients 의 step 수
+# ATTRIBUTION_TIME_BUDGET : 전체 기여도 계산 시간 제한(초). 종목마다 확인하여 초과 시 남은 종목은 integrated_gradients 로 계산
+ATTRIBUTION_METHOD = os.getenv('ATTRIBUTION_METHOD', 'expected_gradients')
+SHAP_BACKGROUND = int(os.getenv('SHAP_BACKGROUND', '100'))
+ATTRIBUTION_SAMPLES = int(os.getenv('ATTRIBUTION_SAMPLES', '200'))
+ATTRIBUTION_STEPS = int(os.getenv('ATTRIBUTION_STEPS', '16'))
+ATTRIBUTION_TIME_BUDGET = float(os.getenv('ATTRIBUTION_TIME_BUDGET', '120'))
+ATTRIBUTION_SEED = int(os.getenv('TRAIN_SEED', '42'))
+
+# 모델 구조(가중치 shape)별 (템플릿 모델, 기여도 계산 tf.function). 상주 워커에서는 실행 간에도 재사용
+_templates = {}
+
+def background_path(model_path) -> Path:
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.background.npz")
+
+def load_background(model_path, X_train_full, size=SHAP_BACKGROUND, seed=ATTRIBUTION_SEED):
+    """
+    모델 버전(모델 파일 mtime)별 배경 데이터 샘플
+
+    모델이 다시 학습되지 않았으면 저장된 샘플을 그대로 사용하고, 학습되었으면 새로 뽑아서 모델 옆에 저장
+    """
+    path = background_path(model_path)
+    model_version = os.stat(model_path).st_mtime_ns
+
+    if path.exists():
+        try:
+            with np.load(path) as cached:
+                if int(cached['model_version']) == model_version and len(cached['background']) == min(size, len(X_train_full)):
+                    return cached['background']
+        except Exception as e:
+            print(f"  [!] 배경 데이터 캐시를 읽지 못해 새로 생성합니다: {e}")
+
+    rng = np.random.default_rng(seed)
+    indexes = np.sort(rng.choice(len(X_train_full), min(size, len(X_train_full)), replace=False))
+    background = np.ascontiguousarray(X_train_full[indexes], dtype=np.float32)
+
+    np.savez(path, background=background, model_version=model_version)
+    return background
+
+def path_gradients(models, inputs, references, alphas):
+    """
+    종목별 기여도 = mean( d model / d point * (x - reference) ),  point = reference + alpha * (x - reference)
+
+    reference 를 배경 샘플에서, alpha 를 (0, 1) 에서 뽑으면 expected gradients (shap.GradientExplainer),
+    reference 를 하나로 고정하고 alpha 를 등간격으로 두면 integrated gradients.
+
+    종목별 모델은 구조가 같고 가중치만 다르므로, 구조별로 한 번만 그래프를 만든 템플릿 모델에
+    종목 가중치를 바꿔 넣으며 계산 (종목마다 그래프를 새로 만드는 비용이 없음)
+    """
+    attributions = []
+
+    for model, x, reference, alpha in zip(models, inputs, references, alphas):
+        key = tuple(tuple(weight.shape) for weight in model.weights)
+        if key not in _templates:
+            template = tf.keras.models.clone_model(model)
+
+            @tf.function(reduce_retracing=True)
+            def attribute(x, reference, alpha, template=template):
+                points = reference + alpha * (x - reference)
+                with tf.GradientTape() as tape:
+                    tape.watch(points)
+                    # 여러 시점(horizon)을 예측하는 모델은 다음 날 예측(첫 번째 출력) 기준 (shap 의 shap_values[0] 과 같음)
+                    outputs = template(points, training=False)[:, 0]
+                gradients = tape.gradient(outputs, points)
+                return tf.reduce_mean(gradients * (x - reference), axis=0)
+
+            _templates[key] = (template, attribute)
+
+        template, attribute = _templates[key]
+        template.set_weights(model.get_weights())
+        to_tensor = lambda array: tf.constant(np.asarray(array, dtype=np.float32))
+        attributions.append(attribute(to_tensor(x), to_tensor(reference), to_tensor(alpha)).numpy())
+
+    return attributions
+
+def expected_gradients(models, inputs, backgrounds, samples=ATTRIBUTION_SAMPLES, seed=ATTRIBUTION_SEED):
+    """
+    배경 샘플을 고르게 돌아가며 쓰고 alpha 를 층화 추출하여 같은 샘플 수에서 무작위 추출보다 분산이 작음
+    종목마다 같은 시드를 사용하므로 같은 모델/입력이면 항상 같은 결과
+    """
+    references, alphas = [], []
+    for background in backgrounds:
+        rng = np.random.default_rng(seed)
+        references.append(background[np.arange(samples) % len(background)])
+        alphas.append(((rng.permutation(samples) + rng.random(samples)) / samples).astype(np.float32).reshape(-1, 1, 1))
+    return path_gradients(models, inputs, references, alphas)
+
+def integrated_gradients(models, inputs, backgrounds, steps=ATTRIBUTION_STEPS):
+    # 기준점: 배경 데이터 평균, alpha: 구간 중점 (midpoint Riemann sum)
+    references = [background.mean(axis=0, keepdims=True).repeat(steps, axis=0) for background in backgrounds]
+    alphas = [((np.arange(steps, dtype=np.float32) + 0.5) / steps).reshape(-1, 1, 1) for _ in backgrounds]
+    return path_gradients(models, inputs, references, alphas)
+
+def shap_gradients(models, inputs, backgrounds, samples=ATTRIBUTION_SAMPLES, seed=ATTRIBUTION_SEED):
+    """ 기존 방식: 종목별 shap.GradientExplainer """
+    import shap
+
+    attributions = []
+    for model, x, background in zip(models, inputs, backgrounds):
+        explainer = shap.GradientExplainer(model, background)
+        shap_values = explainer.shap_values(x, nsamples=samples, rseed=seed)
+        attributions.append(np.asarray(shap_values[0]).reshape(x.shape[1], x.shape[2]))
+    return attributions
+
+METHODS = {
+    'expected_gradients': expected_gradients,
+    'integrated_gradients': integrated_gradients,
+    'shap': shap_gradients
+}
+
+def top_feature(attribution, feature_names) -> str:
+    """ (시퀀스 길이, Feature 수) 기여도 >> 전체 기간 평균 |기여도| 가 가장 큰 Feature """
+    return feature_names[int(np.argmax(np.mean(np.abs(attribution), axis=0)))]
+
+def explain_top_features(items, feature_names, method=ATTRIBUTION_METHOD, time_budget=ATTRIBUTION_TIME_BUDGET):
+    """
+    items: [{'code', 'model', 'model_path', 'X_train_full', 'X_predict'}, ...] >> 종목 순서대로 top_feature 리스트
+
+    종목마다 시작 전에 time_budget 을 확인하고, 넘겼으면 남은 종목은 integrated_gradients 로 계산
+    (그래프는 모델 구조별로 재사용하므로 종목별로 나눠 계산해도 추가 비용 없음)
+    """
+    if method not in METHODS:
+        print(f"[!] 알 수 없는 ATTRIBUTION_METHOD: {method} >> expected_gradients 사용")
+        method = 'expected_gradients'
+
+    start_time = time.perf_counter()
+    top_features = []
+    used_methods = {}
+
+    for item in items:
+        item_method = method
+        if time.perf_counter() - start_time > time_budget:
+            item_method = 'integrated_gradients'
+
+        try:
+            background = load_background(item['model_path'], item['X_train_full'])
+            attribution = METHODS[item_method]([item['model']], [item['X_predict']], [background])[0]
+            top_features.append(top_feature(attribution, feature_names))
+            used_methods[item_method] = used_methods.get(item_method, 0) + 1
+        except Exception as e:
+            print(f"  [!] {item['code']}: 기여도 계산 중 오류 발생: {e}")
+            top_features.append('N/A')
+
+    summary = ', '.join(f"{name} {count}" for name, count in used_methods.items())
+    print(f"[+] {len(items)}개 종목 기여도 계산 완료 ({summary}, {time.perf_counter() - start_time:.2f}s)")
+    return top_features
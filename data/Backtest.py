@@ -0,0 +1,151 @@
+# python ./data/Backtest.py --engines naive momentum lstm --folds 3 --test-size 20
+# cache/stock_data.csv 로 예측 엔진의 walk-forward 백테스트 (오프라인 실행, DB 사용 안 함)
+#
+# 종목마다 마지막 folds x test_size 거래일을 평가 구간으로 나누고, 각 구간은 그 이전 데이터로만 학습한 모델로 예측
+# 지표: 방향 정확도(예측 등락 == 실제 등락), MAE(원), hit rate(|예측 종가 - 실제 종가| / 실제 종가 <= tolerance)
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from PredictModel import FEATURES, SEQUENCE_LENGTH, COLD_TRAINING, load_stock_data
+from ModelTraining import TRAIN_SEED, TRAIN_JOB_BUDGET
+from ModelEngines import ENGINES
+
+def walk_forward_splits(row_count, sequence_length, folds, test_size, min_train):
+    """
+    [(평가 구간 시작, 평가 구간 끝), ...]  (행 index, 끝은 포함하지 않음)
+
+    평가 대상 t 는 t - 1 에서 끝나는 윈도우로 예측하고, 각 구간의 학습 데이터는 [0, 평가 구간 시작)
+    """
+    splits = []
+    for fold in range(folds, 0, -1):
+        test_start = row_count - fold * test_size
+        test_end = test_start + test_size
+        if test_start < max(min_train, sequence_length + 1):
+            continue
+        splits.append((test_start, test_end))
+    return splits
+
+def trend(next_price, price):
+    """ GradePredictions / PredictModel 과 같은 기준 (같으면 하락) """
+    return np.where(next_price > price, "상승", "하락")
+
+def run_backtest(df, engine_names, folds=3, test_size=20, min_train=None, codes=None, engine_options=None):
+    """
+    엔진별 walk-forward 예측 결과
+
+    Returns: (예측 DataFrame (행 = 엔진 x 종목 x 평가일), {엔진: 학습/예측 시간})
+    """
+    min_train = min_train or SEQUENCE_LENGTH + 50
+    engine_options = engine_options or {}
+
+    stocks = {}
+    for code in (codes or df['stock_code'].unique()):
+        stock_df = df[df['stock_code'] == code][FEATURES + ['Date']].dropna().set_index('Date')
+        splits = walk_forward_splits(len(stock_df), SEQUENCE_LENGTH, folds, test_size, min_train)
+        if len(splits) < folds:
+            print(f"[!] {code}: 데이터가 부족하여 건너뜁니다 ({len(stock_df)} rows).")
+            continue
+        stocks[code] = (stock_df, splits)
+
+    frames = []
+    timings = {}
+    for engine_name in engine_names:
+        engine = ENGINES[engine_name](FEATURES, SEQUENCE_LENGTH, **engine_options.get(engine_name, {}))
+        timing = timings.setdefault(engine_name, {'fit': 0.0, 'predict': 0.0, 'predict_calls': 0, 'windows': 0})
+
+        # 구간(fold) 순서대로: 모든 종목의 해당 구간 학습을 한 번에 요청한 뒤 종목별로 평가 구간 전체를 한 번에 예측
+        # (종목을 묶어서 학습하는 엔진도 평가 구간 이후 데이터는 보지 않음)
+        for fold in range(folds):
+            fold_stocks = {code: (stock_df, splits[fold]) for code, (stock_df, splits) in stocks.items()}
+
+            start_time = time.perf_counter()
+            engine.fit({code: stock_df[FEATURES].to_numpy(dtype=np.float64)[:test_start] for code, (stock_df, (test_start, _)) in fold_stocks.items()})
+            timing['fit'] += time.perf_counter() - start_time
+
+            for code, (stock_df, (test_start, test_end)) in fold_stocks.items():
+                values = stock_df[FEATURES].to_numpy(dtype=np.float64)
+                close = values[:, FEATURES.index('Close')]
+                targets = np.arange(test_start, test_end)
+
+                start_time = time.perf_counter()
+                predicted = engine.predict(code, values, targets - 1)
+                timing['predict'] += time.perf_counter() - start_time
+                timing['predict_calls'] += 1
+                timing['windows'] += len(targets)
+
+                # PredictModel 과 같이 예측가를 100원 단위로 반올림한 뒤 등락 판단
+                predicted = np.round(predicted, -2)
+                frames.append(pd.DataFrame({
+                    'engine': engine_name,
+                    'stock_code': code,
+                    'fold': fold,
+                    'date': stock_df.index[targets],
+                    'last_close': close[targets - 1],
+                    'actual_close': close[targets],
+                    'predicted_close': predicted,
+                    'actual_trend': trend(close[targets], close[targets - 1]),
+                    'predicted_trend': trend(predicted, close[targets - 1])
+                }))
+        engine.close()
+
+        print(f"[+] {engine_name}: 학습 {timing['fit']:.2f}s, 예측 {timing['predict']:.2f}s ({timing['predict_calls']}회, {timing['windows']}개 윈도우)")
+
+    if not frames:
+        return pd.DataFrame(), timings
+
+    predictions = pd.concat(frames, ignore_index=True)
+    return predictions.dropna(subset=['predicted_close']), timings
+
+def summarize(predictions, by, tolerance=0.01):
+    """ by 기준 그룹별 방향 정확도 / MAE / hit rate """
+    frame = predictions.assign(
+        month=pd.to_datetime(predictions['date']).dt.strftime('%Y-%m'),
+        correct=predictions['predicted_trend'] == predictions['actual_trend'],
+        abs_error=(predictions['predicted_close'] - predictions['actual_close']).abs()
+    )
+    frame['hit'] = frame['abs_error'] / frame['actual_close'] <= tolerance
+
+    summary = frame.groupby(by).agg(
+        count=('correct', 'size'),
+        directional_accuracy=('correct', 'mean'),
+        mae=('abs_error', 'mean'),
+        hit_rate=('hit', 'mean')
+    )
+    return summary.round({'directional_accuracy': 4, 'mae': 1, 'hit_rate': 4})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'walk-forward backtest')
+    parser.add_argument('--engines', nargs = '+', default = ['naive', 'momentum', 'lstm'], choices = list(ENGINES))
+    parser.add_argument('--folds', type = int, default = 3)
+    parser.add_argument('--test-size', type = int, default = 20, help = '구간별 평가 거래일 수')
+    parser.add_argument('--stocks', nargs = '+', help = '평가할 종목 코드 (기본: 전체)')
+    parser.add_argument('--epochs', type = int, default = COLD_TRAINING['epochs'], help = 'LSTM 학습 epoch')
+    parser.add_argument('--tolerance', type = float, default = 0.01, help = 'hit rate 기준 (실제 종가 대비 오차 비율)')
+    parser.add_argument('--output', type = Path, help = '예측 결과 CSV 저장 경로')
+    args = parser.parse_args()
+
+    df = load_stock_data()
+    if df is None:
+        raise SystemExit(1)
+
+    engine_options = {'lstm': {'epochs': args.epochs, 'batch_size': COLD_TRAINING['batch_size'], 'seed': TRAIN_SEED, 'budget': TRAIN_JOB_BUDGET}}
+    predictions, _ = run_backtest(df, args.engines, args.folds, args.test_size, codes = args.stocks, engine_options = engine_options)
+    if predictions.empty:
+        print("[!] 평가할 데이터가 없습니다.")
+        raise SystemExit(1)
+
+    pd.set_option('display.width', 200)
+    print("\n[Backtest] 엔진별")
+    print(summarize(predictions, ['engine'], args.tolerance).to_string())
+    print("\n[Backtest] 엔진 x 종목")
+    print(summarize(predictions, ['stock_code', 'engine'], args.tolerance).to_string())
+    print("\n[Backtest] 엔진 x 월")
+    print(summarize(predictions, ['month', 'engine'], args.tolerance).to_string())
+
+    output = args.output or Path.cwd() / 'cache' / f"backtest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    output.parent.mkdir(exist_ok = True)
+    predictions.to_csv(output, index = False)
+    print(f"\n[+] 예측 결과 저장: {output}")
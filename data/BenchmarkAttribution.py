@@ -0,0 +1,81 @@
+# python ./data/BenchmarkAttribution.py --repeat 10
+# top_feature 계산: 기존 종목별 shap.GradientExplainer 와 Attribution 모듈(종목 묶음 계산)의 시간/결과 비교
+# models/ 에 학습된 모델과 cache/stock_data.csv 가 필요 (PredictModel.py 를 먼저 실행)
+import time, argparse
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from FeatureScaler import FeatureScaler
+from PredictModel import FEATURES, SEQUENCE_LENGTH, create_sequences, load_stock_data, resolve_artifact
+from Attribution import METHODS, load_background, top_feature
+
+def legacy_top_feature(model, X_train_full, X_predict):
+    """ 기존 구현: 매번 무작위 배경 100개로 새 GradientExplainer 생성 """
+    import shap
+    background_data = X_train_full[np.random.choice(X_train_full.shape[0], 100, replace=False)]
+    explainer = shap.GradientExplainer(model, background_data)
+    shap_values = explainer.shap_values(X_predict)
+    return FEATURES[np.argmax(np.mean(np.abs(shap_values[0]), axis=0))]
+
+def load_items():
+    """ 종목별 현재 모델(학습 캐시 manifest, 없으면 이전 방식 파일)과 그 모델의 학습 스케일러로 만든 입력 """
+    df = load_stock_data()
+    items = []
+    for code in df['stock_code'].unique():
+        artifact = resolve_artifact(code)
+        if artifact is None:
+            continue
+        model_path, scaler_path = artifact
+
+        stock_df = df[df['stock_code'] == code][FEATURES].dropna()
+        scaled_df = pd.DataFrame(FeatureScaler.load(scaler_path).transform(stock_df.to_numpy()), index=stock_df.index, columns=FEATURES)
+        X_train_full, _ = create_sequences(scaled_df, SEQUENCE_LENGTH)
+        items.append({
+            'code': code,
+            'model': tf.keras.models.load_model(model_path),
+            'model_path': model_path,
+            'X_train_full': X_train_full,
+            'X_predict': scaled_df.iloc[-SEQUENCE_LENGTH:].to_numpy(dtype=np.float32)[None]
+        })
+    return items
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'top_feature attribution benchmark')
+    parser.add_argument('--repeat', type = int, default = 1, help = '종목 수를 늘리기 위해 같은 모델을 반복 사용')
+    args = parser.parse_args()
+
+    items = load_items() * args.repeat
+    if not items:
+        print("[!] 학습된 모델이 없습니다. PredictModel.py 를 먼저 실행하세요.")
+        raise SystemExit(1)
+
+    start_time = time.perf_counter()
+    legacy = [legacy_top_feature(item['model'], item['X_train_full'], item['X_predict']) for item in items]
+    legacy_elapsed = time.perf_counter() - start_time
+
+    # 기존 방식은 실행마다 배경 데이터가 달라 결과가 흔들리므로 종목별 최빈값을 기준으로 비교
+    votes = {}
+    for item, feature in zip(items, legacy):
+        votes.setdefault(item['code'], []).append(feature)
+    legacy = [max(set(votes[item['code']]), key=votes[item['code']].count) for item in items]
+
+    print(f"[Benchmark] top_feature attribution ({len(items)} stocks)")
+    print(f"  {'method':<22} {'time':>9} {'per stock':>11} {'same as legacy':>15} {'ties':>6}")
+    print(f"  {'legacy shap':<22} {legacy_elapsed:>8.2f}s {legacy_elapsed / len(items) * 1000:>9.1f}ms {'-':>15} {'-':>6}")
+
+    for name, method in METHODS.items():
+        start_time = time.perf_counter()
+        backgrounds = [load_background(item['model_path'], item['X_train_full']) for item in items]
+        attributions = method([item['model'] for item in items], [item['X_predict'] for item in items], backgrounds)
+        elapsed = time.perf_counter() - start_time
+
+        features = [top_feature(attribution, FEATURES) for attribution in attributions]
+        same = sum(a == b for a, b in zip(features, legacy))
+
+        # 다른 결과 중 기존 방식의 Feature 와 기여도 차이가 2% 이내인 경우 (어느 쪽을 골라도 되는 동률)
+        ties = 0
+        for attribution, feature, expected in zip(attributions, features, legacy):
+            importance = np.mean(np.abs(attribution), axis=0)
+            if feature != expected and importance[FEATURES.index(expected)] >= importance.max() * 0.98:
+                ties += 1
+        print(f"  {name:<22} {elapsed:>8.2f}s {elapsed / len(items) * 1000:>9.1f}ms {same:>8}/{len(items)} {ties:>6}")
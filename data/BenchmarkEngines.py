@@ -0,0 +1,68 @@
+# python ./data/BenchmarkEngines.py --engines naive lstm ridge gbm --folds 3 --test-size 20
+# 예측 엔진 비교: cache/stock_data.csv 로 같은 walk-forward 구간에서 학습 시간, 예측 지연, 정확도 측정 (DB 사용 안 함)
+#
+# 학습 시간   : 모든 구간(fold) 학습 합계 (lstm 은 종목별 병렬 학습, ridge / gbm 은 전 종목 통합 학습 1회)
+# 예측 지연   : 윈도우 1개당 평균 예측 시간 (ms)
+# 시작 비용   : 새 프로세스에서 엔진이 사용하는 라이브러리 import 시간 (스케줄러의 subprocess 실행 기준)
+import sys
+import time
+import argparse
+import subprocess
+import pandas as pd
+from PredictModel import COLD_TRAINING, load_stock_data
+from ModelTraining import TRAIN_SEED, TRAIN_JOB_BUDGET
+from ModelEngines import ENGINES
+from Backtest import run_backtest, summarize
+
+# 엔진별 새 프로세스에서 필요한 import
+ENGINE_IMPORTS = {
+    'naive': 'import numpy',
+    'momentum': 'import numpy',
+    'lstm': 'import tensorflow',
+    'ridge': 'import sklearn.linear_model, sklearn.preprocessing, sklearn.pipeline',
+    'gbm': 'import sklearn.ensemble'
+}
+
+def import_time(statement):
+    start_time = time.perf_counter()
+    subprocess.run([sys.executable, '-c', statement], check=True, capture_output=True)
+    return time.perf_counter() - start_time
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'prediction engine benchmark')
+    parser.add_argument('--engines', nargs = '+', default = ['naive', 'lstm', 'ridge', 'gbm'], choices = list(ENGINES))
+    parser.add_argument('--folds', type = int, default = 3)
+    parser.add_argument('--test-size', type = int, default = 20, help = '구간별 평가 거래일 수')
+    parser.add_argument('--stocks', nargs = '+', help = '평가할 종목 코드 (기본: 전체)')
+    parser.add_argument('--epochs', type = int, default = COLD_TRAINING['epochs'], help = 'LSTM 학습 epoch')
+    parser.add_argument('--tolerance', type = float, default = 0.01, help = 'hit rate 기준 (실제 종가 대비 오차 비율)')
+    args = parser.parse_args()
+
+    df = load_stock_data()
+    if df is None:
+        raise SystemExit(1)
+
+    engine_options = {'lstm': {'epochs': args.epochs, 'batch_size': COLD_TRAINING['batch_size'], 'seed': TRAIN_SEED, 'budget': TRAIN_JOB_BUDGET},
+                      'gbm': {'seed': TRAIN_SEED}}
+    predictions, timings = run_backtest(df, args.engines, args.folds, args.test_size, codes = args.stocks, engine_options = engine_options)
+    if predictions.empty:
+        print("[!] 평가할 데이터가 없습니다.")
+        raise SystemExit(1)
+
+    summary = summarize(predictions, ['engine'], args.tolerance)
+    rows = []
+    for engine_name in args.engines:
+        timing = timings[engine_name]
+        row = {
+            'engine': engine_name,
+            'fit_s': round(timing['fit'], 2),
+            'predict_ms_per_window': round(timing['predict'] / max(timing['windows'], 1) * 1000, 3),
+            'import_s': round(import_time(ENGINE_IMPORTS[engine_name]), 2)
+        }
+        if engine_name in summary.index:
+            row.update(summary.loc[engine_name].to_dict())
+        rows.append(row)
+
+    pd.set_option('display.width', 200)
+    print(f"\n[Benchmark] 예측 엔진 ({predictions['stock_code'].nunique()}개 종목, {args.folds}개 구간 x {args.test_size}일)")
+    print(pd.DataFrame(rows).set_index('engine').to_string())
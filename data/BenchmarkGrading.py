@@ -0,0 +1,132 @@
+# python ./data/BenchmarkGrading.py --predictions 100000 --stocks 50 --rtt 30
+# 채점 방식 비교 (합성 데이터, DB 대신 요청 수를 세는 가짜 클라이언트 사용)
+#   legacy : 종목별 boolean mask 로 CSV 조회 + 예측 1개당 update 요청 1회
+#   vector : (stock_code, Date) 종가 인덱스 + 전체 예측 한 번에 채점 + 채점 결과가 같은 예측끼리 GRADING_CHUNK_SIZE 개씩 update
+#
+# 예상 시간 = 계산 시간 + 요청 수 x rtt (요청 1회 왕복 시간, ms)
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import date, timedelta
+from GradePredictions import load_price_index, grade_frame, update_graded, GRADING_CHUNK_SIZE
+
+class CountingClient():
+    """ supabase.table(...).update(...).eq(...) / .in_(...).execute() 호출 수와 전송 크기(본문 + id 목록)만 기록 """
+    def __init__(self):
+        self.requests = 0
+        self.payload_bytes = 0
+
+    def table(self, name):
+        return self
+
+    def update(self, data):
+        self.payload = data
+        return self
+
+    def in_(self, column, values):
+        self.payload_bytes += len(','.join(map(str, values)))
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        self.requests += 1
+        self.payload_bytes += len(json.dumps(self.payload, ensure_ascii=False, default=str))
+        return self
+
+def legacy_grade(client, stock_df, pending_predictions, yesterday, today):
+    """ 기존 GradePredictions.grade_predictions 의 채점/저장 부분 """
+    actual_trends = {}
+    for stock_code in set(p['stock_code'] for p in pending_predictions):
+        code_df = stock_df[stock_df['stock_code'] == stock_code]
+        yesterday_data = code_df[code_df['Date'] == yesterday]
+        today_data = code_df[code_df['Date'] == today]
+        if not yesterday_data.empty and not today_data.empty:
+            price_t = yesterday_data.iloc[0]['Close']
+            price_t1 = today_data.iloc[0]['Close']
+            actual_trends[stock_code] = "상승" if price_t1 > price_t else "하락"
+
+    predictions_to_update = []
+    for pred in pending_predictions:
+        if pred['stock_code'] not in actual_trends:
+            continue
+        actual_trend = actual_trends[pred['stock_code']]
+        predictions_to_update.append({
+            'id': pred['id'],
+            'is_checked': True,
+            'actual_trend': actual_trend,
+            'result': actual_trend == pred['predicted_trend'],
+            'points_awarded': None
+        })
+
+    for update_data in predictions_to_update:
+        pred_id = update_data.pop('id')
+        client.table('predict_game').update(update_data).eq('id', pred_id).execute()
+    return len(predictions_to_update)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'grading benchmark')
+    parser.add_argument('--predictions', type = int, default = 100000)
+    parser.add_argument('--stocks', type = int, default = 50)
+    parser.add_argument('--days', type = int, default = 500, help = '종목별 가격 데이터 일수')
+    parser.add_argument('--rtt', type = float, default = 30, help = 'DB 요청 1회 왕복 시간 (ms)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    today = date(2025, 3, 4)
+    yesterday = today - timedelta(days=1)
+    codes = [f"{index:06d}" for index in range(args.stocks)]
+    dates = pd.date_range(end=pd.Timestamp(today), periods=args.days, freq='D')
+
+    stock_df = pd.DataFrame({
+        'stock_code': np.repeat(codes, len(dates)),
+        'Date': np.tile(dates, len(codes)),
+        'Close': rng.integers(10000, 100000, len(codes) * len(dates))
+    })
+    pending_predictions = [{
+        'id': index,
+        'user_id': f"user-{index}",
+        'stock_code': codes[rng.integers(len(codes))],
+        'predicted_trend': "상승" if rng.random() < 0.5 else "하락",
+        'predict_opinion': "",
+        'prediction_date': yesterday.isoformat(),
+        'is_checked': False,
+        'result': None,
+        'points_awarded': None,
+        'actual_trend': None,
+        'actual_price': None
+    } for index in range(args.predictions)]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = Path(work_dir) / 'stock_data.csv'
+        stock_df.to_csv(csv_path, index=False)
+
+        # legacy: CSV 로드 + 종목별 mask + 예측별 update
+        client = CountingClient()
+        start_time = time.perf_counter()
+        legacy_df = pd.read_csv(csv_path, dtype={'stock_code': str})
+        legacy_df['Date'] = pd.to_datetime(legacy_df['Date']).dt.date
+        legacy_count = legacy_grade(client, legacy_df, [dict(pred) for pred in pending_predictions], yesterday, today)
+        legacy = {'method': 'legacy', 'graded': legacy_count, 'compute_s': time.perf_counter() - start_time, 'requests': client.requests, 'payload_mb': client.payload_bytes / 1e6}
+
+        # vector: 종가 인덱스 + 한 번에 채점 + 채점 결과별 chunk update
+        client = CountingClient()
+        start_time = time.perf_counter()
+        price_index = load_price_index(csv_path)
+        graded = grade_frame(pd.DataFrame(pending_predictions), price_index)
+        vector_count = update_graded(client, graded)
+        vector = {'method': f'vector (chunk {GRADING_CHUNK_SIZE})', 'graded': vector_count, 'compute_s': time.perf_counter() - start_time, 'requests': client.requests, 'payload_mb': client.payload_bytes / 1e6}
+
+    rows = pd.DataFrame([legacy, vector]).set_index('method')
+    rows['estimated_s'] = rows['compute_s'] + rows['requests'] * args.rtt / 1000
+    same = (legacy_count == vector_count)
+
+    pd.set_option('display.width', 200)
+    print(f"\n[Benchmark] 채점 ({args.predictions:,}개 예측, {args.stocks}개 종목, 요청 왕복 {args.rtt:.0f}ms 가정)")
+    print(rows.round({'compute_s': 3, 'payload_mb': 2, 'estimated_s': 1}).to_string())
+    print(f"\n[+] 채점 결과 수 일치: {same}")
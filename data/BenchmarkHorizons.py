@@ -0,0 +1,129 @@
+# python ./data/BenchmarkHorizons.py --epochs 20 --test-size 40 --horizons 1 3 5
+# 다중 시점 예측 비용 비교: 다음 날 전용 LSTM vs --horizons 를 함께 내는 LSTM 1개 (cache/stock_data.csv, DB 사용 안 함)
+#
+# 시점마다 모델을 따로 두면 학습/예측 비용이 시점 수만큼 늘어나지만, 다중 출력 모델은 마지막 Dense 층만 커지므로
+# 학습 시간과 예측 시간이 다음 날 전용 모델과 거의 같아야 함. 평가 구간(마지막 test_size 일)의 시점별 MAE 도 함께 출력
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from FeatureScaler import FeatureScaler
+from PredictModel import FEATURES, SEQUENCE_LENGTH, COLD_TRAINING, load_stock_data
+from ModelTraining import TRAIN_SEED, TRAIN_JOB_BUDGET, train_models
+
+def evaluation_windows(values, test_start, horizons):
+    """ 평가 구간에서 끝나는 윈도우와 시점별 실제 종가 (윈도우 마지막 날 + h 가 데이터 안에 있는 것만) """
+    ends = np.arange(test_start - 1, len(values) - max(horizons))
+    windows = np.stack([values[end - SEQUENCE_LENGTH + 1:end + 1] for end in ends]).astype(np.float32)
+    return ends, windows
+
+def timed_predict(model, windows, repeat=20):
+    """ 첫 호출(그래프 생성)을 제외한 1회 예측 평균 시간 """
+    import tensorflow as tf
+
+    inputs = tf.constant(windows)
+    model(inputs, training=False)
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        outputs = model(inputs, training=False)
+    return outputs.numpy(), (time.perf_counter() - start_time) / repeat
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'multi-horizon prediction benchmark')
+    parser.add_argument('--stocks', nargs = '+', help = '평가할 종목 코드 (기본: 전체)')
+    parser.add_argument('--epochs', type = int, default = COLD_TRAINING['epochs'])
+    parser.add_argument('--test-size', type = int, default = 40, help = '평가 거래일 수 (학습에서 제외)')
+    parser.add_argument('--horizons', type = int, nargs = '+', default = [1, 3, 5], help = '다중 출력 모델의 예측 시점')
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    df = load_stock_data()
+    if df is None:
+        raise SystemExit(1)
+
+    multi_horizons = tuple(sorted(set(args.horizons) | {1}))
+    configs = {'single': (1,), 'multi': multi_horizons}
+    close_index = FEATURES.index('Close')
+
+    stocks = {}
+    for code in (args.stocks or df['stock_code'].unique()):
+        values = df[df['stock_code'] == code][FEATURES].dropna().to_numpy(dtype=np.float64)
+        test_start = len(values) - args.test_size
+        if test_start < SEQUENCE_LENGTH + 50:
+            print(f"[!] {code}: 데이터가 부족하여 건너뜁니다 ({len(values)} rows).")
+            continue
+        stocks[code] = (values, test_start, FeatureScaler(FEATURES).fit(values[:test_start]))
+
+    if not stocks:
+        raise SystemExit(1)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # 두 설정을 차례로 학습 (같은 프로세스 풀 설정, 같은 시드)
+        train_times = {}
+        for name, horizons in configs.items():
+            jobs = [{
+                'code': code,
+                'model_path': str(Path(work_dir) / f"{code}_{name}.keras"),
+                'mode': 'cold',
+                'values': scaler.transform(values[:test_start]).astype(np.float32),
+                'close_index': close_index,
+                'sequence_length': SEQUENCE_LENGTH,
+                'epochs': args.epochs,
+                'batch_size': COLD_TRAINING['batch_size'],
+                'streaming': False,
+                'seed': TRAIN_SEED,
+                'budget': TRAIN_JOB_BUDGET,
+                'horizons': horizons
+            } for code, (values, test_start, scaler) in stocks.items()]
+
+            start_time = time.perf_counter()
+            results = train_models(jobs)
+            train_times[name] = (time.perf_counter() - start_time, sum(result['elapsed'] or 0 for result in results.values()))
+
+        rows = []
+        errors = []
+        predict_times = {name: 0.0 for name in configs}
+        for code, (values, test_start, scaler) in stocks.items():
+            ends, windows = evaluation_windows(scaler.transform(values), test_start, multi_horizons)
+            close = values[:, close_index]
+
+            for name, horizons in configs.items():
+                model = tf.keras.models.load_model(Path(work_dir) / f"{code}_{name}.keras")
+                outputs, elapsed = timed_predict(model, windows)
+                predict_times[name] += elapsed
+
+                predicted = scaler.inverse_transform_feature(outputs, 'Close')
+                for index, horizon in enumerate(horizons):
+                    errors.append({'model': name, 'horizon': horizon, 'abs_error': np.abs(predicted[:, index] - close[ends + horizon]).mean()})
+
+            for horizon in multi_horizons:
+                errors.append({'model': 'naive', 'horizon': horizon, 'abs_error': np.abs(close[ends] - close[ends + horizon]).mean()})
+
+    for name, horizons in configs.items():
+        wall, job_total = train_times[name]
+        rows.append({
+            'model': name,
+            'horizons': ','.join(map(str, horizons)),
+            'train_wall_s': round(wall, 2),
+            'train_jobs_s': round(job_total, 2),
+            'predict_ms': round(predict_times[name] * 1000, 2)
+        })
+
+    # 시점마다 다음 날 전용 모델을 따로 학습/예측하는 경우의 비용 추정
+    single = rows[0]
+    rows.append({
+        'model': 'separate (추정)',
+        'horizons': ','.join(map(str, multi_horizons)),
+        'train_wall_s': round(single['train_wall_s'] * len(multi_horizons), 2),
+        'train_jobs_s': round(single['train_jobs_s'] * len(multi_horizons), 2),
+        'predict_ms': round(single['predict_ms'] * len(multi_horizons), 2)
+    })
+
+    pd.set_option('display.width', 200)
+    print(f"\n[Benchmark] 다중 시점 예측 비용 ({len(stocks)}개 종목, {args.epochs} epochs)")
+    print(pd.DataFrame(rows).set_index('model').to_string())
+    print(f"\n[Benchmark] 평가 구간 시점별 MAE (원)")
+    print(pd.DataFrame(errors).groupby(['horizon', 'model'])['abs_error'].mean().round(1).unstack().to_string())
@@ -0,0 +1,135 @@
+# python ./data/BenchmarkInference.py --copies 5
+# 추론 모델 형식 비교: model.keras (tf.keras.models.load_model) vs TFLite float16 / int8 (models/manifest.json 의 현재 모델)
+#
+# 형식마다 새 프로세스에서 측정 (RSS 가 서로 섞이지 않도록)
+#   import_s   : 추론 라이브러리 import 시간
+#   load_s     : 모델 전체(종목 수 x copies) 로드 시간
+#   rss_mb     : 모델 로드로 늘어난 RSS (import 후 대비)
+#   latency_ms : 윈도우 1개 예측 평균 시간 (첫 호출 제외, keras 는 tf.function 그래프)
+#   max_error  : 같은 윈도우에서 keras 대비 최대 절대 오차 (스케일된 Close)
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from FeatureScaler import FeatureScaler
+from ModelExport import convert, tflite_path, check_accuracy, TFLiteModel
+from PredictModel import FEATURES, SEQUENCE_LENGTH, MODEL_DIR, load_stock_data
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def measure(model_format, paths, windows_path, repeat):
+    """ 자식 프로세스: 한 형식의 import / 로드 / 예측 측정 결과를 JSON 으로 출력 """
+    start_time = time.perf_counter()
+    if model_format == 'keras':
+        import tensorflow as tf
+        # PredictModel.predict_batch 와 같이 그래프(tf.function)로 실행
+        loader = lambda path: tf.function(tf.keras.models.load_model(path))
+    else:
+        from ModelExport import TFLiteModel, interpreter_class
+        interpreter_class()
+        loader = TFLiteModel
+    import_s = time.perf_counter() - start_time
+    base_rss = rss_mb()
+
+    start_time = time.perf_counter()
+    models = [loader(path) for path in paths]
+    load_s = time.perf_counter() - start_time
+    model_rss = rss_mb() - base_rss
+
+    windows = np.load(windows_path)
+    latencies = []
+    for model, window in zip(models, windows):
+        np.asarray(model(window[None]))
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            np.asarray(model(window[None]))
+        latencies.append((time.perf_counter() - start_time) / repeat)
+
+    print(json.dumps({'import_s': import_s, 'load_s': load_s, 'rss_mb': model_rss, 'latency_ms': float(np.mean(latencies)) * 1000}))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'inference format benchmark')
+    parser.add_argument('--copies', type = int, default = 1, help = '종목 수가 많을 때를 흉내 내기 위해 모델마다 여러 번 로드')
+    parser.add_argument('--repeat', type = int, default = 50, help = '모델별 예측 반복 횟수')
+    parser.add_argument('--measure', nargs = 3, metavar = ('FORMAT', 'PATHS_JSON', 'WINDOWS'), help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        model_format, paths_json, windows_path = args.measure
+        measure(model_format, json.loads(Path(paths_json).read_text()), windows_path, args.repeat)
+        raise SystemExit(0)
+
+    import tensorflow as tf
+
+    manifest = json.loads((MODEL_DIR / 'manifest.json').read_text(encoding='utf-8'))
+    df = load_stock_data()
+    if df is None:
+        raise SystemExit(1)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        paths = {'keras': [], 'float16': [], 'int8': []}
+        windows = []
+        errors = {'float16': [], 'int8': []}
+
+        for code, entry in manifest.get('stocks', {}).items():
+            if not entry.get('path'):
+                continue
+            artifact_dir = MODEL_DIR / entry['path']
+            scaler = FeatureScaler.load(artifact_dir / 'scaler.npz')
+            values = scaler.transform(df[df['stock_code'] == code][FEATURES].dropna().to_numpy()).astype(np.float32)
+            check_windows = np.lib.stride_tricks.sliding_window_view(values, (SEQUENCE_LENGTH, len(FEATURES)))[:, 0]
+
+            model_path = artifact_dir / 'model.keras'
+            model = tf.keras.models.load_model(model_path)
+            paths['keras'].append(str(model_path))
+            windows.append(check_windows[-1])
+
+            for quantization in ('float16', 'int8'):
+                path = tflite_path(work_dir / f"{code}_{quantization}.keras")
+                path.write_bytes(convert(model, quantization))
+                paths[quantization].append(str(path))
+                errors[quantization].append(check_accuracy(model, TFLiteModel(path), check_windows))
+
+        if not windows:
+            print("[!] manifest 에 모델이 없습니다. PredictModel.py 를 먼저 실행하세요.")
+            raise SystemExit(1)
+
+        windows_path = work_dir / 'windows.npy'
+        np.save(windows_path, np.repeat(np.stack(windows), args.copies, axis=0))
+
+        rows = []
+        for model_format, format_paths in paths.items():
+            paths_json = work_dir / f"{model_format}_paths.json"
+            paths_json.write_text(json.dumps(format_paths * args.copies))
+
+            completed = subprocess.run([sys.executable, __file__, '--repeat', str(args.repeat), '--measure', 'keras' if model_format == 'keras' else 'tflite', str(paths_json), str(windows_path)],
+                                       capture_output=True, text=True, check=True)
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            rows.append({
+                'format': model_format,
+                'file_kb': round(np.mean([Path(path).stat().st_size for path in format_paths]) / 1024, 1),
+                'import_s': round(result['import_s'], 2),
+                'load_s': round(result['load_s'], 3),
+                'rss_mb': round(result['rss_mb'], 1),
+                'latency_ms': round(result['latency_ms'], 3),
+                'max_error': 0.0 if model_format == 'keras' else float(f"{max(errors[model_format]):.2e}")
+            })
+
+    pd.set_option('display.width', 200)
+    print(f"\n[Benchmark] 추론 모델 형식 ({len(windows)}개 종목 x {args.copies}, 윈도우 1개 예측)")
+    print(pd.DataFrame(rows).set_index('format').to_string())
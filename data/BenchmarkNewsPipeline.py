@@ -0,0 +1,65 @@
+# python ./data/BenchmarkNewsPipeline.py --queries 10 --articles 100 --latency 0.5 --rate-limit 0.1
+# 로컬 대체 서버(NewsFixtureServer)로 GetNewsData.run >> json_files_load 전체 구간을 오프라인으로 측정
+import os, time, argparse, tempfile
+from pathlib import Path
+from NewsFixtureServer import FixtureConfig, start_server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Offline news pipeline benchmark')
+    parser.add_argument('--queries', type = int, default = 10)
+    parser.add_argument('--articles', type = int, default = 100, help = '검색어별 기사 수')
+    parser.add_argument('--latency', type = float, default = 0.0, help = 'Gemini 응답 지연(초)')
+    parser.add_argument('--error-rate', type = float, default = 0.0)
+    parser.add_argument('--rate-limit', type = float, default = 0.0)
+    parser.add_argument('--malformed', type = float, default = 0.0)
+    parser.add_argument('--engine', default = 'gemini', help = 'gemini | local | hybrid')
+    args = parser.parse_args()
+
+    config = FixtureConfig(latency = args.latency, error_rate = args.error_rate, rate_limit_rate = args.rate_limit,
+                           malformed_rate = args.malformed, articles_per_query = args.articles)
+    server, base_url = start_server(config)
+
+    # GetNews 를 import 하기 전에 API 주소를 로컬 서버로 교체
+    os.environ['NAVER_NEWS_URL'] = f'{base_url}/v1/search/news.json'
+    os.environ['GEMINI_BASE_URL'] = base_url
+    os.environ['GEMINI_THROTTLE'] = '0'
+
+    from GetNews import GetNewsData, json_files_load
+    from SentimentEngine import make_engine
+    from NewsJournal import NewsJournal
+
+    stocks = [{'name': f'종목{index}', 'code': f'{index:06d}.KS'} for index in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        collect = GetNewsData(engine = make_engine(args.engine))
+        collect.watermark_path = Path(tmp_dir) / 'news_watermark.json'
+        journal = NewsJournal.open_run(tmp_dir)
+
+        # 1회차: 워터마크 없음 >> 검색어별 (articles / 25) 페이지 전체 수집
+        start_time = time.perf_counter()
+        scored = 0
+        for stock in stocks:
+            scored += len(collect.run(query = stock['name'], get_page_value = args.articles // 25, journal = journal))
+        run_elapsed = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        json_files_load(stocks, journal, dry_run = True)
+        load_elapsed = time.perf_counter() - start_time
+
+        # 2회차: 새 기사가 없는 날 >> 1회차에서 실패한 검색어만 이어서 분석하고 나머지는 워터마크에서 바로 멈춤
+        counters_before = dict(config.counters)
+        start_time = time.perf_counter()
+        for stock in stocks:
+            collect.run(query = stock['name'], get_page_value = args.articles // 25, journal = journal)
+        quiet_elapsed = time.perf_counter() - start_time
+
+    server.shutdown()
+
+    counters = config.counters
+    print("\n[Benchmark] News pipeline (offline)")
+    print(f"  queries x articles      : {args.queries} x {args.articles}")
+    print(f"  GetNewsData.run         : {run_elapsed:.2f}s ({scored} news scored, {scored / run_elapsed if run_elapsed else 0:,.1f} news/s)")
+    print(f"  json_files_load         : {load_elapsed:.3f}s")
+    print(f"  re-run (resume/quiet)   : {quiet_elapsed:.2f}s (search {counters['search'] - counters_before['search']}, gemini {counters['gemini'] - counters_before['gemini']})")
+    print(f"  search / article calls  : {counters['search']} / {counters['article']}")
+    print(f"  gemini calls            : {counters['gemini']} (500: {counters['gemini_error']}, 429: {counters['gemini_429']}, malformed: {counters['gemini_malformed']})")
@@ -0,0 +1,71 @@
+# python ./data/BenchmarkScaler.py --stocks 10 --rows 6000
+# 스케일러 저장 방식 비교: 기존 Feature 별 MinMaxScaler pickle vs 종목당 FeatureScaler(.npz) 1개
+import time, argparse, tempfile
+import numpy as np
+import joblib
+from pathlib import Path
+from sklearn.preprocessing import MinMaxScaler
+from FeatureScaler import FeatureScaler, legacy_scaler_paths, load_scaler
+
+FEATURES = ['Close', 'Volume', 'SMA_50', 'RSI', 'ATR', 'OBV', 'ADX', 'MACD_Soft_-100_100']
+
+def timed(function):
+    start_time = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start_time
+
+def directory_size(path):
+    files = [file for file in Path(path).iterdir() if file.is_file()]
+    return len(files), sum(file.stat().st_size for file in files)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'scaler artifact benchmark')
+    parser.add_argument('--stocks', type = int, default = 10)
+    parser.add_argument('--rows', type = int, default = 6000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    codes = [f"{index:06d}" for index in range(args.stocks)]
+    frames = {code: rng.random((args.rows, len(FEATURES))) * rng.integers(1, 100000, len(FEATURES)) for code in codes}
+
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as new_dir:
+        # 기존 방식: Feature 마다 MinMaxScaler fit + pickle 저장
+        def legacy_fit_save():
+            for code, values in frames.items():
+                for index, (feature, path) in enumerate(legacy_scaler_paths(legacy_dir, code, FEATURES).items()):
+                    joblib.dump(MinMaxScaler().fit(values[:, [index]]), path)
+        _, legacy_save = timed(legacy_fit_save)
+        legacy_files, legacy_bytes = directory_size(legacy_dir)
+
+        def legacy_load_transform():
+            outputs = {}
+            for code, values in frames.items():
+                scalers = {feature: joblib.load(path) for feature, path in legacy_scaler_paths(legacy_dir, code, FEATURES).items()}
+                outputs[code] = np.column_stack([scalers[feature].transform(values[:, [index]])[:, 0] for index, feature in enumerate(FEATURES)])
+            return outputs
+        legacy_outputs, legacy_load = timed(legacy_load_transform)
+
+        # 새 방식: 종목당 FeatureScaler 1개 (.npz)
+        def new_fit_save():
+            for code, values in frames.items():
+                FeatureScaler(FEATURES).fit(values).save(Path(new_dir) / f"{code}.scaler.npz")
+        _, new_save = timed(new_fit_save)
+        new_files, new_bytes = directory_size(new_dir)
+
+        def new_load_transform():
+            return {code: FeatureScaler.load(Path(new_dir) / f"{code}.scaler.npz").transform(values) for code, values in frames.items()}
+        new_outputs, new_load = timed(new_load_transform)
+
+        for code in codes:
+            assert np.array_equal(legacy_outputs[code], new_outputs[code])
+
+        # 기존 pickle 자동 변환 결과도 같은지 확인
+        for code in codes:
+            migrated = load_scaler(Path(legacy_dir) / f"{code}.scaler.npz", legacy_dir, code, FEATURES)
+            assert np.array_equal(migrated.transform(frames[code]), new_outputs[code])
+        assert directory_size(legacy_dir)[0] == args.stocks
+
+    print(f"[Benchmark] scaler artifacts ({args.stocks} stocks x {args.rows} rows, {len(FEATURES)} features)")
+    print(f"  {'':<20} {'files':>6} {'bytes':>10} {'fit+save':>10} {'load+transform':>16}")
+    print(f"  {'MinMaxScaler pkl':<20} {legacy_files:>6} {legacy_bytes:>10,} {legacy_save:>9.3f}s {legacy_load:>15.3f}s")
+    print(f"  {'FeatureScaler npz':<20} {new_files:>6} {new_bytes:>10,} {new_save:>9.3f}s {new_load:>15.3f}s")
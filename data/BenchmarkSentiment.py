@@ -0,0 +1,79 @@
+# python ./data/BenchmarkSentiment.py --gemini-latency 2
+# 저널에 기록된 Gemini 분석 결과를 기준으로 로컬 감성분석 엔진의 처리량과 일치율 비교
+# Gemini 처리량은 로컬 대체 서버(NewsFixtureServer)에 GeminiEngine 으로 요청하여 측정 (요청 간 대기 제외, 응답 지연은 --gemini-latency)
+import os, time, argparse
+from pathlib import Path
+from SentimentEngine import LocalEngine, HybridEngine, SentimentEngine, GeminiEngine, GEMINI_THROTTLE, GEMINI_BATCH, load_labeled_articles, train_classifier
+from NewsFixtureServer import FixtureConfig, start_server
+
+class LabelEngine(SentimentEngine):
+    """ Gemini 라벨을 그대로 돌려주는 엔진 (HybridEngine 의 원격 엔진 대체) """
+    name = 'gemini'
+
+    def score(self, articles):
+        return [{'date': article.get('date'), 'score': article['score'], 'engine': self.name} for article in articles]
+
+def agreement(articles, results) -> float:
+    """ 긍정/부정 라벨 일치율 """
+    matched = sum((article['score'] >= 51) == (result['score'] >= 51) for article, result in zip(articles, results))
+    return matched / len(articles)
+
+def measure(name, engine, articles):
+    start_time = time.perf_counter()
+    results = engine.score(articles)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{name:<22} {len(articles) / elapsed:>12,.1f} news/s {agreement(articles, results) * 100:>10.1f}%")
+    return results
+
+def measure_gemini(articles, latency) -> float:
+    """ 대체 서버에 GEMINI_BATCH 개씩 요청한 처리량(news/s). 대체 서버의 점수는 임의 값이므로 일치율은 계산하지 않음 """
+    server, base_url = start_server(FixtureConfig(latency = latency))
+    os.environ['GEMINI_BASE_URL'] = base_url
+    os.environ['GEMINI_THROTTLE'] = '0'
+    try:
+        engine = GeminiEngine()
+        start_time = time.perf_counter()
+        for start in range(0, len(articles), GEMINI_BATCH):
+            engine.score(articles[start:start + GEMINI_BATCH])
+        return len(articles) / (time.perf_counter() - start_time)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'sentiment engine benchmark')
+    parser.add_argument('--gemini-latency', type = float, default = 2.0, help = '대체 서버의 Gemini 응답 지연(초)')
+    args = parser.parse_args()
+
+    articles = load_labeled_articles(Path.cwd() / 'cache')
+
+    if len(articles) < 20:
+        print(f"[!] Gemini 라벨이 부족합니다 ({len(articles)}개). 뉴스 파이프라인을 먼저 실행하세요.")
+        raise SystemExit(1)
+
+    # 시간 순으로 앞 80% 학습, 뒤 20% 평가
+    articles = sorted(articles, key = lambda article: article['pubDate'] or '')
+    split = int(len(articles) * 0.8)
+    train_articles, test_articles = articles[:split], articles[split:]
+
+    print(f"[+] 학습 {len(train_articles)}개 / 평가 {len(test_articles)}개 뉴스")
+    print(f"{'engine':<22} {'throughput':>19} {'agreement':>11}")
+
+    lexicon_engine = LocalEngine(classifier_path = None)
+    measure('local (lexicon)', lexicon_engine, test_articles)
+
+    classifier_engine = LocalEngine(classifier_path = None)
+    classifier_engine.classifier = train_classifier(train_articles, classifier_path = None)
+    measure('local (classifier)', classifier_engine, test_articles)
+
+    # 하이브리드: 애매한 뉴스만 Gemini 라벨 사용 >> Gemini 호출 비율 측정
+    hybrid_engine = HybridEngine(classifier_engine, LabelEngine())
+    results = hybrid_engine.score(test_articles)
+    remote_count = sum(result['engine'] == 'gemini' for result in results)
+    print(f"{'hybrid':<22} {'-':>19} {agreement(test_articles, results) * 100:>10.1f}%  (Gemini 호출 비율 {remote_count / len(test_articles) * 100:.1f}%)")
+
+    # Gemini: 대체 서버 측정값 (응답 지연 --gemini-latency, 요청 간 대기 없음) + 운영 환경 추정값 (요청 간 GEMINI_THROTTLE 초 대기 포함)
+    throughput = measure_gemini(test_articles, args.gemini_latency)
+    print(f"{'gemini (fixture)':<22} {throughput:>12,.1f} news/s {'-':>11}  (대체 서버 측정, 응답 지연 {args.gemini_latency}s)")
+    estimate = GEMINI_BATCH / (GEMINI_BATCH / throughput + GEMINI_THROTTLE)
+    print(f"{'gemini (estimate)':<22} {estimate:>12,.1f} news/s {'-':>11}  (추정값: 측정값 + 요청 간 {GEMINI_THROTTLE}초 대기, 기준 라벨)")
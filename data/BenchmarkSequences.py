@@ -0,0 +1,45 @@
+# python ./data/BenchmarkSequences.py --rows 6000 --stocks 10
+# create_sequences: 기존 Python 루프 방식과 PredictModel.create_sequences (sliding_window_view) 의 시간/최대 메모리 비교
+import time, argparse, tracemalloc
+import numpy as np
+import pandas as pd
+from PredictModel import FEATURES, SEQUENCE_LENGTH, create_sequences
+
+def create_sequences_loop(data, sequence_length):
+    """ 기존 구현 (윈도우마다 .values 복사 후 np.array 로 다시 복사) """
+    sequences, targets = [], []
+    for i in range(len(data) - sequence_length):
+        sequences.append(data.iloc[i:i+sequence_length].values)
+        targets.append(data['Close'].iloc[i+sequence_length])
+    return np.array(sequences), np.array(targets)
+
+def measure(function, frames):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    results = [function(frame, SEQUENCE_LENGTH) for frame in frames]
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, elapsed, peak
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'create_sequences benchmark')
+    parser.add_argument('--rows', type = int, default = 6000, help = '종목별 데이터 행 수 (period=max 기준 약 6000)')
+    parser.add_argument('--stocks', type = int, default = 10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    frames = [pd.DataFrame(rng.random((args.rows, len(FEATURES))), columns = FEATURES) for _ in range(args.stocks)]
+
+    loop_results, loop_elapsed, loop_peak = measure(create_sequences_loop, frames)
+    view_results, view_elapsed, view_peak = measure(create_sequences, frames)
+
+    # 같은 결과인지 확인 (float32 정밀도 기준)
+    for (loop_X, loop_y), (view_X, view_y) in zip(loop_results, view_results):
+        assert loop_X.shape == view_X.shape and loop_y.shape == view_y.shape
+        assert np.allclose(loop_X, view_X, rtol = 1e-6) and np.allclose(loop_y, view_y, rtol = 1e-6)
+
+    print(f"[Benchmark] create_sequences ({args.stocks} stocks x {args.rows} rows, window {SEQUENCE_LENGTH})")
+    print(f"  loop          : {loop_elapsed:8.3f}s  peak {loop_peak / 1024 ** 2:10.1f} MiB")
+    print(f"  sliding view  : {view_elapsed:8.3f}s  peak {view_peak / 1024 ** 2:10.1f} MiB")
+    print(f"  speedup       : {loop_elapsed / view_elapsed:8.1f}x")
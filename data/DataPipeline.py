@@ -1,11 +1,16 @@
 import pandas as pd
 import FinanceDataReader as fdr
 import os
+import argparse
 from pathlib import Path
 from datetime import datetime
 from GetData import get_all_stock_data, get_technical_data, extract_unique_rows
-from GetNews import GetNewsData, combine_json_files, json_files_load
+from GetNews import GetNewsData, json_files_load
+from SentimentEngine import make_engine
+from NewsJournal import NewsJournal, prune_journals
 from SupabaseHandle import insert_rows, request_table
+from TradingCalendar import TradingCalendar, load_holidays
+from Telemetry import count
 from supabase import Client, create_client
 from dotenv import load_dotenv
 
@@ -25,13 +30,8 @@ try:
 except Exception as e:
     print(f"Connection Error: {e}")
 
-if __name__=="__main__":
-    """ Technical Data Upload start """
-    now = datetime.now()
-    current_hour = now.hour
-    current_minute = now.minute
-
-    # market capitalization Top 10
+def get_top_10_stocks() -> list:
+    """ KRX 시가총액 상위 10개 종목 [{'name', 'code': '005930.KS'}, ...] """
     print("[Function: StockListing] KRX Data Mining Start")
     krx_df = fdr.StockListing('KRX').sort_values(by = 'Marcap', ascending = False)
     print("[Function: StockListing] KRX Data Mining Success")
@@ -41,11 +41,98 @@ if __name__=="__main__":
     top_10.rename(columns = {'Code': 'code', 'Name': 'name'}, inplace = True)
     top_10 = top_10[['name', 'code']]
     top_10['code'] = top_10['code'] + '.KS'
-    top_10_stocks = top_10.to_dict('records')
     print("[Preprocess] KRX Top 10 Data Preprocess Success")
+    return top_10.to_dict('records')
+
+def load_calendar() -> TradingCalendar:
+    """ 거래일 달력: 이미 받은 가격 데이터의 날짜 + 휴장일 목록 (오늘은 평일/휴장일 규칙으로 판단) """
+    stock_csv_path = current_path / 'cache' / 'stock_data.csv'
+    return TradingCalendar.from_csv(stock_csv_path) if stock_csv_path.exists() else TradingCalendar(holidays = load_holidays())
+
+def sync_technical_data() -> int:
+    """ stock_data.csv 중 technical_data 테이블에 없는 행 업로드 (실패 시 예외). 업로드한 행 수 리턴 """
+    print("[Function: request_table] start search DB tables")
+    supabase_table = request_table('technical_data')
+    print("[Function: request_table] search DB tables success")
+
+    # no data in 'technical_data'
+    if supabase_table.empty:
+        print("[Function: insert_rows] start insert all data")
+        all_data = pd.read_csv('./cache/stock_data.csv')
+        all_data['stock_code'] = all_data['stock_code'].astype(str).str.zfill(6)
+        insert_rows(all_data)
+        count('inserted_rows', len(all_data))
+        print("[Function: insert_rows] All data insert success.")
+        return len(all_data)
+
+    # Extract new data
+    print("[Function: extract_unique_rows] Start extract new data")
+    new_rows = extract_unique_rows(supabase_table)
+
+    # If the new data is in 'new_rows'
+    if len(new_rows) != 0:
+        print("[Function: insert_rows] Find a new data, start insert new data")
+        insert_rows(new_rows)
+        count('inserted_rows', len(new_rows))
+        print("[Function: insert_rows] New data insert success.")
+
+    # If the data is latest
+    else:
+        print("[Alert] Data is latest")
+    return len(new_rows)
+
+def collect_news(top_10_stocks, journal_dir = current_path / 'cache') -> Path:
+    """ 종목별 새 뉴스 감성분석 >> NewsJournal 기록. 사용한 저널 경로 리턴 """
+    # Get News Data
+    print("[Function: GetNewsData]: Start")
+    # NEWS_DEDUP_WEIGHT=1 : 중복 기사 수만큼 대표 기사의 점수에 가중치 부여
+    # SENTIMENT_ENGINE=gemini|local|hybrid : 감성분석 엔진 선택
+    collect = GetNewsData(
+        weight_duplicates = os.getenv('NEWS_DEDUP_WEIGHT') == '1',
+        engine = make_engine(os.getenv('SENTIMENT_ENGINE', 'gemini'))
+    )
+    print("[Function: GetNewsData]: Success")
+
+    # Get Naver News Page on the first run (1 value = 25 news), later runs fetch up to the watermark
+    get_page_value = 1
+
+    # Get News Data Sentimental-Analysis Result >> ./cache/news_journal_~.jsonl
+    journal = NewsJournal.open_run(journal_dir)
+
+    print("[Function: GetNewsData.run]: Start")
+    for stock in top_10_stocks:
+        collect.run(query = stock['name'], get_page_value = get_page_value, journal = journal)
+    print("[Function: GetNewsData.run]: Success")
+    return journal.path
+
+def upload_sentiment(top_10_stocks, journal_path) -> int:
+    """ 저널 >> sentimental_score 테이블 업로드 (업로드하지 못한 종목이 있으면 예외). 업로드 후 저널 정리 """
+    print("[Function: json_files_load]: Start")
+    journal = NewsJournal(journal_path)
+    not_updated = json_files_load(top_10_stocks, journal)
+    if not_updated:
+        raise RuntimeError(f"sentimental_score upload failed: {not_updated}")
+    prune_journals(journal.path.parent)
+    print("[Function: json_files_load]: Success")
+    return len(top_10_stocks)
+
+if __name__=="__main__":
+    # python ./data/DataPipeline.py           : 뉴스 수집 >> 감성분석 업로드
+    # python ./data/DataPipeline.py --prices  : 거래일이면 주가/기술적 지표/DB 동기화도 실행
+    # (정해진 순서로 전체 단계를 실행하는 것은 Orchestrator.py)
+    parser = argparse.ArgumentParser(description = 'data pipeline')
+    parser.add_argument('--prices', action = 'store_true', help = '주가 수집 >> 기술적 지표 >> technical_data 동기화 포함')
+    args = parser.parse_args()
 
-    # Execute only PM 3:30
-    if current_hour == 15 and current_minute == 30:
+    now = datetime.now()
+    top_10_stocks = get_top_10_stocks()
+
+    """ Technical Data Upload start """
+    calendar = load_calendar()
+    if args.prices and not calendar.is_trading_day(now.date()):
+        print(f"[Alert] {now.date()} is not a trading day >> skip stock data mining (next: {calendar.next(now.date())})")
+
+    elif args.prices:
         # create 'stock_data_cache.csv' : All Stock Data Mining result
         print("[Function: get_all_stock_data] Start")
         new_data = get_all_stock_data(top_10_stocks)
@@ -56,63 +143,14 @@ if __name__=="__main__":
         get_technical_data()
         print("[Function: get_technical_data] Success")
 
-        # Get All data in 'technical_data'
         try:
-            print("[Function: request_table] start search DB tables")
-            supabase_table = request_table('technical_data')
-            supabase_table_length = 1
-            print("[Function: request_table] search DB tables success")
-        except:
-            print("[Function: request_table] DB table is empty space")
-            supabase_table_length = 0
-
-        # no data in 'technical_data'
-        if supabase_table_length == 0:
-            print("[Function: insert_rows] start insert all data")
-            all_data = pd.read_csv('./cache/stock_data.csv')
-            all_data['stock_code'] = all_data['stock_code'].astype(str).str.zfill(6)
-            insert_rows(all_data)
-            print("[Function: insert_rows] All data insert success.")
-        
-        try:
-            # Extract new data
-            print("[Function: extract_unique_rows] Start extract new data")
-            new_rows = extract_unique_rows()
-
-            # If the new data is in 'new_rows'
-            if len(new_rows) != 0:
-                print("[Function: insert_rows] Find a new data, start insert new data")
-                insert_rows(new_rows)
-                print("[Function: insert_rows] New data insert success.")
-
-            # If the data is latest
-            else:
-                print("[Alert] Data is latest")
-
+            sync_technical_data()
         except Exception as e:
             print(f"Error: {e}")
 
     """ Sentimental-Analyze Start """
-    # Get News Data
-    print("[Function: GetNewsData]: Start")
-    collect = GetNewsData()
-    print("[Function: GetNewsData]: Success")
-
-    # Get Stock Name & Stock Code
-    stock_names = [stock['name'] for stock in top_10_stocks]
-    stock_codes = [stock['code'] for stock in top_10_stocks]
-
-    # Get Naver News Page (1 value = 25 page)
-    get_page_value = 1
-    
-    # Get News Data Sentimental-Analysis Result >> ./cache/~.json
-    print("[Function: combine_json_files]: Start")
-    for stock_name in stock_names:
-        collect.run(query = stock_name, get_page_value = get_page_value)
-        combine_json_files(query = stock_name, get_page_value = get_page_value)
-    print("[Function: combine_json_files]: Success")
-
-    # Final Json File >> Supabase Table insert
-    print("[Function: json_files_load]: Start")
-    json_files_load(top_10_stocks)
-    print("[Function: json_files_load]: Success")
\ No newline at end of file
+    journal_path = collect_news(top_10_stocks)
+    try:
+        upload_sentiment(top_10_stocks, journal_path)
+    except Exception as e:
+        print(f"Error: {e}")
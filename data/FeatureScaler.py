@@ -0,0 +1,99 @@
+# wiz-stock/data/FeatureScaler.py
+# 종목별 Feature 전체를 하나의 배열 연산으로 변환하는 Min-Max 스케일러 (종목당 파일 1개)
+import numpy as np
+import joblib
+from pathlib import Path
+
+class FeatureScaler():
+    """
+    sklearn MinMaxScaler(feature_range=(0, 1)) 를 Feature 별로 하나씩 fit 한 것과 같은 결과를 내는 스케일러
+
+    - Feature 별 최솟값/최댓값 배열만 저장 (model 옆의 {code}.scaler.npz)
+    - transform / inverse_transform 은 (행 수, Feature 수) 배열 전체를 한 번에 계산
+    """
+    def __init__(self, feature_names, data_min=None, data_max=None):
+        self.feature_names = list(feature_names)
+        self.data_min = None if data_min is None else np.asarray(data_min, dtype=np.float64)
+        self.data_max = None if data_max is None else np.asarray(data_max, dtype=np.float64)
+
+    @property
+    def scale(self):
+        # MinMaxScaler 와 같이 값의 범위가 0 인 Feature 는 1 로 나눔
+        data_range = self.data_max - self.data_min
+        return 1.0 / np.where(data_range == 0, 1.0, data_range)
+
+    def fit(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.data_min = np.nanmin(values, axis=0)
+        self.data_max = np.nanmax(values, axis=0)
+        return self
+
+    def transform(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        scale = self.scale
+        return values * scale - self.data_min * scale
+
+    def fit_transform(self, values):
+        return self.fit(values).transform(values)
+
+    def inverse_transform(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        scale = self.scale
+        return (values + self.data_min * scale) / scale
+
+    def inverse_transform_feature(self, values, feature):
+        """ 한 Feature(예: 예측한 Close) 값만 원래 단위로 변환 """
+        index = self.feature_names.index(feature)
+        scale = self.scale[index]
+        return (np.asarray(values, dtype=np.float64) + self.data_min[index] * scale) / scale
+
+    def save(self, path):
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez(tmp_path, feature_names=np.array(self.feature_names), data_min=self.data_min, data_max=self.data_max)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls([str(name) for name in data['feature_names']], data['data_min'], data['data_max'])
+
+    @classmethod
+    def from_legacy(cls, legacy_paths: dict):
+        """ 기존 Feature 별 MinMaxScaler pickle({feature: path}) >> FeatureScaler """
+        scalers = {feature: joblib.load(path) for feature, path in legacy_paths.items()}
+        return cls(
+            list(scalers),
+            [scaler.data_min_[0] for scaler in scalers.values()],
+            [scaler.data_max_[0] for scaler in scalers.values()]
+        )
+
+def legacy_scaler_paths(scaler_dir, code, feature_names) -> dict:
+    return {feature: Path(scaler_dir) / f"{code}_{feature}_scaler.pkl" for feature in feature_names}
+
+def remove_legacy_scalers(scaler_dir, code, feature_names):
+    for path in legacy_scaler_paths(scaler_dir, code, feature_names).values():
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            print(f"[!] 기존 스케일러 삭제 실패: {path.name}")
+
+def load_scaler(path, scaler_dir, code, feature_names):
+    """
+    {code}.scaler.npz 를 불러옴. 없고 기존 Feature 별 pickle 이 모두 있으면 변환하여 저장한 뒤 pickle 삭제
+
+    Returns: FeatureScaler 또는 None (스케일러 없음)
+    """
+    path = Path(path)
+    if path.exists():
+        return FeatureScaler.load(path)
+
+    legacy_paths = legacy_scaler_paths(scaler_dir, code, feature_names)
+    if not all(legacy_path.exists() for legacy_path in legacy_paths.values()):
+        return None
+
+    scaler = FeatureScaler.from_legacy(legacy_paths)
+    scaler.save(path)
+    remove_legacy_scalers(scaler_dir, code, feature_names)
+    print(f"[+] {code}: 기존 스케일러 {len(legacy_paths)}개를 {path.name} 로 변환했습니다.")
+    return scaler
@@ -5,6 +5,7 @@ import yfinance as yf
 from datetime import datetime
 from pathlib import Path
 from SupabaseHandle import request_table, insert_rows
+from Telemetry import timer, count
 import os
 
 def get_data(ticker_symbol, period="max", date = None):
@@ -27,6 +28,7 @@ def get_data(ticker_symbol, period="max", date = None):
         print(f"Error: {e}")
         return None
 
+@timer('get_all_stock_data')
 def get_all_stock_data(stock_dict, start_date = None):
     """ Get all Stock Dictionary data """
     current_path = Path.cwd()
@@ -50,6 +52,8 @@ def get_all_stock_data(stock_dict, start_date = None):
         stock_df_lists.append(df)
     
     final_df = pd.concat(stock_df_lists, ignore_index = True)
+    count('tickers', len(stock_codes))
+    count('price_rows', len(final_df))
     final_df.to_csv(file_path, index = False)
     print("Save CSV Success")
     
@@ -61,10 +65,12 @@ def preprocess_csv(file_path) -> pd.DataFrame:
     local_table['stock_code'] = local_table['stock_code'].astype(str).str.zfill(6)
     return local_table
 
-def extract_unique_rows():
-    """ Extract Unique rows """
+@timer('extract_unique_rows')
+def extract_unique_rows(get_table = None):
+    """ Extract Unique rows (get_table: 이미 조회한 technical_data 테이블, 없으면 조회) """
     # Filter Stock code rows
-    get_table = request_table('technical_data')
+    if get_table is None:
+        get_table = request_table('technical_data')
     current_path = Path.cwd()
     file_path = current_path / 'cache/stock_data.csv'
     local_table = preprocess_csv(file_path)
@@ -82,6 +88,7 @@ def extract_unique_rows():
     new_data_rows = pd.concat([get_table[columns], local_table[columns]]).reset_index(drop = True).drop_duplicates(subset = ['Date', 'stock_code'], keep = False)
     new_data_rows['OBV'] = new_data_rows['OBV'].astype(int)
     new_data_rows['stock_code'] = new_data_rows['stock_code'].astype(str).str.zfill(6)
+    count('compared_rows', len(local_table))
 
     return new_data_rows
 
@@ -359,6 +366,7 @@ def get_cross_signal(df, short_ma_col, long_ma_col):
     return signal
 
 # ===================================================================
+@timer('get_technical_data')
 def get_technical_data():
     """ 주가 데이터 Load & 기술적 분석 지표를 계산 후 DataFrame으로 반환 """
     current_path = Path.cwd()
@@ -456,6 +464,7 @@ def get_technical_data():
        'RSI', '%K', '%D', 'ADX', '+DI', '-DI', 'ATR']
 
     df[change_columns] = df[change_columns].round(2)
+    count('indicator_rows', len(df))
     df.to_csv(current_path / 'cache/stock_data.csv', index = False)
     
     return df
@@ -1,11 +1,16 @@
 import os, requests, json, re, time
 import pandas as pd
 import numpy as np
-import google.generativeai as genai
 from pathlib import Path
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
 from supabase import Client, create_client
+from NewsDedup import dedup_news
+from NewsJournal import recent_journals
+from SentimentEngine import GeminiEngine
+from Telemetry import timer, count
 
 
 # Load Parent Path
@@ -24,9 +29,6 @@ try:
 except Exception as e:
     print(f"Supabase 클라이언트 연결 실패: {e}")
 
-# Set Gemini API KEY
-genai.configure(api_key = os.getenv('GEMINI_API_KEY'))
-
 try:
     # Naver Developer API Configuration
     client_id = os.getenv('NAVER_CLIENT_ID')
@@ -35,45 +37,102 @@ try:
 except Exception as e:
     print(f"API Configuration Load Error: {e}")
 
-def request_gem(text: str, prompt: str, model: str = 'gemini-2.5-flash') -> str:
-    """ Get Reponse from Gemini """
-    client = genai.GenerativeModel(model)
+# 네이버 검색 API는 start 값을 최대 1000까지만 허용
+NAVER_MAX_START = 1000
 
-    contents = [
-        {
-            'role': 'user',
-            'parts': [f'{prompt}\n\n요청사항: {text}']
-        }
-    ]
+# API 주소 설정 (NewsFixtureServer.py 같은 로컬 대체 서버로 교체 가능)
+# - NAVER_NEWS_URL : 네이버 뉴스 검색 API 주소
+# - Gemini 주소/요청 간격(GEMINI_BASE_URL, GEMINI_THROTTLE)은 SentimentEngine.py
+NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
+
+def parse_pub_date(pub_date: str) -> datetime:
+    """ 네이버 pubDate(RFC 822, 예: 'Mon, 20 Oct 2025 14:03:00 +0900') >> datetime """
+    return parsedate_to_datetime(pub_date)
+
+def load_watermarks(path) -> dict:
+    """ 검색어별로 마지막으로 처리한 뉴스의 pubDate/link 정보를 불러옴 """
+    try:
+        with open(path, 'r', encoding = 'utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        print(f"Watermark file is broken, start from scratch: {path}")
+        return {}
+
+def save_watermarks(path, watermarks: dict):
+    """ 워터마크를 임시 파일에 기록한 뒤 교체하여 중간에 깨진 파일이 남지 않도록 저장 """
+    path = Path(path)
+    path.parent.mkdir(exist_ok = True)
+    tmp_path = path.with_suffix('.tmp')
+
+    with open(tmp_path, 'w', encoding = 'utf-8') as f:
+        json.dump(watermarks, f, indent = 4, ensure_ascii = False)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
 
-    time.sleep(25)
+def is_seen(item: dict, watermark: dict) -> bool:
+    """ 뉴스 item이 워터마크 시점 이전(또는 이미 처리한 링크)인지 확인 """
+    if not watermark:
+        return False
 
-    response = client.generate_content(
-        contents = contents
-    )
+    item_date = parse_pub_date(item['pubDate'])
+    watermark_date = datetime.fromisoformat(watermark['pubDate'])
 
-    return response.text
+    if item_date < watermark_date:
+        return True
+
+    # 같은 시각에 발행된 기사는 링크로 구분
+    return item_date == watermark_date and item['link'] in watermark.get('links', [])
+
+def next_watermark(items: list, watermark: dict) -> dict:
+    """ 새로 처리한 뉴스 목록으로 워터마크 갱신 (가장 최신 pubDate와 해당 시각의 링크 목록) """
+    if not items:
+        return watermark
+
+    newest_date = max(parse_pub_date(item['pubDate']) for item in items)
+    links = [item['link'] for item in items if parse_pub_date(item['pubDate']) == newest_date]
+
+    if watermark and datetime.fromisoformat(watermark['pubDate']) == newest_date:
+        links = list(dict.fromkeys(watermark.get('links', []) + links))
+
+    return {'pubDate': newest_date.isoformat(), 'links': links}
 
 class GetNewsData():
-    def __init__(self, client_id = client_id, client_secret = client_secret):
+    def __init__(self, client_id = client_id, client_secret = client_secret, dedup = True, weight_duplicates = False, engine = None, base_url = None):
+        """
+        - dedup: 여러 언론사에 재배포된 같은 기사는 대표 1개만 감성분석
+        - weight_duplicates: 일자별 평균 점수 계산 시 대표 기사에 중복 기사 수만큼 가중치 부여
+        - engine: 감성분석 엔진 (기본값: GeminiEngine)
+        - base_url: 네이버 뉴스 검색 API 주소 (기본값: 환경변수 NAVER_NEWS_URL 또는 네이버 API)
+        """
         self.client_id = client_id
         self.client_secret = client_secret
-        self.base_url = "https://openapi.naver.com/v1/search/news.json"
+        self.engine = engine or GeminiEngine()
+        self.dedup = dedup
+        self.weight_duplicates = weight_duplicates
+        self.base_url = base_url or os.getenv('NAVER_NEWS_URL', NAVER_NEWS_URL)
+        self.watermark_path = Path.cwd() / 'cache' / 'news_watermark.json'
     
 
     def get_news_data(self, query, display=25, start=1, sort='date'):
         """
-        네이버 뉴스 검색 API를 사용하여 뉴스 링크와 제목을 가져오는 함수
+        네이버 뉴스 검색 API를 사용하여 뉴스 링크, 제목, 발행 시각을 가져오는 함수
         
         Parameters:
         - query: 검색할 키워드
         - display: 검색 결과 출력 건수 (기본값: 10, 최대: 100)
         - start: 검색 시작 위치 (기본값: 1, 최대: 1000)
         - sort: 정렬 옵션 ('sim': 정확도순, 'date': 날짜순)
+
+        Returns:
+        - [{'link', 'originallink', 'title', 'description', 'pubDate'}, ...]
         """
         
         # API 엔드포인트
-        url = "https://openapi.naver.com/v1/search/news.json"
+        url = self.base_url
         
         # 헤더 설정
         headers = {
@@ -89,8 +148,7 @@ class GetNewsData():
             "sort": sort
         }
         
-        links = []
-        titles = []
+        items = []
         
         try:
             # API 요청
@@ -100,24 +158,68 @@ class GetNewsData():
             # JSON 응답 파싱
             data = response.json()
             
-            # 링크와 제목들 추출
+            # 링크, 제목, 발행 시각 추출 (제목/요약의 <b> 태그 제거)
             for item in data.get('items', []):
-                link = item.get('link')
-                
-                links.append(link)
+                items.append({
+                    'link': item.get('link'),
+                    'originallink': item.get('originallink'),
+                    'title': BeautifulSoup(item.get('title', ''), 'html.parser').text,
+                    'description': BeautifulSoup(item.get('description', ''), 'html.parser').text,
+                    'pubDate': item.get('pubDate')
+                })
             
-            return links
+            return items
             
         except requests.exceptions.RequestException as e:
             print(f"API 요청 중 오류 발생: {e}")
-            return [], []
+            return []
         except json.JSONDecodeError as e:
             print(f"JSON 파싱 중 오류 발생: {e}")
-            return [], []
+            return []
         except Exception as e:
             print(f"예상치 못한 오류 발생: {e}")
-            return [], []
+            return []
+
+    def get_new_items(self, query, watermark = None, display = 25, max_pages = 1):
+        """
+        워터마크(마지막으로 처리한 pubDate/link)에 도달할 때까지만 페이지를 넘기며 새 뉴스를 수집
+
+        - 워터마크가 있으면 API 한도(start <= 1000)까지 필요한 만큼 페이지를 넘김
+        - 워터마크가 없는 첫 실행은 max_pages 페이지까지만 수집
+        """
+        new_items = []
+        seen_links = set()
+        page_count = 0
+
+        for start in range(1, NAVER_MAX_START + 1, display):
+            if not watermark and page_count >= max_pages:
+                break
+
+            items = self.get_news_data(query = query, display = display, start = start)
+            page_count += 1
+            print(f"{query} start: {start}")
+
+            reached = False
+            for item in items:
+                if not item['link'] or not item['pubDate']:
+                    continue
+                if is_seen(item, watermark):
+                    reached = True
+                    break
+                if item['link'] in seen_links:
+                    continue
+
+                seen_links.add(item['link'])
+                new_items.append(item)
+
+            # 워터마크 도달 또는 마지막 페이지
+            if reached or len(items) < display:
+                break
+
+        print(f"{query}: {len(new_items)} new news ({page_count} page requests)")
+        return new_items
         
+    @timer('fetch_articles')
     def get_htmltext(self, news_links):
         """ 
         get_news_link()의 결과값을 매개변수로 넣어, 웹 페이지의 텍스트만을 리스트 형태로 리턴
@@ -134,200 +236,177 @@ class GetNewsData():
                 cleaned_soup = re.sub(r'\n+', '\n', soup)
 
                 results.append(cleaned_soup)
+                count('articles_fetched')
             except:
                 results.append(f"failed: {link}")
                 print(f"failed: {link}")
 
         return results
     
-    def get_sentimental_score(self, results):
-        
-        # 토큰 제한으로 인한 뉴스 50개 단위 분할
-        part = '[next_news]'.join(results)
-
-        prompt_text = """
-        당신은 경제 뉴스 분석 전문가입니다.
-        아래 입력된 뉴스들에 대해 감성분석을 수행하세요.
-        각 뉴스는 문자열 "[next_news]"로 구분되어 있습니다.
-        뉴스 분석 시, 하나의 뉴스가 끝나면 다음 뉴스는 "[next_news]"로 시작합니다.
-
-        [분석 규칙]
-        1. 감성 점수 범위:
-        - 긍정(positive): 51 ~ 100점
-        - 부정(negative): 1 ~ 50점
-        2. 분석 결과는 각 뉴스의 날짜와 점수로만 표현하세요.
-        3. 반드시 무조건 JSON 배열 형식으로 출력하고, 개행 없이 한 줄로 작성하세요.
-
-        [출력 예시]
-        [{"date":"2025-01-01","score":51},{"date":"2025-01-02","score":45}]
-
-        뉴스 데이터:
+    @timer('sentiment_score')
+    def get_sentimental_score(self, results, news_items = None):
+        """ 뉴스 본문 리스트를 감성분석 엔진으로 분석하여 [{'date', 'score', 'engine'}, ...] 형태로 리턴 """
+        news_items = news_items or [{} for _ in results]
+
+        articles = []
+        for text, item in zip(results, news_items):
+            article = dict(item, text = text)
+            if item.get('pubDate'):
+                article['date'] = parse_pub_date(item['pubDate']).strftime('%Y-%m-%d')
+            articles.append(article)
+
+        count('articles_scored', len(articles))
+        return self.engine.score(articles)
+
+    def run(self, query, get_page_value, journal):
         """
-        try:
-            # 첫번째 시도: AI가 실수를 할 수 있음
-            print("First Challenge")
-            prompt_result = request_gem(prompt = prompt_text, text = '[next_news]'+part)
-            prompt_result = prompt_result.replace('json', '', 1)
-
-            final_dict = json.loads(prompt_result)
-            print(type(final_dict))
-            print("Translate Dictionary Success!")
-            
-            return final_dict
-        except:
-            try:
-                # 두번째 시도: 한 번 더 시도
-                print("Second Challenge")
-                prompt_result = request_gem(prompt = prompt_text, text = '[next_news]'+part)
-                prompt_result = prompt_result.replace('json', '', 1)
-
-                final_dict = json.loads(prompt_result)
-                print(type(final_dict))
-                print("Translate Dictionary Success!")
-            
-                return final_dict
-            except:
-                # 세번째 시도: 한 번 더 시도
-                print("Last Challenge")
-                prompt_result = request_gem(prompt = prompt_text, text = '[next_news]'+part)
-                prompt_result = prompt_result.replace('json', '', 1)
-
-                final_dict = json.loads(prompt_result)
-                print(type(final_dict))
-                print("Translate Dictionary Success!")
-            
-                return final_dict
+        Sentimental Score Analysis for new news since the last run
 
-    def run(self, query, get_page_value):
-        """ Sentimental Score Analysis 25 News """
-        
-        collect = GetNewsData()
-        
-        current_path = Path.cwd()
-        dir_path = current_path / 'cache'
+        - get_page_value: 워터마크가 없는 첫 실행 시 수집할 페이지 수 (1 page = 25 news)
+        - journal: 분석 결과를 기록할 NewsJournal (이미 기록된 뉴스는 다시 분석하지 않음)
+        """
 
         display = 25
         results = []
 
         try:
-            for start in range(1, (get_page_value * display) + 1, 25):
-                # Extract News URL
-                news_links = collect.get_news_data(query = query, display = display, start = start)
-                print(f"{query} start: {start}")
-
-                # Extract string in URL
-                extract_news_texts = collect.get_htmltext(news_links)
-
-                # Execute Sentimental-Analysis
-                sentimental_results = collect.get_sentimental_score(extract_news_texts)
-                time.sleep(1)
-
-                # Cache
-                with open(dir_path / f'sentimental_cache_{query}_{start}.json', 'w', encoding='utf-8') as f:
-                    json.dump(sentimental_results, f, indent = 4, ensure_ascii = False)
-
-                if start == 1:
-                    results.append(sentimental_results)
-                else:
-                    results.extend(sentimental_results)
-            
-            return results
-        except:
-            print("Error")
-    
-def combine_json_files(query, get_page_value):
-    """ 생성된 JSON Cache 파일을 합쳐서 하나의 파일로 생성 """
-    # JSON 캐시 파일 경로 정의
-    current_path = Path.cwd()
-    dir_path = current_path / 'cache'
-
-    # JSON 캐시 파일 서치
-    pattern = f'sentimental_cache_{query}_*.json'
-
-    # JSON 파일 목록 반환
-    json_files = dir_path.glob(pattern)
-    json_file_names = [file for file in json_files]
+            watermarks = load_watermarks(self.watermark_path)
+            watermark = watermarks.get(query)
 
-    # 정상적으로 분석이 안 된 경우 체크
-    if len(json_file_names) < get_page_value:
-        need_numbers = {val for val in range(1, 1000, 25)}
-        exist_file_numbers = [json_file.name for json_file in json_file_names]
-        extract_exist_numbers = {int(re.findall(r'\d+', exist_file)[0]) for exist_file in exist_file_numbers}
-        non_exist_numbers = need_numbers ^ extract_exist_numbers
+            # Extract only the news published after the watermark
+            news_items = self.get_new_items(query = query, watermark = watermark, display = display, max_pages = get_page_value)
 
-        start_index = min(list(non_exist_numbers))
+            # Skip the news already scored (this journal after a crash, or an earlier run whose watermark was not saved)
+            scored_links = journal.scored_links(query).union(*(past.scored_links(query) for past in recent_journals(journal.path.parent)))
+            pending_items = [item for item in news_items if item['link'] not in scored_links]
 
-        collect = GetNewsData()
+            if scored_links:
+                print(f"{query}: {len(news_items) - len(pending_items)} news already in journal")
 
-        run_result = collect.run(query = query, get_page_value = start_index)
+            if not pending_items:
+                print(f"{query}: No new news, skip sentimental analysis")
 
-        json_files = dir_path.glob(pattern)
-        json_file_names = [file for file in json_files]
-    
-    final_json_dict = []
-
-    for json_file in json_file_names:
-        with json_file.open('r', encoding = 'utf-8') as f:
-            data = json.load(f)
+            # Extract string in URL
+            extract_news_texts = self.get_htmltext([item['link'] for item in pending_items])
 
-            if isinstance(data, list):
-                final_json_dict.extend(data)
-                print("Data Extend Success!")
+            # Near-duplicate filter >> score one representative per group
+            if self.dedup and pending_items:
+                pending_items, extract_news_texts, group_members = dedup_news(pending_items, extract_news_texts)
+                removed = sum(len(members) - 1 for members in group_members)
+                print(f"{query}: {removed} near-duplicate news removed ({len(pending_items)} left)")
+                journal.append({'type': 'dedup', 'query': query, 'articles': len(pending_items) + removed, 'duplicates': removed})
             else:
-                print("Skip json_file")
-    
-    with open(dir_path / f'{query}_news.json', 'w', encoding = 'utf-8') as f:
-        json.dump(final_json_dict, f, indent = 4, ensure_ascii = False)
-    
-    for file in dir_path.glob(pattern):
-        try:
-            file.unlink()
-        except:
-            print("Sentimental Cache File Delete Error")
-    
-    return final_json_dict
+                group_members = [[item] for item in pending_items]
 
-def json_files_load(top_10_stocks):
-    """ cache 디렉터리 내 json 파일들을 sentimental_score 테이블에 업로드 """
-    not_updated_files = []
-    current_path = Path.cwd()
-    dir_path = current_path / 'cache'
+            for start in range(0, len(pending_items), display):
+                chunk = pending_items[start:start + display]
+                chunk_members = group_members[start:start + display]
 
-    df = pd.DataFrame(top_10_stocks)
-    stock_names = [stock['name'] for stock in top_10_stocks]
-    stock_codes = [stock['code'][:-3] for stock in top_10_stocks]
-    start_index = 0
+                # Execute Sentimental-Analysis
+                sentimental_results = self.get_sentimental_score(extract_news_texts[start:start + display], chunk)
+                time.sleep(1)
 
-    for file_name in stock_names:
-        # Find Json file
-        file_path = list(dir_path.glob(file_name+'_news.json'))
+                # Journal
+                records = to_journal_records(query, sentimental_results, chunk, chunk_members, self.weight_duplicates)
+                journal.extend(records)
+                results.extend(records)
 
-        try:
-            # Open Json File >> DataFrame
-            with open(file_path[0], 'r', encoding = 'utf-8') as f:
-                json_df = pd.DataFrame(json.load(f))
+            # 모든 뉴스의 분석 결과가 저널에 기록된 뒤에 워터마크 갱신
+            watermarks[query] = next_watermark(news_items, watermark)
+            save_watermarks(self.watermark_path, watermarks)
             
-                # Prerprocess DataFrame
-                proprecessed_df = json_df.groupby(by='date', as_index=False).mean()
-                proprecessed_df['score'] = proprecessed_df['score'].astype(int)
-                proprecessed_df.insert(loc = 1, column = 'stock_code', value = stock_codes[start_index])               
-                proprecessed_df['label'] = np.where(proprecessed_df['score'] >= 50, 1, 0)
-                df_to_dictionary = proprecessed_df.to_dict('records')
-
-                # Insert Table
-                response = supabase.table('sentimental_score').insert(df_to_dictionary).execute()
-
-                file_path[0].unlink()
-        except:
-            print(f"Failed: insert table -> '{file_path}'")
-            not_updated_files.append(file_path)
-            pass
-
-        start_index += 1
-    if len(not_updated_files) < 10:
-        print(f"Not updated Files: {len(not_updated_files)}")
-        print(f"Files: {not_updated_files}")
-    else:
-        print("Database Update Success")
-
-    return not_updated_files
\ No newline at end of file
+            return results
+        except Exception as e:
+            print(f"Error: {e}")
+            return results
+
+def to_journal_records(query, sentimental_results, news_items, group_members, weight_duplicates = False):
+    """
+    분석 결과에 뉴스 메타데이터(link, title, pubDate)를 붙여서 저널 레코드로 변환
+    날짜는 Gemini가 추정한 값 대신 실제 발행일(pubDate)을 사용
+    """
+    records = []
+
+    for result, item, members in zip(sentimental_results, news_items, group_members):
+        records.append({
+            'type': 'article',
+            'query': query,
+            'link': item['link'],
+            'title': item['title'],
+            'description': item['description'],
+            'pubDate': item['pubDate'],
+            'date': parse_pub_date(item['pubDate']).strftime('%Y-%m-%d'),
+            'score': int(result['score']),
+            'engine': result.get('engine', 'gemini'),
+            'weight': len(members) if weight_duplicates else 1,
+            'duplicates': [member['link'] for member in members[1:]]
+        })
+
+    return records
+
+def json_files_load(top_10_stocks, journal, dry_run = False):
+    """
+    저널의 감성분석 결과를 일자별로 집계하여 sentimental_score 테이블의 (date, stock_code) 행을 한 번에 교체 (delete >> insert)
+
+    - 이번 저널에 기사가 있는 (date, stock_code) 만 업로드하고, 점수는 같은 폴더의 최근 저널 전체(같은 날의 이전 실행 포함)로 다시 집계
+      >> 같은 날 여러 번 실행하거나 실패 후 다시 실행해도 (date, stock_code) 당 1행 (같은 뉴스 링크는 한 번만 집계)
+    - dry_run: 집계만 하고 업로드/commit 하지 않음 (오프라인 벤치마크용)
+    """
+    stock_codes = {stock['name']: stock['code'][:-3] for stock in top_10_stocks}
+
+    keys = set()
+    for record in journal.records('article'):
+        if record['query'] in stock_codes:
+            keys.add((record['date'], stock_codes[record['query']]))
+
+    # Stream journals >> (stock_code, date) 별 점수 합계/개수
+    totals = {}
+    seen_links = set()
+    for past in [past for past in recent_journals(journal.path.parent) if past.path != journal.path] + [journal]:
+        for record in past.records('article'):
+            stock_code = stock_codes.get(record['query'])
+            key = (record['date'], stock_code)
+            if key not in keys or (record['query'], record['link']) in seen_links:
+                continue
+            seen_links.add((record['query'], record['link']))
+
+            weight = record.get('weight', 1)
+            score_sum, news_count = totals.get(key, (0, 0))
+            totals[key] = (score_sum + record['score'] * weight, news_count + weight)
+
+    rows = []
+    for (date, stock_code), (score_sum, news_count) in sorted(totals.items()):
+        score = int(score_sum / news_count)
+        rows.append({
+            'date': date,
+            'stock_code': stock_code,
+            'score': score,
+            'label': 1 if score >= 50 else 0
+        })
+
+    if dry_run:
+        print(f"[dry_run] {len(rows)} rows aggregated, skip upload")
+        return []
+
+    if not rows:
+        print("No new sentimental score to upload")
+        journal.commit(0)
+        return []
+
+    try:
+        # Replace Table rows: 이번에 집계한 (date, stock_code) 의 기존 행을 지우고 다시 insert (unique 제약이 없는 테이블에서도 1행 유지)
+        # insert 가 실패하면 저널을 commit 하지 않으므로 다음 실행에서 같은 키를 다시 집계하여 복구
+        codes_by_date = {}
+        for row in rows:
+            codes_by_date.setdefault(row['date'], []).append(row['stock_code'])
+        for date, codes in codes_by_date.items():
+            supabase.table('sentimental_score').delete().eq('date', date).in_('stock_code', codes).execute()
+        response = supabase.table('sentimental_score').insert(rows).execute()
+        journal.commit(len(rows))
+        print(f"Database Update Success: {len(rows)} rows")
+        return []
+    except Exception as e:
+        not_updated = sorted({row['stock_code'] for row in rows})
+        print(f"Failed: insert table -> {e}")
+        print(f"Not updated stocks: {not_updated}")
+        return not_updated
@@ -1,9 +1,14 @@
 # wiz-stock/data/GradePredictions.py
 import os
 import sys
+import time
+import argparse
+import numpy as np
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pandas as pd
+from TradingCalendar import TradingCalendar
+from Telemetry import timer, count
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -17,95 +22,238 @@ load_dotenv(dotenv_path=env_path)
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+try:
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+except Exception as e:
+    # 오프라인 채점/벤치마크는 client 를 직접 넘겨서 사용
+    supabase = None
+    print(f"[Supabase] Client connect failed: {e}")
 
-def grade_predictions():
-    """매일 예측 결과를 자동으로 채점하고 포인트를 지급하는 함수"""
+# GRADING_CHUNK_SIZE : 채점 결과 update 1회에 보내는 예측 id 수
+# GRADING_PAGE_SIZE : 채점 대기 예측 조회 1회에 가져오는 행 수 (Supabase 기본 최대 1000)
+GRADING_CHUNK_SIZE = int(os.getenv('GRADING_CHUNK_SIZE', '1000'))
+GRADING_PAGE_SIZE = int(os.getenv('GRADING_PAGE_SIZE', '1000'))
+# GRADING_LOOKBACK_DAYS : 채점 대기 예측을 찾는 기간 (가격 데이터 마지막 거래일 이전 N 거래일, 놓친 실행 보완)
+GRADING_LOOKBACK_DAYS = int(os.getenv('GRADING_LOOKBACK_DAYS', '5'))
+# BACKFILL_MARGIN_DAYS : 백필 범위 앞뒤로 더 불러오는 가격 데이터 일수 (범위 밖 직전/다음 거래일 종가용, 연휴보다 길게)
+BACKFILL_MARGIN_DAYS = 14
+CSV_PATH = project_root / "cache" / "stock_data.csv"
+# 채점할 때 DB 에 저장하는 컬럼 (그 외 컬럼은 update 하지 않음)
+GRADED_COLUMNS = ['is_checked', 'actual_trend', 'result', 'points_awarded']
+
+def load_price_index(csv_path=CSV_PATH, start=None, end=None) -> pd.Series:
+    """ (stock_code, Date) >> Close. 모든 예측의 기준가/결과가를 이 인덱스 하나로 조회 (start/end 가 있으면 그 날짜 범위만) """
+    stock_df = pd.read_csv(csv_path, dtype={'stock_code': str}, usecols=['stock_code', 'Date', 'Close'])
+    stock_df['Date'] = pd.to_datetime(stock_df['Date']).dt.normalize()
+    if start is not None:
+        stock_df = stock_df[stock_df['Date'] >= pd.Timestamp(start)]
+    if end is not None:
+        stock_df = stock_df[stock_df['Date'] <= pd.Timestamp(end)]
+    stock_df = stock_df.drop_duplicates(['stock_code', 'Date'], keep='last')
+    return stock_df.set_index(['stock_code', 'Date'])['Close'].sort_index()
+
+def fetch_pending(client, start_date, end_date, page_size=GRADING_PAGE_SIZE) -> list:
+    """ prediction_date 가 [start_date, end_date) 인 채점 전 예측 전체 (page_size 행씩 나눠서 조회) """
+    rows = []
+    offset = 0
+    while True:
+        response = client.table('predict_game').select('*') \
+            .gte('prediction_date', start_date.isoformat()) \
+            .lt('prediction_date', end_date.isoformat()) \
+            .eq('is_checked', False) \
+            .order('id') \
+            .range(offset, offset + page_size - 1) \
+            .execute()
+        rows.extend(response.data)
+        if len(response.data) < page_size:
+            return rows
+        offset += page_size
+
+def grade_frame(pending: pd.DataFrame, price_index: pd.Series, calendar: TradingCalendar = None) -> pd.DataFrame:
+    """
+    채점 대기 예측 전체를 한 번에 채점
+
+    기준가: 예측일(휴장일이면 직전 거래일) 종가, 결과가: 예측일 다음 거래일 종가
+    둘 중 하나라도 없으면 채점하지 않음 (다음 실행에서 다시 시도), 이미 채점된 행과 중복 id 는 건너뜀
+    Returns: 채점된 예측 행 (원래 컬럼 + is_checked, actual_trend, result, points_awarded)
+    """
+    if 'is_checked' in pending:
+        pending = pending[pending['is_checked'] != True]
+    if 'id' in pending:
+        pending = pending.drop_duplicates('id')
+    if pending.empty:
+        return pending
+    calendar = calendar or TradingCalendar.from_price_index(price_index)
+
+    # 예측일 종류는 적으므로 날짜별로 한 번씩만 달력 조회
+    prediction_dates = pd.to_datetime(pending['prediction_date']).dt.normalize()
+    unique_dates = prediction_dates.unique()
+    base_map = pd.Series([pd.Timestamp(calendar.on_or_before(day)) for day in unique_dates], index=unique_dates)
+    target_map = pd.Series([pd.Timestamp(calendar.next(day)) for day in unique_dates], index=unique_dates)
+
+    stock_codes = pending['stock_code'].astype(str).to_numpy()
+    base_dates = prediction_dates.map(base_map)
+    target_dates = prediction_dates.map(target_map)
+    price_t = price_index.reindex(pd.MultiIndex.from_arrays([stock_codes, base_dates])).to_numpy()
+    price_t1 = price_index.reindex(pd.MultiIndex.from_arrays([stock_codes, target_dates])).to_numpy()
+
+    gradable = ~(np.isnan(price_t) | np.isnan(price_t1))
+    graded = pending.loc[gradable].copy()
+    graded['is_checked'] = True
+    graded['actual_trend'] = np.where(price_t1[gradable] > price_t[gradable], "상승", "하락")
+    graded['result'] = graded['actual_trend'] == graded['predicted_trend']
+    graded['points_awarded'] = None  # 포인트는 사용자가 수동으로 수령 (중복 지급 방지)
+    return graded
+
+def grading_window(calendar: TradingCalendar, today, lookback=GRADING_LOOKBACK_DAYS):
+    """
+    지금 채점할 수 있는 예측일 범위 [start, end)
+
+    end: 가격 데이터가 있는 마지막 거래일 (그 이전 예측은 다음 거래일 종가가 있음)
+    start: end 에서 lookback 거래일 전 (주말/휴장일에 한 예측도 포함)
+    """
+    end = calendar.on_or_before(min(today, calendar.last))
+    return calendar.shift(end, -lookback), end
+
+def update_graded(client, graded: pd.DataFrame, chunk_size=GRADING_CHUNK_SIZE, progress=None) -> int:
+    """
+    채점 결과 컬럼(GRADED_COLUMNS)만 update 로 저장. 채점 결과가 같은 예측끼리 묶어서 id chunk_size 개씩 한 번에 요청
+    (채점 결과 조합은 상승/하락 x 정답/오답 뿐이므로 요청 수는 예측 수 / chunk_size 정도)
+
+    - 다른 컬럼은 보내지 않으므로 조회 후 사용자가 바꾼 값을 덮어쓰지 않음 (UPDATE 권한만 필요)
+    - 아직 채점되지 않은 행만 update. 같은 예측은 항상 같은 결과로 채점되므로 중간에 실패해도 다시 실행하면 남은 행만 채점됨
+    progress: 요청마다 progress(저장한 행 수, 전체 행 수) 호출
+    """
+    if graded.empty:
+        return 0
+
+    values = graded[GRADED_COLUMNS].astype(object).where(graded[GRADED_COLUMNS].notna(), None)
+    groups = graded['id'].groupby([values[column].map(repr) for column in GRADED_COLUMNS], sort=False)
+
+    done = 0
+    for _, ids in groups:
+        update_data = values.loc[ids.index[0]].to_dict()
+        ids = ids.tolist()
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            client.table('predict_game').update(update_data).in_('id', chunk).eq('is_checked', False).execute()
+            done += len(chunk)
+            if progress:
+                progress(done, len(graded))
+    return len(graded)
+
+def run_grading(client, price_index: pd.Series, today=None, progress=None, calendar: TradingCalendar = None,
+                window=None, chunk_size=GRADING_CHUNK_SIZE) -> dict:
+    """
+    예측일 범위 [start, end) 의 예측 채점 >> DB 저장. 오류는 호출한 쪽에서 처리 (CLI / app.dependency.grading 공용)
+
+    window: (start, end), 없으면 grading_window (최근 GRADING_LOOKBACK_DAYS 거래일)
+    progress: 단계마다 progress(stage, done, total) 호출 (stage: fetch / grade / update)
+    Returns: {'start', 'end', 'pending', 'graded'}
+    """
+    progress = progress or (lambda stage, done, total: None)
+    today = today or datetime.now().date()
+    calendar = calendar or TradingCalendar.from_price_index(price_index)
+    if calendar.last is None:
+        return {'start': None, 'end': None, 'pending': 0, 'graded': 0}
+    start, end = window or grading_window(calendar, today)
+
+    progress('fetch', 0, 0)
+    with timer('fetch_pending'):
+        pending_predictions = fetch_pending(client, start, end)
+    count('pending', len(pending_predictions))
+    summary = {'start': start.isoformat(), 'end': end.isoformat(), 'pending': len(pending_predictions), 'graded': 0}
+    if not pending_predictions:
+        return summary
+
+    progress('grade', 0, len(pending_predictions))
+    with timer('grade_frame'):
+        graded = grade_frame(pd.DataFrame(pending_predictions), price_index, calendar)
+
+    progress('update', 0, len(graded))
+    with timer('update_graded'):
+        summary['graded'] = update_graded(client, graded, chunk_size, progress=lambda done, total: progress('update', done, total))
+    count('graded', summary['graded'])
+    return summary
+
+def backfill_predictions(client, start: date, end: date, chunk_size=GRADING_CHUNK_SIZE, csv_path=CSV_PATH) -> dict:
+    """
+    예측일 start ~ end (포함) 의 채점 대기 예측을 한 번에 채점 (놓친 채점 실행 보완)
+
+    가격 데이터는 범위 앞뒤 BACKFILL_MARGIN_DAYS 일까지만 한 번 로드, 채점 결과는 chunk_size 행씩 저장
+    이미 채점된 예측은 조회하지 않으므로 여러 번 실행해도 같은 결과
+    """
+    start_time = time.perf_counter()
+    margin = timedelta(days=BACKFILL_MARGIN_DAYS)
+    price_index = load_price_index(csv_path, start - margin, end + margin)
+    calendar = TradingCalendar.from_price_index(price_index)
+    print(f"[+] 가격 데이터 로드: {len(price_index)}행, {len(calendar.days)} 거래일 ({time.perf_counter() - start_time:.2f}s)")
+    if calendar.last is None:
+        print("[!] 백필 범위의 가격 데이터가 없습니다.")
+        return {'start': start.isoformat(), 'end': end.isoformat(), 'pending': 0, 'graded': 0}
+
+    # 다음 거래일 종가가 있는 예측일까지만 조회
+    window_end = min(end + timedelta(days=1), calendar.last)
+
+    stage_times = {}
+    def progress(stage, done, total):
+        stage_times.setdefault(stage, time.perf_counter())
+        # 10 chunk 마다 진행 상황 출력
+        if stage == 'update' and done and (done == total or done % (chunk_size * 10) < chunk_size):
+            elapsed = time.perf_counter() - stage_times['update']
+            print(f"  [update] {done}/{total} ({done / max(elapsed, 1e-9):.0f} rows/s)")
+
+    summary = run_grading(client, price_index, progress=progress, calendar=calendar, window=(start, window_end), chunk_size=chunk_size)
+    elapsed = time.perf_counter() - start_time
+    summary['end'] = end.isoformat()
+    summary['seconds'] = round(elapsed, 3)
+    print(f"[+] 백필 완료: {summary['start']} ~ {summary['end']}, 대기 {summary['pending']}개 중 {summary['graded']}개 채점, "
+          f"가격 없음 {summary['pending'] - summary['graded']}개 ({elapsed:.1f}s, {summary['pending'] / max(elapsed, 1e-9):.0f} predictions/s)")
+    return summary
+
+def grade_predictions(client=None, today=None):
+    """매일 최근 거래일의 예측 결과를 자동으로 채점하는 함수. 채점한 예측 수를 리턴"""
+    client = client or supabase
     print("[+] 자동 채점 프로세스를 시작합니다...")
 
-    # 로컬 stock_data.csv 파일 로드
+    # 로컬 stock_data.csv 파일에서 (종목, 날짜) >> 종가 인덱스 생성
     try:
-        csv_path = project_root / "cache" / "stock_data.csv"
-        stock_df = pd.read_csv(csv_path, dtype={'stock_code': str})
-        stock_df['Date'] = pd.to_datetime(stock_df['Date']).dt.date
+        price_index = load_price_index()
         print("[+] stock_data.csv 파일을 성공적으로 로드했습니다.")
     except FileNotFoundError:
-        print(f"[!] {csv_path} 파일을 찾을 수 없습니다. DataPipeline.py가 먼저 실행되었는지 확인하세요.")
-        return
+        print(f"[!] {CSV_PATH} 파일을 찾을 수 없습니다. DataPipeline.py가 먼저 실행되었는지 확인하세요.")
+        return 0
     except Exception as e:
         print(f"[!] CSV 파일 로드 중 오류 발생: {e}")
-        return
+        return 0
 
-    # 어제의 채점되지 않은 모든 예측을 가져옴
+    # 최근 GRADING_LOOKBACK_DAYS 거래일의 채점되지 않은 모든 예측을 조회 >> 채점 >> DB에 일괄 업데이트
     try:
-        today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-        response = supabase.table('predict_game').select('*') \
-            .gte('prediction_date', yesterday.isoformat()) \
-            .lt('prediction_date', today.isoformat()) \
-            .eq('is_checked', False) \
-            .execute()
-        
-        pending_predictions = response.data
-        if not pending_predictions:
-            print("[+] 채점할 예측이 없습니다. 프로세스를 종료합니다.")
-            return
-        print(f"[+] {len(pending_predictions)}개의 채점 대기 예측을 발견했습니다.")
+        summary = run_grading(client, price_index, today)
     except Exception as e:
-        print(f"[!] 예측 데이터 조회 중 오류 발생: {e}")
-        return
-
-    # 로드된 CSV 데이터에서 실제 등락 정보 추출
-    actual_trends = {}
-    unique_stock_codes = list(set(p['stock_code'] for p in pending_predictions))
-    print(f"[+] {len(unique_stock_codes)}개 종목의 실제 데이터를 CSV에서 추출합니다...")
-    for stock_code in unique_stock_codes:
-        try:
-            code_df = stock_df[stock_df['stock_code'] == stock_code]
-            yesterday_data = code_df[code_df['Date'] == yesterday]
-            today_data = code_df[code_df['Date'] == today]
-
-            if not yesterday_data.empty and not today_data.empty:
-                price_t = yesterday_data.iloc[0]['Close']
-                price_t1 = today_data.iloc[0]['Close']
-                actual_trends[stock_code] = "상승" if price_t1 > price_t else "하락"
-        except Exception as e:
-            print(f"[!] {stock_code} 종목 데이터 처리 실패: {e}")
-
-    # 각 예측을 채점하고 사용자별 포인트 집계
-    users_points = {}
-    predictions_to_update = []
-    print("[+] 각 예측을 채점합니다...")
-    for pred in pending_predictions:
-        user_id, stock_code = pred['user_id'], pred['stock_code']
-        if stock_code not in actual_trends:
-            continue
-
-        actual_trend = actual_trends[stock_code]
-        is_correct = (actual_trend == pred['predicted_trend'])
-        points_awarded = 10 if is_correct else 5  # 포인트 정책 통일 (정답 10점, 오답 5점)
-
-        predictions_to_update.append({
-            'id': pred['id'], 
-            'is_checked': True, 
-            'actual_trend': actual_trend, 
-            'result': is_correct,  # result 필드 추가
-            'points_awarded': None  # 자동 포인트 지급 제거 (사용자가 수동으로 수령하도록)
-        })
-        # 포인트는 사용자가 수동으로 수령하도록 변경 (중복 지급 방지)
-
-    # 채점 결과를 DB에 일괄 업데이트
-    try:
-        for update_data in predictions_to_update:
-            pred_id = update_data.pop('id')
-            supabase.table('predict_game').update(update_data).eq('id', pred_id).execute()
-        print(f"[+] {len(predictions_to_update)}개 예측의 채점 결과를 DB에 업데이트했습니다.")
-        print("[+] 포인트는 사용자가 직접 수령할 수 있도록 설정되었습니다.")
-    except Exception as e:
-        print(f"[!] 'predict_game' 테이블 업데이트 중 오류 발생: {e}")
-        return
+        print(f"[!] 자동 채점 중 오류 발생: {e}")
+        return 0
 
+    if not summary['pending']:
+        print("[+] 채점할 예측이 없습니다. 프로세스를 종료합니다.")
+        return 0
+    count = summary['graded']
+    print(f"[+] {summary['pending']}개의 채점 대기 예측 중 {count}개 예측의 채점 결과를 DB에 업데이트했습니다.")
+    print("[+] 포인트는 사용자가 직접 수령할 수 있도록 설정되었습니다.")
     print("[+] 자동 채점 프로세스를 성공적으로 완료했습니다.")
+    return count
 
 if __name__ == "__main__":
-    grade_predictions()
+    # python ./data/GradePredictions.py                                   : 최근 거래일 채점
+    # python ./data/GradePredictions.py --backfill 2025-03-01 2025-03-31  : 예측일 범위 백필
+    parser = argparse.ArgumentParser(description = 'grade predictions')
+    parser.add_argument('--backfill', nargs = 2, metavar = ('START', 'END'), type = date.fromisoformat, help = '채점할 예측일 범위 (YYYY-MM-DD, 끝 날짜 포함)')
+    parser.add_argument('--chunk-size', type = int, default = GRADING_CHUNK_SIZE, help = 'update 1회에 보내는 예측 id 수')
+    args = parser.parse_args()
+
+    if args.backfill and args.backfill[0] > args.backfill[1]:
+        parser.error('--backfill START 는 END 보다 늦을 수 없습니다.')
+    if args.backfill:
+        backfill_predictions(supabase, *args.backfill, chunk_size = args.chunk_size)
+    else:
+        grade_predictions()
@@ -0,0 +1,165 @@
+# python ./data/HyperSearch.py --budget 3600 --configs 9
+# 종목별 LSTM 하이퍼파라미터 탐색 (successive halving, CPU 전용, DB 사용 안 함)
+#
+# 1. 종목마다 후보 설정 configs 개를 뽑음 (기본 설정 포함)
+# 2. 단계(rung)마다 모든 종목의 후보를 ModelTraining.train_models 프로세스 풀에서 함께 학습
+#    - 학습 데이터의 마지막 validation 비율은 검증용 (early stopping, 검증 손실로 비교)
+#    - 검증 손실 상위 1/eta 만 다음 단계로 올라가 eta 배 epoch 로 다시 학습
+# 3. 종목별 최종 후보를 models/{code}/hparams.json 에 저장 >> PredictModel 의 다음 학습부터 사용
+#
+# 전체 실행 시간은 --budget 과 다음 --deadline(기본 15:30, 16:00 예측 작업 전) 중 먼저 오는 시점을 넘지 않음.
+# 시간이 부족하면 마지막으로 끝난 단계의 최고 후보를 저장
+import os
+import zlib
+import time
+import argparse
+import numpy as np
+from FeatureScaler import FeatureScaler
+from TrainingCache import TrainingCache
+from PredictModel import FEATURES, SEQUENCE_LENGTH, COLD_TRAINING, PREDICT_HORIZONS, MODEL_DIR, load_stock_data
+from ModelTraining import TRAIN_SEED, DEFAULT_MODEL_HPARAMS, train_models, thread_budget, seconds_until
+
+# HYPER_SEARCH_BUDGET : 전체 탐색 시간 제한(초)
+# HYPER_SEARCH_DEADLINE : 탐색을 끝내야 하는 시각 (HH:MM, 지났으면 다음 날 같은 시각)
+HYPER_SEARCH_BUDGET = float(os.getenv('HYPER_SEARCH_BUDGET', '3600'))
+HYPER_SEARCH_DEADLINE = os.getenv('HYPER_SEARCH_DEADLINE', '15:30')
+
+SEARCH_SPACE = {
+    'units': [32, 64, 128],
+    'dropout': [0.0, 0.1, 0.2, 0.3],
+    'learning_rate': [0.0003, 0.001, 0.003],
+    'batch_size': [32, 64]
+}
+DEFAULT_CANDIDATE = dict(DEFAULT_MODEL_HPARAMS, batch_size=COLD_TRAINING['batch_size'])
+
+def sample_candidates(code, count, seed=TRAIN_SEED):
+    """ 기본 설정 + 중복 없는 무작위 후보 (종목별로 항상 같은 후보) """
+    rng = np.random.default_rng([seed, zlib.crc32(code.encode('utf-8'))])
+    candidates = [DEFAULT_CANDIDATE]
+    space_size = int(np.prod([len(values) for values in SEARCH_SPACE.values()]))
+
+    while len(candidates) < min(count, space_size):
+        candidate = {name: values[rng.integers(len(values))] for name, values in SEARCH_SPACE.items()}
+        candidate = {name: value.item() if isinstance(value, np.generic) else value for name, value in candidate.items()}
+        if candidate not in candidates:
+            candidates.append(candidate)
+    return candidates
+
+def rung_epochs(min_epochs, max_epochs, eta, rungs):
+    return [min(max_epochs, min_epochs * eta ** rung) for rung in range(rungs)]
+
+def search(stocks, configs, eta, min_epochs, max_epochs, validation, patience, budget):
+    """
+    stocks: {code: 스케일된 학습 배열} >> {code: 최종 후보 {'hparams', 'val_loss', 'best_epoch', 'epochs_trained', 'rung'}}
+    """
+    deadline = time.perf_counter() + budget
+    rungs = max(1, int(np.ceil(np.log(configs) / np.log(eta))) + 1)
+    schedule = rung_epochs(min_epochs, max_epochs, eta, rungs)
+
+    alive = {code: sample_candidates(code, configs) for code in stocks}
+    best = {}
+
+    for rung, epochs in enumerate(schedule):
+        jobs = []
+        for code, candidates in alive.items():
+            for index, candidate in enumerate(candidates):
+                jobs.append({
+                    'code': f"{code}#{index}",
+                    'model_path': None,
+                    'mode': 'cold',
+                    'values': stocks[code],
+                    'close_index': FEATURES.index('Close'),
+                    'sequence_length': SEQUENCE_LENGTH,
+                    'epochs': epochs,
+                    'batch_size': candidate['batch_size'],
+                    'streaming': False,
+                    'seed': TRAIN_SEED,
+                    'horizons': PREDICT_HORIZONS,
+                    'hparams': {name: candidate[name] for name in DEFAULT_MODEL_HPARAMS},
+                    'validation': validation,
+                    'patience': patience
+                })
+
+        # 작업별 시간 제한: 작업이 workers 개씩 차례로 실행된다고 보고 남은 시간을 나눔 (프로세스 시작/모델 생성 여유 20%)
+        # 남은 시간이 지나면 train_models 가 끝나지 않은 작업을 강제 종료
+        workers, _, _ = thread_budget(len(jobs))
+        rounds = -(-len(jobs) // workers)
+        remaining = deadline - time.perf_counter()
+        job_budget = remaining / rounds * 0.8
+        if job_budget < 10:
+            print(f"[!] 남은 시간({remaining:.0f}s)이 부족하여 {rung + 1}단계 탐색을 건너뜁니다.")
+            break
+
+        print(f"\n[+] {rung + 1}/{len(schedule)}단계: {len(alive)}개 종목 x 후보 {len(jobs)}개, {epochs} epochs (작업별 제한 {job_budget:.0f}s)")
+        results = train_models([dict(job, budget=job_budget) for job in jobs], timeout=remaining)
+
+        next_alive = {}
+        for code, candidates in alive.items():
+            scored = []
+            for index, candidate in enumerate(candidates):
+                result = results.get(f"{code}#{index}", {})
+                if 'val_loss' in result and np.isfinite(result['val_loss']):
+                    scored.append((result['val_loss'], index, candidate, result))
+            if not scored:
+                continue
+
+            scored.sort(key=lambda score: (score[0], score[1]))
+            val_loss, _, candidate, result = scored[0]
+            best[code] = {
+                'hparams': dict(candidate, epochs=max(min_epochs, result['best_epoch'])),
+                'val_loss': val_loss,
+                'best_epoch': result['best_epoch'],
+                'epochs_trained': epochs,
+                'rung': rung + 1
+            }
+            print(f"  {code}: 최고 검증 손실 {val_loss:.6f} {candidate}")
+
+            next_alive[code] = [score[2] for score in scored[:max(1, len(scored) // eta)]]
+
+        alive = next_alive
+        if not alive:
+            break
+
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'per-stock hyperparameter search (successive halving)')
+    parser.add_argument('--stocks', nargs = '+', help = '탐색할 종목 코드 (기본: 전체)')
+    parser.add_argument('--configs', type = int, default = 9, help = '종목별 후보 수 (기본 설정 포함)')
+    parser.add_argument('--eta', type = int, default = 3, help = '단계마다 남기는 비율의 역수')
+    parser.add_argument('--min-epochs', type = int, default = 10)
+    parser.add_argument('--max-epochs', type = int, default = COLD_TRAINING['epochs'])
+    parser.add_argument('--validation', type = float, default = 0.2, help = '검증용으로 떼어 둘 마지막 구간 비율')
+    parser.add_argument('--patience', type = int, default = 5, help = 'early stopping patience (epoch)')
+    parser.add_argument('--budget', type = float, default = HYPER_SEARCH_BUDGET, help = '전체 탐색 시간 제한(초)')
+    parser.add_argument('--deadline', default = HYPER_SEARCH_DEADLINE, help = '탐색을 끝내야 하는 시각 HH:MM')
+    args = parser.parse_args()
+
+    # GPU 가 있어도 CPU 에서만 실행 (spawn 된 학습 프로세스도 같은 환경 변수 사용)
+    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+
+    budget = min(args.budget, seconds_until(args.deadline))
+    print(f"[+] 하이퍼파라미터 탐색을 시작합니다. (시간 제한 {budget:.0f}s, 마감 {args.deadline})")
+
+    df = load_stock_data()
+    if df is None:
+        raise SystemExit(1)
+
+    stocks = {}
+    for code in (args.stocks or df['stock_code'].unique()):
+        feature_df = df[df['stock_code'] == code][FEATURES].dropna()
+        if len(feature_df) < SEQUENCE_LENGTH + 50:
+            print(f"[!] {code}: 데이터가 부족하여 건너뜁니다 ({len(feature_df)} rows).")
+            continue
+        # PredictModel 과 같은 스케일링
+        stocks[code] = FeatureScaler(FEATURES).fit_transform(feature_df.to_numpy()).astype(np.float32)
+
+    start_time = time.perf_counter()
+    best = search(stocks, args.configs, args.eta, args.min_epochs, args.max_epochs, args.validation, args.patience, budget)
+
+    cache = TrainingCache(MODEL_DIR)
+    for code, result in best.items():
+        cache.save_hparams(code, dict(result, validation=args.validation, candidates=args.configs))
+        print(f"[+] {code}: {cache.hparams_path(code).relative_to(MODEL_DIR).as_posix()} 저장 {result['hparams']}")
+
+    print(f"\n[+] 하이퍼파라미터 탐색 완료 ({len(best)}/{len(stocks)}개 종목, {time.perf_counter() - start_time:.1f}s)")
@@ -0,0 +1,275 @@
+# wiz-stock/data/ModelEngines.py
+# 백테스트에서 비교할 다음 날 종가 예측 엔진
+import shutil
+import tempfile
+import numpy as np
+from pathlib import Path
+from numpy.lib.stride_tricks import sliding_window_view
+from FeatureScaler import FeatureScaler
+
+class PredictionEngine():
+    """
+    다음 날 종가 예측 엔진 인터페이스
+
+    fit(tasks)                        : tasks = {task_key(종목 코드): 학습 구간의 원본 Feature 배열 (행 수, Feature 수)}
+                                        모든 종목을 한 번에 받아서 학습 (종목별 병렬 학습 또는 전 종목 통합 학습)
+    predict(task_key, values, ends)   : values[end - L + 1 : end + 1] 윈도우로 values[end + 1] 의 Close 를 예측
+                                        ends 전체를 한 번의 예측 호출로 계산하여 원래 가격 단위 배열 리턴
+    close()                           : 임시 파일 정리
+    """
+    name = 'base'
+
+    def __init__(self, feature_names, sequence_length, close_feature='Close'):
+        self.feature_names = list(feature_names)
+        self.sequence_length = sequence_length
+        self.close_index = self.feature_names.index(close_feature)
+
+    def fit(self, tasks: dict):
+        pass
+
+    def predict(self, task_key, values, ends):
+        raise NotImplementedError
+
+    def close(self):
+        """ 학습 중 만든 임시 파일 정리 """
+        pass
+
+class NaiveEngine(PredictionEngine):
+    """ 내일 종가 = 오늘 종가 (비교 기준선) """
+    name = 'naive'
+
+    def predict(self, task_key, values, ends):
+        return np.asarray(values, dtype=np.float64)[np.asarray(ends), self.close_index]
+
+class MomentumEngine(PredictionEngine):
+    """ 내일 종가 = 오늘 종가 + 최근 window 일 평균 변화량 """
+    name = 'momentum'
+
+    def __init__(self, feature_names, sequence_length, close_feature='Close', window=5):
+        super().__init__(feature_names, sequence_length, close_feature)
+        self.window = window
+
+    def predict(self, task_key, values, ends):
+        close = np.asarray(values, dtype=np.float64)[:, self.close_index]
+        ends = np.asarray(ends)
+        starts = np.maximum(ends - self.window, 0)
+        drift = (close[ends] - close[starts]) / np.maximum(ends - starts, 1)
+        return close[ends] + drift
+
+class LSTMEngine(PredictionEngine):
+    """
+    PredictModel 과 같은 LSTM (ModelTraining.build_lstm_model) 을 학습 구간마다 새로 학습
+
+    - 스케일러는 학습 구간에만 fit (평가 구간 정보가 학습에 새지 않도록)
+    - 학습은 ModelTraining.train_models 의 프로세스 풀에서 모든 종목/구간을 병렬 실행
+    """
+    name = 'lstm'
+
+    def __init__(self, feature_names, sequence_length, close_feature='Close', epochs=50, batch_size=64, seed=42, budget=600):
+        super().__init__(feature_names, sequence_length, close_feature)
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.seed = seed
+        self.budget = budget
+        self.work_dir = Path(tempfile.mkdtemp(prefix='backtest_lstm_'))
+        self.scalers = {}
+        self.model_paths = {}
+
+    def fit(self, tasks: dict):
+        from ModelTraining import train_models
+
+        jobs = []
+        for index, (task_key, train_values) in enumerate(tasks.items()):
+            scaler = FeatureScaler(self.feature_names).fit(train_values)
+            model_path = self.work_dir / f"task_{index}.keras"
+            self.scalers[task_key] = scaler
+            self.model_paths[task_key] = model_path
+            jobs.append({
+                'code': task_key,
+                'model_path': str(model_path),
+                'mode': 'cold',
+                'values': scaler.transform(train_values).astype(np.float32),
+                'close_index': self.close_index,
+                'sequence_length': self.sequence_length,
+                'epochs': self.epochs,
+                'batch_size': self.batch_size,
+                'streaming': False,
+                'seed': self.seed,
+                'budget': self.budget
+            })
+
+        results = train_models(jobs)
+        for task_key, result in results.items():
+            if result['status'] in ('timeout', 'error'):
+                self.model_paths.pop(task_key, None)
+
+    def predict(self, task_key, values, ends):
+        import tensorflow as tf
+
+        if task_key not in self.model_paths:
+            return np.full(len(ends), np.nan)
+
+        scaler = self.scalers[task_key]
+        model = tf.keras.models.load_model(self.model_paths[task_key])
+
+        # (행 수 - L + 1, L, F) 윈도우 view 에서 평가 시점의 윈도우만 골라 한 번에 예측
+        scaled = scaler.transform(values).astype(np.float32)
+        windows = sliding_window_view(scaled, (self.sequence_length, scaled.shape[1]))[:, 0]
+        batch = np.ascontiguousarray(windows[np.asarray(ends) - self.sequence_length + 1])
+
+        predicted = model(tf.constant(batch), training=False).numpy()[:, 0]
+        return scaler.inverse_transform_feature(predicted, self.feature_names[self.close_index])
+
+    def close(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+class LaggedFeatureEngine(PredictionEngine):
+    """
+    지연(lag) Feature 기반 표 형식 모델을 전 종목 데이터로 한 번에 학습하는 CPU 엔진 (TensorFlow 불필요)
+
+    - 입력: 최근 lags 일의 Close 로그 수익률 + 종목 간 비교 가능하도록 정규화한 보조 지표
+    - 타깃: horizons 거래일 뒤 Close 로그 수익률 >> 예측 종가 = 오늘 종가 x exp(예측 수익률)
+      (시점이 여러 개면 다중 출력 모델 1개로 학습, predict 는 첫 번째 시점)
+    """
+    name = 'lagged'
+
+    def __init__(self, feature_names, sequence_length, close_feature='Close', lags=10, horizons=(1,)):
+        super().__init__(feature_names, sequence_length, close_feature)
+        self.lags = lags
+        self.horizons = tuple(horizons)
+        self.model = None
+
+        # 입력 열 이름과 원래 Feature 대응 (top_feature 계산용)
+        self.columns = [f'{close_feature}_return_{lag}' for lag in range(lags)]
+        self.sources = [close_feature] * lags
+        for feature in self.feature_names:
+            if feature != close_feature:
+                self.columns.append(feature)
+                self.sources.append(feature)
+
+    def build_model(self):
+        raise NotImplementedError
+
+    def design_matrix(self, values, ends):
+        """ (len(ends), 입력 열 수) 배열. 계산할 수 없는 행은 NaN """
+        values = np.asarray(values, dtype=np.float64)
+        ends = np.asarray(ends)
+        close = values[:, self.close_index]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.concatenate([[np.nan], np.diff(np.log(close))])
+            columns = [np.where(ends - lag >= 0, returns[np.maximum(ends - lag, 0)], np.nan) for lag in range(self.lags)]
+
+            for index, feature in enumerate(self.feature_names):
+                if index == self.close_index:
+                    continue
+                column = values[:, index]
+                if feature == 'Volume':
+                    # 최근 20일 평균 대비 거래량 (로그)
+                    mean_volume = np.convolve(column, np.ones(20) / 20, mode='full')[:len(column)]
+                    mean_volume[:19] = np.nan
+                    column = np.log1p(column) - np.log1p(mean_volume)
+                elif feature == 'OBV':
+                    # OBV 는 누적값이라 종목마다 크기가 다름 >> 5일 변화량을 거래량 규모로 나눔
+                    previous = np.concatenate([np.full(5, np.nan), column[:-5]])
+                    column = (column - previous) / (np.abs(column) + 1.0)
+                elif feature in ('SMA_50', 'ATR'):
+                    # 가격 단위 지표 >> 종가 대비 비율
+                    column = column / close - (1.0 if feature == 'SMA_50' else 0.0)
+                else:
+                    # RSI, ADX, MACD_Soft_-100_100 등 0~100 / -100~100 지표
+                    column = column / 100.0
+                columns.append(column[ends])
+
+        return np.column_stack(columns)
+
+    def fit(self, tasks: dict):
+        X, y = [], []
+        for train_values in tasks.values():
+            train_values = np.asarray(train_values, dtype=np.float64)
+            ends = np.arange(self.lags, len(train_values) - max(self.horizons))
+            close = train_values[:, self.close_index]
+            X.append(self.design_matrix(train_values, ends))
+            y.append(np.column_stack([np.log(close[ends + h] / close[ends]) for h in self.horizons]))
+
+        X, y = np.concatenate(X), np.concatenate(y)
+        valid = np.isfinite(X).all(axis=1) & np.isfinite(y).all(axis=1)
+        if len(self.horizons) == 1:
+            y = y[:, 0]
+
+        self.model = self.build_model()
+        self.model.fit(X[valid], y[valid])
+        self.fill_values = np.nanmean(X[valid], axis=0)
+
+    def predict_returns(self, X):
+        """ (행 수, 시점 수) 예측 로그 수익률 """
+        X = np.where(np.isfinite(X), X, self.fill_values)
+        return self.model.predict(X).reshape(len(X), -1)
+
+    def predict_horizons(self, task_key, values, ends):
+        """ (len(ends), 시점 수) 예측 종가 (한 번의 예측 호출) """
+        close = np.asarray(values, dtype=np.float64)[np.asarray(ends), self.close_index]
+        return close[:, None] * np.exp(self.predict_returns(self.design_matrix(values, ends)))
+
+    def predict(self, task_key, values, ends):
+        return self.predict_horizons(task_key, values, ends)[:, 0]
+
+    def top_features(self, values_list, ends_list):
+        """
+        종목별 마지막 예측의 top_feature (원래 Feature 단위로 묶은 입력 열을 학습 평균으로 바꿨을 때 예측 변화가 가장 큰 Feature)
+
+        모든 종목 x Feature 조합을 한 번의 predict 호출로 계산
+        """
+        X = np.vstack([self.design_matrix(values, [end]) for values, end in zip(values_list, ends_list)])
+        X = np.where(np.isfinite(X), X, self.fill_values)
+        features = list(dict.fromkeys(self.sources))
+        sources = np.array(self.sources)
+
+        # (Feature 수 + 1) 개의 입력 묶음: 원본, Feature 별로 해당 열을 평균으로 바꾼 입력
+        batches = [X]
+        for feature in features:
+            occluded = X.copy()
+            occluded[:, sources == feature] = self.fill_values[sources == feature]
+            batches.append(occluded)
+
+        # 첫 번째 시점(다음 날) 예측 기준
+        predictions = self.predict_returns(np.vstack(batches))[:, 0].reshape(len(batches), len(X))
+        effects = np.abs(predictions[1:] - predictions[0])
+        return [features[index] for index in np.argmax(effects, axis=0)]
+
+class RidgeEngine(LaggedFeatureEngine):
+    """ 표준화 + Ridge 회귀 """
+    name = 'ridge'
+
+    def build_model(self):
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.linear_model import Ridge
+        return make_pipeline(StandardScaler(), Ridge(alpha=10.0))
+
+class GBMEngine(LaggedFeatureEngine):
+    """ 히스토그램 기반 Gradient Boosting (sklearn HistGradientBoostingRegressor) """
+    name = 'gbm'
+
+    def __init__(self, feature_names, sequence_length, close_feature='Close', lags=10, horizons=(1,), seed=42):
+        super().__init__(feature_names, sequence_length, close_feature, lags, horizons)
+        self.seed = seed
+
+    def build_model(self):
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        model = HistGradientBoostingRegressor(max_iter=200, learning_rate=0.05, max_leaf_nodes=15,
+                                              l2_regularization=1.0, early_stopping=False, random_state=self.seed)
+        if len(self.horizons) == 1:
+            return model
+
+        # 단일 출력 모델이라 시점별로 트리를 따로 학습 (Ridge 는 다중 출력을 한 번에 풂)
+        from sklearn.multioutput import MultiOutputRegressor
+        return MultiOutputRegressor(model)
+
+ENGINES = {
+    'naive': NaiveEngine,
+    'momentum': MomentumEngine,
+    'lstm': LSTMEngine,
+    'ridge': RidgeEngine,
+    'gbm': GBMEngine
+}
@@ -0,0 +1,105 @@
+# wiz-stock/data/ModelExport.py
+# 학습된 Keras 모델을 추론 전용 TFLite 모델(float16 / int8 가중치)로 변환하고 불러오는 모듈
+#
+# models/{code}/{key}/model.tflite : 학습 직후 model.keras 옆에 저장 (변환 검증을 통과한 경우에만)
+import os
+import threading
+import numpy as np
+from pathlib import Path
+
+# INFERENCE_FORMAT : tflite (기본, model.tflite 가 있으면 학습 없는 예측에 사용하고 없으면 keras) / keras
+# TFLITE_QUANTIZATION : float16 (기본, 가중치 float16) / int8 (가중치 int8 dynamic range 양자화, 파일이 더 작음)
+# TFLITE_TOLERANCE : 변환 검증 허용 오차 (학습 윈도우에서 Keras 모델 대비 스케일된 출력의 최대 절대 오차)
+INFERENCE_FORMAT = os.getenv('INFERENCE_FORMAT', 'tflite')
+TFLITE_QUANTIZATION = os.getenv('TFLITE_QUANTIZATION', 'float16')
+TFLITE_TOLERANCE = float(os.getenv('TFLITE_TOLERANCE', '0.01'))
+TFLITE_CHECK_WINDOWS = 64
+
+def tflite_path(model_path) -> Path:
+    return Path(model_path).with_suffix('.tflite')
+
+def interpreter_class():
+    """ LiteRT(ai_edge_litert) 가 설치되어 있으면 TensorFlow 를 불러오지 않고 사용 """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+def convert(model, quantization=TFLITE_QUANTIZATION) -> bytes:
+    """
+    Keras 모델 >> TFLite flatbuffer
+
+    배치 크기가 정해지지 않은 LSTM 은 TensorFlow 연산(Flex)이 필요하므로, 입력 배치 크기를 1 로 고정한 복제 모델을
+    변환하여 TFLite 기본 연산만 사용 (여러 윈도우는 TFLiteModel 이 하나씩 실행)
+    """
+    import tensorflow as tf
+
+    if quantization not in ('float16', 'int8'):
+        raise ValueError(f"알 수 없는 TFLITE_QUANTIZATION: {quantization}")
+
+    fixed = tf.keras.models.clone_model(model, input_tensors=tf.keras.Input(batch_shape=(1,) + tuple(model.input_shape[1:])))
+    fixed.set_weights(model.get_weights())
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(fixed)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+class TFLiteModel():
+    """ TFLite 인터프리터 래퍼. Keras 모델처럼 model(x) 로 (배치, 출력 수) 배열을 리턴 """
+    def __init__(self, path=None, model_content=None):
+        Interpreter = interpreter_class()
+        self.interpreter = Interpreter(model_path=str(path)) if path is not None else Interpreter(model_content=model_content)
+        self.interpreter.allocate_tensors()
+        self.input_index = self.interpreter.get_input_details()[0]['index']
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+        # 인터프리터는 스레드 간 공유 불가 >> 호출 단위로 잠금
+        self.lock = threading.Lock()
+
+    def __call__(self, x, training=False):
+        x = np.asarray(x, dtype=np.float32)
+        outputs = []
+        with self.lock:
+            for window in x:
+                self.interpreter.set_tensor(self.input_index, window[None])
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self.output_index)[0].copy())
+        return np.stack(outputs)
+
+def check_accuracy(model, lite_model, windows) -> float:
+    """ 마지막 TFLITE_CHECK_WINDOWS 개 윈도우에서 Keras 대비 최대 절대 오차 """
+    sample = np.ascontiguousarray(windows[-TFLITE_CHECK_WINDOWS:], dtype=np.float32)
+    return float(np.abs(lite_model(sample) - np.asarray(model(sample, training=False))).max())
+
+def export_tflite(model, model_path, windows, quantization=TFLITE_QUANTIZATION, tolerance=TFLITE_TOLERANCE) -> dict:
+    """
+    model_path 옆에 model.tflite 저장. 변환에 실패하거나 검증 오차가 tolerance 를 넘으면 저장하지 않음 (추론은 keras 사용)
+
+    Returns: {'status': 'ok' | 'rejected' | 'error', 'quantization', 'max_error', 'bytes'}
+    """
+    path = tflite_path(model_path)
+    try:
+        content = convert(model, quantization)
+        max_error = check_accuracy(model, TFLiteModel(model_content=content), windows)
+    except Exception as e:
+        return {'status': 'error', 'quantization': quantization, 'error': str(e)}
+
+    if max_error > tolerance:
+        return {'status': 'rejected', 'quantization': quantization, 'max_error': max_error}
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+    return {'status': 'ok', 'quantization': quantization, 'max_error': max_error, 'bytes': len(content)}
+
+def load_inference_model(model_path, model_cache=None, inference_format=INFERENCE_FORMAT):
+    """ 학습 없는 예측용 TFLite 모델 (없거나 INFERENCE_FORMAT=keras 이면 None) """
+    path = tflite_path(model_path)
+    if inference_format != 'tflite' or not path.exists():
+        return None
+    if model_cache is not None:
+        return model_cache.get(path, TFLiteModel)
+    return TFLiteModel(path)
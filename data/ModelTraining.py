@@ -0,0 +1,247 @@
+# wiz-stock/data/ModelTraining.py
+# 종목별 LSTM 학습 작업을 프로세스 풀에서 병렬로 실행하는 학습 스케줄러
+import os
+import time
+import multiprocessing
+import numpy as np
+from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+
+# TRAIN_WORKERS : 동시에 학습할 종목 수 (0 = CPU 코어 수와 작업 수로 자동 결정)
+# TRAIN_THREADS : 작업 1개가 사용할 TensorFlow intra-op 스레드 수 (0 = CPU 코어 수 / TRAIN_WORKERS)
+# TRAIN_BUDGET : 전체 학습(모든 작업) 시간 제한(초). 작업별 시간 제한은 이 값을 라운드(작업 수 / 동시 작업 수)로 나눠 정함
+# TRAIN_DEADLINE : 파이프라인 학습을 끝내야 하는 시각 (HH:MM, 지났으면 다음 날 같은 시각). 15:30 파이프라인 후 16:00 채점(app/scheduler.py daily_grading) 전
+# TRAIN_JOB_BUDGET : 작업 1개의 학습 시간 상한(초). 초과 시 현재 epoch 까지의 가중치로 학습 종료
+# TRAIN_SEED : 학습 시드 (같은 시드/스레드 수면 병렬 학습과 순차 학습 결과가 같음)
+TRAIN_WORKERS = int(os.getenv('TRAIN_WORKERS', '0'))
+TRAIN_THREADS = int(os.getenv('TRAIN_THREADS', '0'))
+TRAIN_BUDGET = float(os.getenv('TRAIN_BUDGET', '1800'))
+TRAIN_DEADLINE = os.getenv('TRAIN_DEADLINE', '16:00')
+TRAIN_JOB_BUDGET = float(os.getenv('TRAIN_JOB_BUDGET', '600'))
+TRAIN_SEED = int(os.getenv('TRAIN_SEED', '42'))
+
+# build_lstm_model 기본 구조 (HyperSearch 결과가 없는 종목에 사용)
+DEFAULT_MODEL_HPARAMS = {'units': 128, 'dropout': 0.2, 'learning_rate': 0.001}
+
+def window_arrays(values, sequence_length, close_index, dtype=np.float32, horizons=None):
+    """
+    2차원 배열 >> (시퀀스 view, 타깃)
+
+    horizons=None : 다음 날 Close 타깃 (N - L,)
+    horizons=(1, 3, 5) : 윈도우 마지막 날 기준 h 거래일 뒤 Close 타깃 (N - L - max(h) + 1, len(horizons))
+    """
+    values = np.ascontiguousarray(values, dtype=dtype)
+    lead = max(horizons) if horizons else 1
+
+    if len(values) < sequence_length + lead:
+        targets_shape = (0, len(horizons)) if horizons else (0,)
+        return np.empty((0, sequence_length, values.shape[1]), dtype=dtype), np.empty(targets_shape, dtype=dtype)
+
+    # (N - L - lead + 1, 1, L, F) >> (N - L - lead + 1, L, F)
+    sequences = sliding_window_view(values[:len(values) - lead], (sequence_length, values.shape[1]))[:, 0]
+    if not horizons:
+        return sequences, values[sequence_length:, close_index]
+
+    # targets[i, j] = values[i + L - 1 + h_j, Close]
+    count = len(sequences)
+    targets = np.stack([values[sequence_length - 1 + h:sequence_length - 1 + h + count, close_index] for h in horizons], axis=1)
+    return sequences, targets
+
+def window_dataset(values, sequence_length, close_index, batch_size, shuffle=False, seed=None, horizons=None):
+    """ window_arrays 와 같은 (시퀀스, 타깃) 쌍을 배치 단위로 생성하는 tf.data.Dataset """
+    import tensorflow as tf
+
+    values = np.ascontiguousarray(values, dtype=np.float32)
+    lead = max(horizons) if horizons else 1
+    _, targets = window_arrays(values, sequence_length, close_index, horizons=horizons)
+
+    return tf.keras.utils.timeseries_dataset_from_array(
+        data=values[:len(values) - lead],
+        targets=targets,
+        sequence_length=sequence_length,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        seed=seed
+    )
+
+def build_lstm_model(input_shape, outputs=1, units=DEFAULT_MODEL_HPARAMS['units'], dropout=DEFAULT_MODEL_HPARAMS['dropout'],
+                     learning_rate=DEFAULT_MODEL_HPARAMS['learning_rate']):
+    """ outputs: 예측할 시점(horizon) 수. 마지막 Dense 층만 달라지고 나머지 연산은 같음 """
+    import tensorflow as tf
+
+    inputs = tf.keras.Input(shape=input_shape)
+
+    x = tf.keras.layers.LSTM(units=units, return_sequences=True)(inputs)
+    x = tf.keras.layers.Dropout(dropout)(x)
+    x = tf.keras.layers.LSTM(units=units)(x)
+    x = tf.keras.layers.Dropout(dropout)(x)
+    x = tf.keras.layers.Dense(units=outputs)(x)
+
+    model = tf.keras.Model(inputs=inputs, outputs=x)
+
+    optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+    model.compile(loss='mean_squared_error', optimizer=optimizer)
+    return model
+
+def thread_budget(job_count, workers=TRAIN_WORKERS, threads=TRAIN_THREADS):
+    """ (동시 작업 수, 작업별 intra-op 스레드 수, inter-op 스레드 수) 결정 """
+    cpu_count = os.cpu_count() or 1
+
+    if workers <= 0:
+        workers = cpu_count // max(1, threads) if threads > 0 else min(cpu_count, 4)
+    workers = max(1, min(workers, job_count, cpu_count))
+
+    if threads <= 0:
+        threads = max(1, cpu_count // workers)
+
+    # LSTM 은 순차 연산이라 inter-op 병렬성의 이득이 작음 >> 2개로 제한하여 작업 간 스레드 경합 방지
+    return workers, threads, min(2, threads)
+
+def init_worker(intra_threads, inter_threads):
+    """ 워커 프로세스 초기화: TensorFlow 런타임이 시작되기 전에 스레드 수 설정 """
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    os.environ['OMP_NUM_THREADS'] = str(intra_threads)
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(intra_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_threads)
+    tf.config.experimental.enable_op_determinism()
+
+def train_job(job):
+    """
+    학습 작업 1개 실행 (워커 프로세스에서 호출)
+
+    job: {'code', 'model_path', 'mode'('cold' | 'finetune'), 'values', 'close_index', 'sequence_length',
+          'epochs', 'batch_size', 'streaming', 'seed', 'budget', 'base_model_path'(finetune 시작 모델, 생략 시 model_path),
+          'horizons'(예측 시점 튜플, 생략 시 다음 날 1개),
+          'tflite'(학습 후 model_path 옆에 저장할 TFLite 양자화 방식 float16 | int8, 생략 시 변환 안 함),
+          'hparams'(cold 학습 모델 구조 {'units', 'dropout', 'learning_rate'}, 생략 시 DEFAULT_MODEL_HPARAMS),
+          'validation'(검증 비율. 마지막 구간을 검증용으로 떼어 early stopping, 'patience' epoch 동안 개선 없으면 종료)}
+
+    model_path 가 None 이면 모델을 저장하지 않음 (HyperSearch 의 후보 평가)
+    """
+    import tensorflow as tf
+
+    class TimeBudget(tf.keras.callbacks.Callback):
+        """ 시간 제한을 넘기면 현재 epoch 이후 학습 종료 """
+        def __init__(self, budget):
+            super().__init__()
+            self.budget = budget
+            self.epochs_run = 0
+            self.exceeded = False
+
+        def on_train_begin(self, logs=None):
+            self.start_time = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.epochs_run = epoch + 1
+            if time.perf_counter() - self.start_time > self.budget:
+                self.exceeded = True
+                self.model.stop_training = True
+
+    start_time = time.perf_counter()
+    tf.keras.backend.clear_session()
+    tf.keras.utils.set_random_seed(job['seed'])
+
+    horizons = tuple(job.get('horizons') or (1,))
+    X, y = window_arrays(job['values'], job['sequence_length'], job['close_index'], horizons=horizons)
+
+    if job['mode'] == 'finetune':
+        model = tf.keras.models.load_model(job.get('base_model_path', job['model_path']))
+        # 출력 수가 다르면 MSE 가 브로드캐스트되어 오류 없이 잘못 학습되므로 거부
+        if model.output_shape[-1] != len(horizons):
+            raise ValueError(f"finetune base model has {model.output_shape[-1]} outputs, expected {len(horizons)} (horizons {horizons})")
+    else:
+        model = build_lstm_model(input_shape=(X.shape[1], X.shape[2]), outputs=len(horizons), **dict(DEFAULT_MODEL_HPARAMS, **job.get('hparams', {})))
+
+    budget = TimeBudget(job['budget'])
+    history = None
+    if job.get('validation'):
+        # 시계열이므로 섞지 않고 마지막 구간을 검증용으로 사용
+        split = len(X) - max(1, int(len(X) * job['validation']))
+        early_stopping = tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=job.get('patience', 5), restore_best_weights=True)
+        history = model.fit(X[:split], y[:split], validation_data=(X[split:], y[split:]), epochs=job['epochs'], batch_size=job['batch_size'],
+                            verbose=0, callbacks=[budget, early_stopping])
+    elif job.get('streaming'):
+        dataset = window_dataset(job['values'], job['sequence_length'], job['close_index'], job['batch_size'], shuffle=True, seed=job['seed'], horizons=horizons)
+        model.fit(dataset, epochs=job['epochs'], verbose=0, callbacks=[budget])
+    else:
+        model.fit(X, y, epochs=job['epochs'], batch_size=job['batch_size'], verbose=0, callbacks=[budget])
+
+    if job['model_path'] is not None:
+        model.save(job['model_path'])
+
+    result = {
+        'code': job['code'],
+        'status': 'budget_exceeded' if budget.exceeded else 'ok',
+        'epochs_run': budget.epochs_run
+    }
+    if history is not None:
+        val_losses = history.history['val_loss']
+        result['val_loss'] = float(np.min(val_losses))
+        result['best_epoch'] = int(np.argmin(val_losses)) + 1
+    if job.get('tflite') and job['model_path'] is not None:
+        from ModelExport import export_tflite
+        result['tflite'] = export_tflite(model, job['model_path'], X, job['tflite'])
+
+    result['elapsed'] = time.perf_counter() - start_time
+    return result
+
+def seconds_until(deadline, now=None):
+    """ 다음 HH:MM 까지 남은 시간(초) """
+    now = now or datetime.now()
+    hour, minute = map(int, deadline.split(':'))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+def training_budget(budget=TRAIN_BUDGET, deadline=TRAIN_DEADLINE):
+    """ 전체 학습 시간 제한: budget 과 다음 deadline 중 먼저 오는 시점까지 남은 시간(초) """
+    return min(budget, seconds_until(deadline))
+
+def train_models(jobs, workers=TRAIN_WORKERS, threads=TRAIN_THREADS, timeout=None):
+    """
+    학습 작업들을 spawn 프로세스 풀에서 실행하고 {code: 결과} 리턴
+
+    - timeout: 전체 학습 시간 제한(초, 기본 TRAIN_BUDGET). 끝나지 않은 작업은 실패로 처리 후 풀을 강제 종료
+    - 작업별 시간 제한은 작업이 workers 개씩 차례로 실행된다고 보고 timeout / 라운드 수 의 80%
+      (작업의 budget 이 더 작으면 budget). 넘긴 작업은 TimeBudget 콜백이 현재 epoch 에서 멈춤
+    """
+    if not jobs:
+        return {}
+
+    workers, intra_threads, inter_threads = thread_budget(len(jobs), workers, threads)
+    timeout = TRAIN_BUDGET if timeout is None else timeout
+    rounds = -(-len(jobs) // workers)
+    job_budget = timeout / rounds * 0.8
+    jobs = [dict(job, budget=min(job.get('budget', job_budget), job_budget)) for job in jobs]
+    print(f"[+] 학습 작업 {len(jobs)}개 시작 (동시 작업: {workers}, 작업별 스레드: intra {intra_threads} / inter {inter_threads}, "
+          f"전체 제한 {timeout:.0f}s, 작업별 제한 {job_budget:.0f}s)")
+
+    # TensorFlow 가 이미 초기화된 부모 프로세스를 fork 하지 않도록 spawn 사용
+    context = multiprocessing.get_context('spawn')
+    pool = context.Pool(processes=workers, initializer=init_worker, initargs=(intra_threads, inter_threads))
+    deadline = time.perf_counter() + timeout
+
+    results = {}
+    try:
+        pending = [(job, pool.apply_async(train_job, (job,))) for job in jobs]
+
+        for job, async_result in pending:
+            try:
+                result = async_result.get(timeout=max(1, deadline - time.perf_counter()))
+                print(f"[+] {result['code']}: 학습 완료 ({result['status']}, {result['epochs_run']} epochs, {result['elapsed']:.1f}s)")
+            except multiprocessing.TimeoutError:
+                result = {'code': job['code'], 'status': 'timeout', 'epochs_run': 0, 'elapsed': None}
+                print(f"[!] {job['code']}: 학습 시간 제한 초과로 건너뜁니다.")
+            except Exception as e:
+                result = {'code': job['code'], 'status': 'error', 'epochs_run': 0, 'elapsed': None}
+                print(f"[!] {job['code']}: 학습 중 오류 발생: {e}")
+
+            results[job['code']] = result
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return results
@@ -0,0 +1,184 @@
+# python ./data/ModelWorker.py
+# TensorFlow / SHAP / sklearn / pandas 를 한 번만 import 하고 모델과 스케일러를 메모리에 유지하는 상주 모델 워커
+#
+# 로컬 IPC(multiprocessing.connection)로 작업을 받아서 순서대로 실행
+#   {'op': 'ping'}                        : 상태 확인
+#   {'op': 'train'}                       : PredictModel.run_predictive_modeling (학습 + 예측 + DB 업로드)
+#   {'op': 'predict', 'codes': [...]}     : PredictModel.predict_latest (저장된 모델로 예측만, codes 생략 시 전체 종목)
+# 응답: {'status': 'ok', 'result': ..., 'elapsed': 초} 또는 {'status': 'error', 'error': 메시지}
+import os
+import errno
+import time
+import secrets
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from multiprocessing.connection import Listener, Client
+
+# MODEL_WORKER_HOST / MODEL_WORKER_PORT : 워커 주소 (로컬에서만 접속)
+# MODEL_WORKER_AUTHKEY : 워커 접속 인증 키. 없으면 MODEL_WORKER_KEY_PATH 파일의 키 사용
+#                        (워커가 처음 시작할 때 임의의 키를 만들어 소유자만 읽을 수 있게(0600) 저장, 클라이언트는 같은 파일을 읽음)
+#                        multiprocessing.connection 은 받은 데이터를 unpickle 하므로 키를 아는 프로세스는 워커에서 코드를 실행할 수 있음
+# MODEL_WORKER_CACHE_SIZE : 메모리에 유지할 모델/스케일러 파일 수
+MODEL_WORKER_HOST = os.getenv('MODEL_WORKER_HOST', '127.0.0.1')
+MODEL_WORKER_PORT = int(os.getenv('MODEL_WORKER_PORT', '6100'))
+MODEL_WORKER_KEY_PATH = Path(os.getenv('MODEL_WORKER_KEY_PATH', Path(__file__).resolve().parent.parent / 'cache' / 'model_worker.key'))
+MODEL_WORKER_CACHE_SIZE = int(os.getenv('MODEL_WORKER_CACHE_SIZE', '256'))
+
+def load_authkey(create = False, path = MODEL_WORKER_KEY_PATH) -> bytes:
+    """
+    워커 접속 인증 키 (MODEL_WORKER_AUTHKEY > 키 파일)
+
+    create: 키 파일이 없으면 새로 만듦 (워커 시작 시). 클라이언트는 파일이 없으면 FileNotFoundError (= 워커 없음)
+    다른 사용자가 읽을 수 있는 키 파일은 사용하지 않음 (PermissionError)
+    """
+    if os.getenv('MODEL_WORKER_AUTHKEY'):
+        return os.getenv('MODEL_WORKER_AUTHKEY').encode('utf-8')
+
+    path = Path(path)
+    if create and not path.exists():
+        path.parent.mkdir(parents = True, exist_ok = True)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            with os.fdopen(fd, 'w', encoding = 'utf-8') as f:
+                f.write(secrets.token_hex(32))
+            print(f"[ModelWorker] New auth key saved: {path}")
+        except FileExistsError:
+            pass
+
+    if os.name == 'posix' and path.stat().st_mode & 0o077:
+        raise PermissionError(f"{path} must be readable only by its owner (chmod 600)")
+    return path.read_text(encoding = 'utf-8').strip().encode('utf-8')
+
+class ModelWorkerError(Exception):
+    """ 워커에서 작업이 실패한 경우 """
+
+def request(job: dict, timeout: float = None, host = MODEL_WORKER_HOST, port = MODEL_WORKER_PORT):
+    """
+    상주 모델 워커에 작업 1개를 보내고 결과를 기다림 (동기, app/dependency/model_worker 와 Orchestrator 공용 클라이언트)
+
+    - 워커가 실행 중이 아니면 ConnectionRefusedError (워커가 한 번도 시작되지 않아 키 파일이 없으면 FileNotFoundError)
+    - timeout 초 안에 응답이 없으면 TimeoutError (워커의 작업은 계속 진행되고 그동안 다른 학습/예측 작업은 busy)
+    - 워커에서 작업이 실패하면 ModelWorkerError
+    """
+    with Client((host, port), authkey = load_authkey()) as conn:
+        conn.send(job)
+        if not conn.poll(timeout):
+            raise TimeoutError(f"Model worker did not answer '{job.get('op')}' in {timeout}s")
+        response = conn.recv()
+
+    if response['status'] != 'ok':
+        raise ModelWorkerError(response['error'])
+    return response['result']
+
+class ModelCache():
+    """
+    파일 경로 >> 로드된 객체를 보관하는 LRU 캐시
+
+    - 파일 mtime 이 캐시된 시점과 다르면(재학습/스케일러 갱신) 다시 로드
+    - capacity 를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    """
+    def __init__(self, capacity = MODEL_WORKER_CACHE_SIZE):
+        self.capacity = capacity
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, loader):
+        path = str(path)
+        mtime = os.stat(path).st_mtime_ns
+
+        with self.lock:
+            cached = self.items.get(path)
+            if cached is not None and cached[0] == mtime:
+                self.items.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+
+        value = loader(path)
+
+        with self.lock:
+            self.misses += 1
+            self.items[path] = (mtime, value)
+            self.items.move_to_end(path)
+            while len(self.items) > self.capacity:
+                self.items.popitem(last = False)
+
+        return value
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {'size': len(self.items), 'capacity': self.capacity, 'hits': self.hits, 'misses': self.misses}
+
+class ModelWorker():
+    """ IPC 로 받은 작업을 하나씩 실행 (학습 중에도 ping 은 바로 응답) """
+    def __init__(self, host = MODEL_WORKER_HOST, port = MODEL_WORKER_PORT, authkey = None):
+        self.address = (host, port)
+        self.authkey = authkey or load_authkey(create = True)
+        self.cache = ModelCache()
+        self.job_lock = threading.Lock()
+        self.started_at = time.time()
+
+        # 무거운 라이브러리는 워커 시작 시 한 번만 import
+        start_time = time.perf_counter()
+        import PredictModel
+        self.predict_model = PredictModel
+        print(f"[ModelWorker] Libraries loaded ({time.perf_counter() - start_time:.1f}s)")
+
+    def run_job(self, job: dict):
+        op = job.get('op')
+
+        if op == 'ping':
+            return {'uptime': time.time() - self.started_at, 'busy': self.job_lock.locked(), 'cache': self.cache.stats()}
+
+        if op not in ('train', 'predict'):
+            raise ValueError(f"Unknown op: {op}")
+
+        # 학습/예측은 한 번에 하나씩 (학습 작업 자체는 ModelTraining 의 프로세스 풀에서 병렬 실행)
+        with self.job_lock:
+            if op == 'train':
+                return self.predict_model.run_predictive_modeling(model_cache = self.cache)
+            return self.predict_model.predict_latest(job.get('codes'), model_cache = self.cache)
+
+    def handle(self, conn):
+        with conn:
+            try:
+                job = conn.recv()
+            except (EOFError, OSError):
+                return
+
+            start_time = time.perf_counter()
+            try:
+                response = {'status': 'ok', 'result': self.run_job(job)}
+            except Exception as e:
+                print(f"[ModelWorker] Job failed ({job.get('op')}): {e}")
+                response = {'status': 'error', 'error': str(e)}
+            response['elapsed'] = time.perf_counter() - start_time
+
+            try:
+                conn.send(response)
+            except (EOFError, OSError):
+                print(f"[ModelWorker] Client disconnected before the result of '{job.get('op')}' was sent")
+
+    def serve_forever(self):
+        with Listener(self.address, authkey = self.authkey) as listener:
+            print(f"[ModelWorker] Listening on {self.address[0]}:{self.address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"[ModelWorker] Connection rejected: {e}")
+                    continue
+                threading.Thread(target = self.handle, args = (conn,), daemon = True).start()
+
+if __name__ == "__main__":
+    try:
+        ModelWorker().serve_forever()
+    except KeyboardInterrupt:
+        print("[ModelWorker] Stopped")
+    except OSError as e:
+        # 같은 포트에서 다른 워커가 이미 실행 중이면 그 워커를 사용 (정상 종료)
+        if e.errno != errno.EADDRINUSE:
+            raise
+        print(f"[ModelWorker] {MODEL_WORKER_HOST}:{MODEL_WORKER_PORT} is already in use >> another worker is running")
@@ -0,0 +1,110 @@
+import re, hashlib
+import numpy as np
+
+# SimHash 설정: 64bit 지문을 16bit씩 4개 밴드로 나누면 해밍 거리 3 이하인 두 지문은
+# 적어도 1개 밴드가 완전히 일치함 (비둘기집 원리) >> 밴드 버킷만 비교해도 누락 없음
+SIMHASH_BITS = 64
+BAND_BITS = 16
+MAX_DISTANCE = 3
+SHINGLE_SIZE = 3
+MIN_LINE_LENGTH = 40
+
+def article_body(text: str) -> str:
+    """ 페이지 텍스트에서 메뉴/버튼 같은 짧은 줄을 제거하고 본문으로 보이는 긴 줄만 남김 """
+    lines = [line.strip() for line in text.split('\n')]
+    return '\n'.join(line for line in lines if len(line) >= MIN_LINE_LENGTH)
+
+def simhash(text: str) -> int:
+    """ 공백/기호를 제거한 문자 3-gram 기반 64bit SimHash """
+    normalized = re.sub(r'[\W_]+', '', text.lower())
+
+    if len(normalized) < SHINGLE_SIZE:
+        normalized = normalized.ljust(SHINGLE_SIZE)
+
+    shingles = {}
+    for i in range(len(normalized) - SHINGLE_SIZE + 1):
+        shingle = normalized[i:i + SHINGLE_SIZE]
+        shingles[shingle] = shingles.get(shingle, 0) + 1
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size = 8).digest(), 'little') for shingle in shingles],
+        dtype = np.uint64
+    )
+    weights = np.array(list(shingles.values()), dtype = np.int64)
+
+    # (shingle 개수, 64) 비트 행렬 >> 비트별 가중 투표
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis = 1, bitorder = 'little')
+    votes = (weights[:, None] * np.where(bits == 1, 1, -1)).sum(axis = 0)
+
+    fingerprint = 0
+    for bit, vote in enumerate(votes):
+        if vote > 0:
+            fingerprint |= 1 << bit
+
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+def group_near_duplicates(texts: list, max_distance: int = MAX_DISTANCE) -> list:
+    """
+    유사 중복 뉴스를 그룹으로 묶어서 [[대표 index, 중복 index, ...], ...] 형태로 리턴 (입력 순서 유지)
+
+    각 뉴스는 밴드 버킷에 등록된 그룹 대표와만 비교하므로 배치 크기에 선형으로 동작
+    """
+    band_count = SIMHASH_BITS // BAND_BITS
+    band_mask = (1 << BAND_BITS) - 1
+
+    fingerprints = [simhash(text) for text in texts]
+    buckets = {}
+    groups = []
+    group_fingerprints = []
+
+    for index, fingerprint in enumerate(fingerprints):
+        bands = [(band, (fingerprint >> (band * BAND_BITS)) & band_mask) for band in range(band_count)]
+
+        matched = None
+        for key in bands:
+            for group_index in buckets.get(key, []):
+                if hamming_distance(fingerprint, group_fingerprints[group_index]) <= max_distance:
+                    matched = group_index
+                    break
+            if matched is not None:
+                break
+
+        if matched is not None:
+            groups[matched].append(index)
+            continue
+
+        # 새로운 그룹의 대표로 등록
+        group_index = len(groups)
+        groups.append([index])
+        group_fingerprints.append(fingerprint)
+        for key in bands:
+            buckets.setdefault(key, []).append(group_index)
+
+    return groups
+
+def dedup_news(news_items: list, news_texts: list, max_distance: int = MAX_DISTANCE):
+    """
+    뉴스 메타데이터와 본문 리스트에서 대표 뉴스만 남김
+
+    Returns:
+    - 대표 뉴스 item 리스트, 대표 뉴스 본문 리스트, 각 대표가 포함하는 뉴스 item 리스트
+    """
+    texts = []
+    for item, text in zip(news_items, news_texts):
+        body = article_body(text)
+
+        # 본문 추출 실패 시 네이버 API의 제목/요약으로 대체
+        if not body:
+            body = f"{item.get('title', '')}\n{item.get('description', '')}"
+        texts.append(body)
+
+    groups = group_near_duplicates(texts, max_distance = max_distance)
+
+    representative_items = [news_items[group[0]] for group in groups]
+    representative_texts = [news_texts[group[0]] for group in groups]
+    group_members = [[news_items[index] for index in group] for group in groups]
+
+    return representative_items, representative_texts, group_members
@@ -0,0 +1,257 @@
+# python ./data/NewsFixtureServer.py --port 8765 --latency 0.5 --rate-limit 0.1
+# 네이버 뉴스 검색 API / 기사 페이지 / Gemini generateContent 를 대신하는 로컬 서버 (오프라인 벤치마크용)
+#
+# GetNews.py 에 연결: NAVER_NEWS_URL=http://127.0.0.1:8765/v1/search/news.json
+#                    GEMINI_BASE_URL=http://127.0.0.1:8765  GEMINI_THROTTLE=0
+import re, json, time, random, hashlib, argparse, threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from urllib.parse import urlparse, parse_qs, quote, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURE_DIR = Path.cwd() / 'fixtures' / 'news'
+
+SAMPLE_SENTENCES = [
+    '{query} 주가가 외국인 순매수에 힘입어 강세를 보이며 상승 마감했다.',
+    '{query}는 3분기 영업이익이 시장 기대치를 웃도는 호실적을 기록했다고 밝혔다.',
+    '증권가는 {query}의 목표가 상향 조정을 이어가며 실적 개선 기대감을 드러냈다.',
+    '{query} 주가가 업황 둔화 우려에 약세를 보이며 하락 마감했다.',
+    '{query}는 원자재 가격 상승으로 수익성이 악화되며 부진한 실적을 발표했다.',
+    '외국인 순매도가 이어지면서 {query}의 주가 변동성이 커지고 있다는 분석이 나온다.'
+]
+
+class FixtureConfig():
+    """
+    로컬 서버 동작 설정
+
+    - latency: Gemini 응답 지연(초)
+    - error_rate / rate_limit_rate / malformed_rate: Gemini 요청 중 500 / 429 / 깨진 JSON 응답 비율
+    - articles_per_query: 녹화된 검색 결과가 없을 때 검색어별로 생성할 기사 수
+    - duplicate_every: n번째 기사마다 직전 기사 본문을 재사용 (유사 중복 기사 재현, 0이면 사용 안 함)
+    """
+    def __init__(self, fixture_dir = FIXTURE_DIR, latency = 0.0, error_rate = 0.0, rate_limit_rate = 0.0,
+                 malformed_rate = 0.0, articles_per_query = 100, duplicate_every = 5, seed = 42):
+        self.fixture_dir = Path(fixture_dir)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.articles_per_query = articles_per_query
+        self.duplicate_every = duplicate_every
+        self.random = random.Random(seed)
+        self.started_at = datetime.now().astimezone().replace(second = 0, microsecond = 0)
+        self.lock = threading.Lock()
+        self.counters = {'search': 0, 'article': 0, 'gemini': 0, 'gemini_error': 0, 'gemini_429': 0, 'gemini_malformed': 0}
+
+    def count(self, key):
+        with self.lock:
+            self.counters[key] += 1
+
+    def draw(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+def synthetic_items(query: str, config: FixtureConfig) -> list:
+    """ 검색어별 가상 검색 결과 (서버 시작 시각부터 최신순, 10분 간격 발행) """
+    now = config.started_at
+    items = []
+
+    for index in range(config.articles_per_query):
+        items.append({
+            'title': f'{query} 관련 뉴스 {index}',
+            'description': SAMPLE_SENTENCES[index % len(SAMPLE_SENTENCES)].format(query = query),
+            'pubDate': format_datetime(now - timedelta(minutes = 10 * index)),
+            'fixture': f'{quote(query)}/{index}'
+        })
+
+    return items
+
+def synthetic_article(query: str, index: int, config: FixtureConfig) -> str:
+    """ 가상 기사 HTML (duplicate_every 번째 기사는 직전 기사와 같은 본문) """
+    if config.duplicate_every and index % config.duplicate_every == 1:
+        index -= 1
+
+    sentences = [SAMPLE_SENTENCES[(index + offset) % len(SAMPLE_SENTENCES)].format(query = query) for offset in range(3)]
+    body = ''.join(f'<p>{sentence} 기사 번호 {index}번의 본문입니다.</p>\n' for sentence in sentences)
+
+    return f'<html><head><title>{query} {index}</title></head><body><nav>홈\n경제\n증권</nav>\n{body}</body></html>'
+
+def load_items(query: str, config: FixtureConfig) -> list:
+    """ 녹화된 검색 결과(fixtures/news/search/{query}.json)가 있으면 사용, 없으면 가상 결과 생성 """
+    path = config.fixture_dir / 'search' / f'{query}.json'
+
+    if path.exists():
+        with open(path, 'r', encoding = 'utf-8') as f:
+            return json.load(f)
+
+    return synthetic_items(query, config)
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    config: FixtureConfig = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body):
+        payload = json.dumps(body, ensure_ascii = False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        if url.path == '/v1/search/news.json':
+            self.search(parse_qs(url.query))
+        elif url.path.startswith('/article/'):
+            self.article(url.path[len('/article/'):])
+        else:
+            self.send_json(404, {'errorMessage': 'Not Found'})
+
+    def do_POST(self):
+        if re.match(r'^/v1beta/models/[^/]+:generateContent', urlparse(self.path).path):
+            length = int(self.headers.get('Content-Length', 0))
+            self.generate_content(json.loads(self.rfile.read(length) or b'{}'))
+        else:
+            self.send_json(404, {'error': {'message': 'Not Found'}})
+
+    def search(self, params):
+        """ 네이버 뉴스 검색 API 응답 형식 재현 """
+        config = self.config
+        config.count('search')
+
+        query = params.get('query', [''])[0]
+        display = int(params.get('display', ['10'])[0])
+        start = int(params.get('start', ['1'])[0])
+
+        host = f'http://{self.headers.get("Host")}'
+        all_items = load_items(query, config)
+        items = []
+        for item in all_items[start - 1:start - 1 + display]:
+            link = f"{host}/article/{item['fixture']}"
+            items.append({
+                'title': item['title'],
+                'originallink': link,
+                'link': link,
+                'description': item['description'],
+                'pubDate': item['pubDate']
+            })
+
+        self.send_json(200, {'lastBuildDate': format_datetime(datetime.now().astimezone()), 'total': len(all_items), 'start': start, 'display': len(items), 'items': items})
+
+    def article(self, name):
+        """ 녹화된 기사 HTML(fixtures/news/articles/{name}.html)이 있으면 사용, 없으면 가상 기사 생성 """
+        config = self.config
+        config.count('article')
+
+        path = config.fixture_dir / 'articles' / f'{name}.html'
+        if path.exists():
+            html = path.read_text(encoding = 'utf-8')
+        else:
+            query, _, index = unquote(name).rpartition('/')
+            html = synthetic_article(query, int(index) if index.isdigit() else 0, config)
+
+        payload = html.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def generate_content(self, body):
+        """ Gemini generateContent 응답 형식 재현 (지연, 500, 429, 깨진 JSON 설정 가능) """
+        config = self.config
+        config.count('gemini')
+        time.sleep(config.latency)
+
+        draw = config.draw()
+        if draw < config.error_rate:
+            config.count('gemini_error')
+            return self.send_json(500, {'error': {'code': 500, 'message': 'Internal error', 'status': 'INTERNAL'}})
+        draw -= config.error_rate
+
+        if draw < config.rate_limit_rate:
+            config.count('gemini_429')
+            return self.send_json(429, {'error': {'code': 429, 'message': 'Resource has been exhausted', 'status': 'RESOURCE_EXHAUSTED'}})
+        draw -= config.rate_limit_rate
+
+        text = ''.join(part.get('text', '') for content in body.get('contents', []) for part in content.get('parts', []))
+        news_count = text.split('요청사항:', 1)[-1].count('[next_news]')
+
+        # 기사 본문 해시로 정해지는 고정 점수 (같은 기사는 항상 같은 점수)
+        results = []
+        for news in text.split('요청사항:', 1)[-1].split('[next_news]')[1:news_count + 1]:
+            digest = int(hashlib.md5(news.encode('utf-8')).hexdigest(), 16)
+            results.append({'date': datetime.now().strftime('%Y-%m-%d'), 'score': 1 + digest % 100})
+
+        answer = json.dumps(results, ensure_ascii = False)
+        if draw < config.malformed_rate:
+            config.count('gemini_malformed')
+            answer = answer[:len(answer) // 2]
+
+        self.send_json(200, {'candidates': [{'content': {'role': 'model', 'parts': [{'text': answer}]}, 'finishReason': 'STOP'}]})
+
+def start_server(config: FixtureConfig = None, host = '127.0.0.1', port = 0):
+    """ 백그라운드 스레드로 서버 시작 >> (server, base_url) """
+    config = config or FixtureConfig()
+    handler = type('BoundFixtureHandler', (FixtureHandler,), {'config': config})
+
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+
+    return server, f'http://{host}:{server.server_address[1]}'
+
+def record_fixtures(queries: list, fixture_dir = FIXTURE_DIR, display = 25, pages = 1):
+    """ 실제 네이버 API로 검색 결과와 기사 HTML을 녹화 (NAVER_CLIENT_ID/SECRET 필요) """
+    import requests
+    from GetNews import GetNewsData
+
+    collect = GetNewsData()
+    fixture_dir = Path(fixture_dir)
+    (fixture_dir / 'search').mkdir(parents = True, exist_ok = True)
+    (fixture_dir / 'articles').mkdir(parents = True, exist_ok = True)
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+
+    for query in queries:
+        items = []
+        for start in range(1, pages * display + 1, display):
+            for item in collect.get_news_data(query = query, display = display, start = start):
+                name = hashlib.md5(item['link'].encode('utf-8')).hexdigest()
+                try:
+                    html = requests.get(item['link'], headers = headers, timeout = 10).text
+                    (fixture_dir / 'articles' / f'{name}.html').write_text(html, encoding = 'utf-8')
+                except Exception as e:
+                    print(f"failed: {item['link']} ({e})")
+                    continue
+
+                items.append({'title': item['title'], 'description': item['description'], 'pubDate': item['pubDate'], 'fixture': name})
+
+        with open(fixture_dir / 'search' / f'{query}.json', 'w', encoding = 'utf-8') as f:
+            json.dump(items, f, indent = 4, ensure_ascii = False)
+        print(f"[+] {query}: {len(items)} news recorded")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Naver/Gemini local fixture server')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--latency', type = float, default = 0.0)
+    parser.add_argument('--error-rate', type = float, default = 0.0)
+    parser.add_argument('--rate-limit', type = float, default = 0.0)
+    parser.add_argument('--malformed', type = float, default = 0.0)
+    parser.add_argument('--record', nargs = '+', metavar = 'QUERY', help = '실제 API 응답을 fixtures/news 에 녹화')
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record)
+    else:
+        fixture_config = FixtureConfig(latency = args.latency, error_rate = args.error_rate,
+                                       rate_limit_rate = args.rate_limit, malformed_rate = args.malformed)
+        server, base_url = start_server(fixture_config, port = args.port)
+        print(f"[+] Fixture server: {base_url}")
+        print(f"    NAVER_NEWS_URL={base_url}/v1/search/news.json GEMINI_BASE_URL={base_url} GEMINI_THROTTLE=0")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,102 @@
+import os, json
+from pathlib import Path
+from datetime import datetime, timedelta
+
+
+class NewsJournal():
+    """
+    뉴스 감성분석 결과를 한 줄에 하나의 레코드로 기록하는 append-only JSONL 저널 (1회 실행 = 1개 파일)
+
+    - 모든 레코드는 기록 직후 fsync 되므로, 프로세스가 중간에 종료되어도 기록된 분석 결과는 유지됨
+    - commit 레코드가 없는 저널은 다음 실행에서 이어서 사용 (이미 분석한 뉴스는 다시 분석하지 않음)
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+
+    @classmethod
+    def open_run(cls, dir_path):
+        """ 완료되지 않은 저널이 있으면 이어서 사용하고, 없으면 새 저널 생성 """
+        dir_path = Path(dir_path)
+        dir_path.mkdir(exist_ok = True)
+
+        for path in sorted(dir_path.glob('news_journal_*.jsonl'), reverse = True):
+            journal = cls(path)
+            if not journal.is_committed():
+                print(f"[NewsJournal] Resume unfinished journal: {path.name}")
+                return journal
+
+        path = dir_path / f"news_journal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        print(f"[NewsJournal] Create new journal: {path.name}")
+        return cls(path)
+
+    def append(self, record: dict):
+        """ 레코드 1개를 추가하고 디스크에 동기화 """
+        line = json.dumps(record, ensure_ascii = False) + '\n'
+
+        with open(self.path, 'a', encoding = 'utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def extend(self, records: list):
+        """ 여러 레코드를 한 번에 추가하고 한 번만 동기화 """
+        if not records:
+            return
+
+        lines = ''.join(json.dumps(record, ensure_ascii = False) + '\n' for record in records)
+
+        with open(self.path, 'a', encoding = 'utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def records(self, record_type = None):
+        """ 저널 레코드를 한 줄씩 읽어서 반환 (기록 도중 끊긴 마지막 줄은 건너뜀) """
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding = 'utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"[NewsJournal] Skip broken line in {self.path.name}")
+                    continue
+
+                if record_type is None or record.get('type') == record_type:
+                    yield record
+
+    def scored_links(self, query) -> set:
+        """ 해당 검색어에서 이미 분석이 끝난 뉴스 링크 (대표 기사에 묶인 중복 기사 포함) """
+        links = set()
+
+        for record in self.records('article'):
+            if record.get('query') == query:
+                links.add(record['link'])
+                links.update(record.get('duplicates', []))
+
+        return links
+
+    def is_committed(self) -> bool:
+        return any(True for _ in self.records('commit'))
+
+    def commit(self, inserted_rows: int):
+        """ DB 업로드가 끝났음을 기록 """
+        self.append({'type': 'commit', 'inserted_rows': inserted_rows, 'timestamp': datetime.now().isoformat()})
+
+
+def recent_journals(dir_path) -> list:
+    """ dir_path 의 저널 전체 (오래된 순, prune_journals 로 keep_days 이내만 남음) """
+    return [NewsJournal(path) for path in sorted(Path(dir_path).glob('news_journal_*.jsonl'))]
+
+
+def prune_journals(dir_path, keep_days = 30):
+    """ keep_days 일이 지난 완료된 저널 삭제 """
+    limit = datetime.now() - timedelta(days = keep_days)
+
+    for path in Path(dir_path).glob('news_journal_*.jsonl'):
+        if datetime.fromtimestamp(path.stat().st_mtime) < limit and NewsJournal(path).is_committed():
+            try:
+                path.unlink()
+            except OSError:
+                print(f"[NewsJournal] Delete Error: {path.name}")
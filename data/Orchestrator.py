@@ -0,0 +1,250 @@
+# python ./data/Orchestrator.py                          : 전체 파이프라인 (app/main.py 스케줄러가 장 마감 후 실행)
+# python ./data/Orchestrator.py --targets sentiment      : 뉴스 수집 >> 감성분석 업로드만
+# python ./data/Orchestrator.py --targets sentiment --rerun news : 같은 날 뉴스를 다시 수집 (종목 목록은 재사용)
+# python ./data/Orchestrator.py --rerun model            : 오늘 실행에서 model 과 그 뒤 단계를 다시 실행
+#
+# 단계 의존 관계: 의존 단계가 모두 끝나면 바로 시작하고, 서로 독립인 단계는 동시에 실행
+#   listing ─┬─ prices ── indicators ─┬─ db_sync
+#            │                        ├─ model
+#            │                        └─ grading
+#            └─ news ── sentiment
+#
+# cache/pipeline_state/{run_id}.json : 단계별 상태/시도 횟수/출력 (체크포인트)
+#   같은 run_id(기본: 오늘 날짜, --targets 가 있으면 오늘 날짜_대상 단계)로 다시 실행하면 끝난(done/skipped) 단계는 건너뛰고 실패/미실행 단계부터 이어서 실행
+# cache/telemetry/runs.jsonl : 실행마다 단계별 시간/최대 RSS/처리량 기록 (python ./data/Telemetry.py --trend 로 추이 확인)
+import os
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from TrainingCache import write_json
+from Telemetry import Run, timer
+
+project_root = Path(__file__).resolve().parent.parent
+
+# PIPELINE_WORKERS : 동시에 실행할 단계 수
+# PIPELINE_RETRIES : 단계 실패 시 재시도 횟수
+# PIPELINE_RETRY_DELAY : 재시도 대기 시간(초, 시도마다 배로 증가)
+# PIPELINE_MODEL_TIMEOUT : model 단계에서 상주 모델 워커의 학습 결과를 기다리는 시간(초). 넘기면 재시도하지 않고 실패
+PIPELINE_WORKERS = int(os.getenv('PIPELINE_WORKERS', '4'))
+PIPELINE_RETRIES = int(os.getenv('PIPELINE_RETRIES', '2'))
+PIPELINE_RETRY_DELAY = float(os.getenv('PIPELINE_RETRY_DELAY', '60'))
+PIPELINE_MODEL_TIMEOUT = float(os.getenv('PIPELINE_MODEL_TIMEOUT', '3600'))
+STATE_DIR = project_root / 'cache' / 'pipeline_state'
+
+class SkipStage(Exception):
+    """ 단계를 실행할 필요가 없음 (휴장일 등). 이 단계에 의존하는 단계도 건너뜀 """
+
+class FatalStage(Exception):
+    """ 다시 시도해도 같은 이유로 실패하는 경우 (재시도하지 않고 바로 실패) """
+
+def stage_listing(inputs):
+    from DataPipeline import get_top_10_stocks
+    return get_top_10_stocks()
+
+def stage_prices(inputs):
+    from DataPipeline import load_calendar
+    from GetData import get_all_stock_data
+    today = datetime.now().date()
+    if not load_calendar().is_trading_day(today):
+        raise SkipStage(f"{today} is not a trading day")
+    get_all_stock_data(inputs['listing'])
+    return today.isoformat()
+
+def stage_indicators(inputs):
+    from GetData import get_technical_data
+    return len(get_technical_data())
+
+def stage_db_sync(inputs):
+    from DataPipeline import sync_technical_data
+    return sync_technical_data()
+
+def stage_model(inputs):
+    """
+    상주 모델 워커(ModelWorker.py)가 실행 중이면 워커에서 학습 (로드된 모델 재사용), 없으면 이 프로세스에서 학습
+
+    - 워커가 다른 작업 중이면 실패 >> run_stage 재시도
+    - PIPELINE_MODEL_TIMEOUT 안에 학습 결과가 없으면 재시도하지 않고 실패
+      (워커는 학습을 계속하며 작업 잠금을 잡고 있으므로 재시도는 busy 로 실패하고, 이 프로세스에서 같이 학습하면 같은 모델 파일을 두 번 학습)
+    """
+    from ModelWorker import request
+
+    try:
+        status = request({'op': 'ping'}, timeout = 30)
+    except (ConnectionError, FileNotFoundError):
+        # 워커가 실행 중이 아님 (키 파일이 없으면 한 번도 시작되지 않음)
+        from PredictModel import run_predictive_modeling
+        return len(run_predictive_modeling())
+
+    if status['busy']:
+        raise RuntimeError("Model worker is busy with another job")
+    try:
+        return len(request({'op': 'train'}, timeout = PIPELINE_MODEL_TIMEOUT))
+    except TimeoutError as e:
+        raise FatalStage(f"{e} (the worker keeps training)")
+
+def stage_grading(inputs):
+    from GradePredictions import supabase, load_price_index, run_grading
+    if supabase is None:
+        raise RuntimeError("Supabase client is not connected")
+    return run_grading(supabase, load_price_index())
+
+def stage_news(inputs):
+    from DataPipeline import collect_news
+    return str(collect_news(inputs['listing']))
+
+def stage_sentiment(inputs):
+    from DataPipeline import upload_sentiment
+    return upload_sentiment(inputs['listing'], inputs['news'])
+
+# 단계 이름 >> (의존 단계, 실행 함수). 실행 함수는 {의존 단계: 출력} 을 받고 JSON 으로 저장 가능한 출력을 리턴
+STAGES = {
+    'listing': ((), stage_listing),
+    'prices': (('listing',), stage_prices),
+    'indicators': (('prices',), stage_indicators),
+    'db_sync': (('indicators',), stage_db_sync),
+    'model': (('indicators',), stage_model),
+    'grading': (('indicators',), stage_grading),
+    'news': (('listing',), stage_news),
+    'sentiment': (('listing', 'news'), stage_sentiment)
+}
+
+def upstream(targets, stages=STAGES) -> list:
+    """ targets 와 targets 가 의존하는 모든 단계 (STAGES 순서) """
+    needed = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(stages[name][0])
+    return [name for name in stages if name in needed]
+
+def downstream(names, stages=STAGES) -> set:
+    """ names 와 names 에 (간접적으로) 의존하는 모든 단계 """
+    found = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for name, (deps, _) in stages.items():
+            if name not in found and found.intersection(deps):
+                found.add(name)
+                changed = True
+    return found
+
+class PipelineState():
+    """ cache/pipeline_state/{run_id}.json 체크포인트 (단계가 끝날 때마다 원자적으로 저장) """
+    def __init__(self, run_id, state_dir=STATE_DIR):
+        self.path = Path(state_dir) / f"{run_id}.json"
+        self.lock = threading.Lock()
+        if self.path.exists():
+            self.data = json.loads(self.path.read_text(encoding='utf-8'))
+        else:
+            self.data = {'run_id': run_id, 'created_at': datetime.now().isoformat(), 'stages': {}}
+
+    def stage(self, name) -> dict:
+        return self.data['stages'].setdefault(name, {'status': 'pending', 'attempts': 0})
+
+    def update(self, name, **fields):
+        with self.lock:
+            self.stage(name).update(fields)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(self.path, self.data)
+
+    def reset(self, names):
+        for name in names:
+            self.update(name, status='pending', attempts=0, error=None, output=None)
+
+def run_stage(state, name, func, inputs, retries, retry_delay):
+    """ 작업 스레드: 실패하면 retry_delay x 2^n 초 뒤 재시도 (FatalStage 는 재시도하지 않음). 최종 상태(done / skipped / failed) 리턴 """
+    for attempt in range(retries + 1):
+        attempts = state.stage(name)['attempts'] + 1
+        state.update(name, status='running', attempts=attempts, started_at=datetime.now().isoformat())
+        start_time = time.perf_counter()
+        try:
+            with timer(name):
+                output = func(inputs)
+        except SkipStage as e:
+            state.update(name, status='skipped', error=str(e), finished_at=datetime.now().isoformat())
+            print(f"[Pipeline] {name}: skipped ({e})")
+            return 'skipped'
+        except FatalStage as e:
+            state.update(name, status='failed', error=str(e), finished_at=datetime.now().isoformat())
+            print(f"[Pipeline] {name}: attempt {attempts} failed, not retrying ({e})")
+            return 'failed'
+        except Exception as e:
+            state.update(name, status='failed', error=f"{type(e).__name__}: {e}", finished_at=datetime.now().isoformat())
+            print(f"[Pipeline] {name}: attempt {attempts} failed ({e})")
+            if attempt < retries:
+                time.sleep(retry_delay * 2 ** attempt)
+            continue
+
+        state.update(name, status='done', error=None, output=output, seconds=round(time.perf_counter() - start_time, 1),
+                     finished_at=datetime.now().isoformat())
+        print(f"[Pipeline] {name}: done ({time.perf_counter() - start_time:.1f}s)")
+        return 'done'
+    return 'failed'
+
+def run_pipeline(targets=None, run_id=None, rerun=(), workers=PIPELINE_WORKERS, retries=PIPELINE_RETRIES,
+                 retry_delay=PIPELINE_RETRY_DELAY, stages=STAGES) -> dict:
+    """
+    targets(기본: 전체 단계)와 그 의존 단계를 의존 관계 순서대로 실행
+
+    rerun: 끝난 단계라도 다시 실행할 단계 (그 뒤 단계도 다시 실행)
+    Returns: {단계: 최종 상태}
+    """
+    run_id = run_id or datetime.now().date().isoformat() + (f"_{'+'.join(sorted(targets))}" if targets else "")
+    names = upstream(targets or list(stages), stages)
+    state = PipelineState(run_id)
+    state.reset(downstream(rerun, stages).intersection(names))
+
+    status = {name: state.stage(name)['status'] for name in names}
+    for name in names:
+        # 이전 실행에서 중간에 끊긴 단계는 처음부터 다시 실행
+        if status[name] in ('running', 'failed', 'blocked'):
+            status[name] = 'pending'
+    resumed = [name for name in names if status[name] in ('done', 'skipped')]
+    print(f"[Pipeline] run {run_id}: {len(names)} stages" + (f" (resume, finished: {resumed})" if resumed else ""))
+
+    running = {}
+    with Run('pipeline', run_id) as telemetry, ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stage') as executor:
+        while True:
+            for name in names:
+                if status[name] != 'pending':
+                    continue
+                deps = stages[name][0]
+                dep_status = [status[dep] for dep in deps]
+                if any(value in ('skipped', 'failed', 'blocked') for value in dep_status):
+                    # 의존 단계를 건너뛰었으면 같이 건너뛰고, 실패했으면 실행하지 않음
+                    status[name] = 'skipped' if all(value in ('done', 'skipped') for value in dep_status) else 'blocked'
+                    state.update(name, status=status[name], error=f"dependency {dict(zip(deps, dep_status))}")
+                    print(f"[Pipeline] {name}: {status[name]} (dependency)")
+                elif all(value == 'done' for value in dep_status):
+                    inputs = {dep: state.stage(dep).get('output') for dep in deps}
+                    status[name] = 'running'
+                    running[executor.submit(run_stage, state, name, stages[name][1], inputs, retries, retry_delay)] = name
+                    print(f"[Pipeline] {name}: start")
+
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                status[running.pop(future)] = future.result()
+        telemetry.status = 'ok' if all(value in ('done', 'skipped') for value in status.values()) else 'failed'
+
+    print(f"[Pipeline] run {run_id} finished: {status}")
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'pipeline orchestrator')
+    parser.add_argument('--targets', nargs = '+', choices = list(STAGES), help = '실행할 단계 (의존 단계 포함, 기본: 전체)')
+    parser.add_argument('--rerun', nargs = '+', choices = list(STAGES), default = [], help = '끝난 단계라도 다시 실행할 단계')
+    parser.add_argument('--run-id', help = '체크포인트 이름 (기본: 오늘 날짜, --targets 가 있으면 오늘 날짜_대상 단계)')
+    parser.add_argument('--workers', type = int, default = PIPELINE_WORKERS)
+    args = parser.parse_args()
+
+    result = run_pipeline(args.targets, args.run_id, args.rerun, args.workers)
+    raise SystemExit(0 if all(value in ('done', 'skipped') for value in result.values()) else 1)
@@ -1,68 +1,260 @@
 # wiz-stock/data/PredictModel.py
 import os
+import time
 import pandas as pd
 import numpy as np
-import tensorflow as tf
-from sklearn.preprocessing import MinMaxScaler
 from pathlib import Path
-import joblib
 from datetime import datetime
-import shap
+from collections import OrderedDict
 from SupabaseHandle import insert_rows, request_table
+from FeatureScaler import FeatureScaler, load_scaler, remove_legacy_scalers
+from TrainingCache import TrainingCache, config_key, data_key
+from ModelEngines import ENGINES, LaggedFeatureEngine
+from ModelExport import TFLiteModel, load_inference_model, INFERENCE_FORMAT, TFLITE_QUANTIZATION
+from Telemetry import timer, count
+from ModelTraining import window_arrays, window_dataset, build_lstm_model, train_models, training_budget, TRAIN_JOB_BUDGET, TRAIN_SEED, DEFAULT_MODEL_HPARAMS
 
 MODEL_DIR = Path.cwd() / "models"
+# 기존 Feature 별 스케일러 pickle 위치 (스케일러는 이제 모델 옆의 {code}.scaler.npz 하나로 저장, 읽을 때 자동 변환)
 SCALER_DIR = Path.cwd() / "scalers"
 MODEL_DIR.mkdir(exist_ok=True)
-SCALER_DIR.mkdir(exist_ok=True)
 
 # 모델 학습에 사용할 Feature 선택
 FEATURES = ['Close', 'Volume', 'SMA_50', 'RSI', 'ATR', 'OBV', 'ADX', 'MACD_Soft_-100_100']
 SEQUENCE_LENGTH = 30
 
+# SEQUENCE_STREAMING=1 : 최초 학습 시 전체 시퀀스 배열 대신 tf.data 배치 스트림 사용
+SEQUENCE_STREAMING = os.getenv('SEQUENCE_STREAMING') == '1'
+
+# MODEL_ENGINE : lstm (기본, 종목별 Keras LSTM) 또는 ModelEngines 의 CPU 엔진 (ridge, gbm 등, 전 종목 통합 학습)
+MODEL_ENGINE = os.getenv('MODEL_ENGINE', 'lstm')
+
+# PREDICT_HORIZONS : 한 모델이 한 번의 예측으로 함께 내는 시점 (마지막 거래일 기준 h 거래일 뒤 종가, 기본 1 = 다음 날만)
+#                    1 은 기존 price_predict, 나머지는 predict_modeling 의 price_predict_{h}d 컬럼 (int, nullable)
+#                    예: PREDICT_HORIZONS=1,3,5 >> supabase/migrations/20261019000000_predict_modeling_horizons.sql 을 먼저 실행
+PREDICT_HORIZONS = tuple(sorted({int(h) for h in os.getenv('PREDICT_HORIZONS', '1').split(',') if h.strip()} | {1}))
+
+# 새로 학습 / 데이터가 바뀌어 이전 모델에서 이어서 학습할 때의 학습 설정
+COLD_TRAINING = {'epochs': 50, 'batch_size': 64}
+WARM_TRAINING = {'epochs': 10, 'batch_size': 32}
+
+# 학습 캐시 키에 포함되는 하이퍼파라미터 (모델 구조는 ModelTraining 코드 해시로 포함)
+TRAINING_HPARAMS = {
+    'sequence_length': SEQUENCE_LENGTH,
+    'cold': COLD_TRAINING,
+    'warm': WARM_TRAINING,
+    'streaming': SEQUENCE_STREAMING,
+    'seed': TRAIN_SEED,
+    'horizons': list(PREDICT_HORIZONS),
+    'tflite': TFLITE_QUANTIZATION if INFERENCE_FORMAT == 'tflite' else None
+}
+
+def horizon_column(horizon):
+    return 'price_predict' if horizon == 1 else f'price_predict_{horizon}d'
+
+def horizon_prices(scaler, prediction):
+    """
+    (1, 출력 수) 스케일 예측 >> {컬럼: 100원 단위 예측가}
+
+    이전에 학습된 다음 날 전용 모델(출력 1개)이면 나머지 시점은 None
+    """
+    prices = scaler.inverse_transform_feature(np.asarray(prediction).reshape(-1), 'Close')
+    return {horizon_column(h): int(round(prices[i], -2)) if i < len(prices) else None for i, h in enumerate(PREDICT_HORIZONS)}
+
 def insert_predict_rows(df):
-    df = df.replace([np.inf, -np.inf], np.nan).fillna(0)
+    # 여러 시점 예측 컬럼은 값이 없으면 0 대신 NULL
+    horizon_columns = [column for column in df.columns if column.startswith('price_predict_')]
+    df = df.replace([np.inf, -np.inf], np.nan)
+    df = df.fillna({column: 0 for column in df.columns if column not in horizon_columns})
+    for column in horizon_columns:
+        df[column] = pd.Series([None if pd.isna(value) else int(value) for value in df[column]], index=df.index, dtype=object)
     df_to_dictionary = df.to_dict('records')
     from SupabaseHandle import supabase 
     response = supabase.table('predict_modeling').insert(df_to_dictionary).execute()
     print("[+] 예측 결과를 성공적으로 DB에 업로드했습니다.")
     return response
 
-def create_sequences(data, sequence_length):
-    sequences, targets = [], []
-    for i in range(len(data) - sequence_length):
-        sequences.append(data.iloc[i:i+sequence_length].values)
-        targets.append(data['Close'].iloc[i+sequence_length])
-    return np.array(sequences), np.array(targets)
+def create_sequences(data, sequence_length, dtype=np.float32):
+    """
+    학습용 시퀀스 생성: sequences[i] = data[i:i+sequence_length], targets[i] = 다음 날 Close
 
-def build_lstm_model(input_shape):
-    units, dropout, learning_rate = 128, 0.2, 0.001
+    하나의 연속된 float32 배열 위에 sliding_window_view 를 씌운 읽기 전용 view 를 리턴 (윈도우별 복사 없음)
+    """
+    return window_arrays(data.to_numpy(dtype=dtype), sequence_length, data.columns.get_loc('Close'), dtype=dtype)
 
-    inputs = tf.keras.Input(shape=input_shape)
+def create_sequence_dataset(data, sequence_length, batch_size, shuffle=False, seed=None):
+    """ create_sequences 와 같은 (시퀀스, 타깃) 쌍을 배치 단위로 생성하는 tf.data.Dataset (3차원 배열을 만들지 않음) """
+    return window_dataset(data.to_numpy(dtype=np.float32), sequence_length, data.columns.get_loc('Close'), batch_size, shuffle=shuffle, seed=seed)
 
-    x = tf.keras.layers.LSTM(units=units, return_sequences=True)(inputs)
-    x = tf.keras.layers.Dropout(dropout)(x)
-    x = tf.keras.layers.LSTM(units=units)(x)
-    x = tf.keras.layers.Dropout(dropout)(x)
-    outputs = tf.keras.layers.Dense(units=1)(x)
+# 모델 묶음(모델 객체 순서)별 예측 tf.function. 상주 워커에서 같은 모델로 다시 예측하면 그래프를 다시 만들지 않음
+PREDICT_FUNCTION_CACHE = 32
+_predict_functions = OrderedDict()
 
-    model = tf.keras.Model(inputs=inputs, outputs=outputs)
+def predict_function(group_models):
+    """ group_models 를 한 그래프에서 호출하는 tf.function (모델 묶음이 같으면 캐시된 함수 재사용) """
+    import tensorflow as tf
 
-    optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
-    model.compile(loss='mean_squared_error', optimizer=optimizer)
-    return model
+    key = tuple(id(model) for model in group_models)
+    cached = _predict_functions.get(key)
+    # id 는 모델이 해제된 뒤 재사용될 수 있으므로 같은 객체인지 확인
+    if cached is not None and all(a is b for a, b in zip(cached[0], group_models)):
+        _predict_functions.move_to_end(key)
+        return cached[1]
 
-def run_predictive_modeling():
-    print("[+] 예측 모델링 프로세스를 시작합니다.")
+    @tf.function(reduce_retracing=True)
+    def predict_all(inputs):
+        return [model(x, training=False) for model, x in zip(group_models, inputs)]
+
+    _predict_functions[key] = (list(group_models), predict_all)
+    while len(_predict_functions) > PREDICT_FUNCTION_CACHE:
+        _predict_functions.popitem(last=False)
+    return predict_all
+
+def predict_batch(models, windows):
+    """
+    종목별 모델 예측을 하나의 tf.function 그래프로 묶어서 한 번에 실행
+
+    같은 모델 객체를 쓰는 윈도우는 하나의 배치로 합치고, 서로 다른 모델은 같은 그래프 안에서 호출하므로
+    종목 수와 관계없이 TensorFlow 호출(dispatch)은 1회. 결과는 윈도우 순서대로 (1, 출력 수) 배열 리스트
+    그래프는 모델 묶음별로 캐시 (predict_function), TFLiteModel 은 인터프리터로 바로 실행 (TensorFlow 그래프 불필요)
+    """
+    predictions = [None] * len(windows)
+    groups = {}
+    for index, (model, window) in enumerate(zip(models, windows)):
+        if isinstance(model, TFLiteModel):
+            predictions[index] = model(window)
+            continue
+        groups.setdefault(id(model), (model, []))[1].append(index)
+
+    if not groups:
+        return predictions
+
+    import tensorflow as tf
+
+    group_models = [model for model, _ in groups.values()]
+    group_inputs = [np.concatenate([windows[index] for index in indexes]).astype(np.float32) for _, indexes in groups.values()]
+
+    outputs = predict_function(group_models)([tf.constant(x) for x in group_inputs])
+
+    for (_, indexes), output in zip(groups.values(), outputs):
+        output = output.numpy()
+        for row, index in enumerate(indexes):
+            predictions[index] = output[row:row + 1]
+    return predictions
+
+def load_keras_model(model_path, model_cache=None):
+    """ model_cache(ModelWorker.ModelCache)가 있으면 캐시된 모델 사용 (파일 mtime 이 바뀐 경우에만 다시 로드) """
+    import tensorflow as tf
+
+    if model_cache is not None:
+        return model_cache.get(model_path, tf.keras.models.load_model)
+    return tf.keras.models.load_model(model_path)
+
+def model_outputs(model_path, model_cache=None) -> int:
+    """ 모델 출력 수 (이전 방식의 단일 시점 모델은 1) """
+    return int(load_keras_model(model_path, model_cache).output_shape[-1])
+
+def legacy_model_path(code):
+    """ 학습 캐시 도입 전의 모델 경로 (models/{code}.keras) """
+    return MODEL_DIR / f"{code}.keras"
+
+def remove_legacy_artifacts(code):
+    """ 학습 캐시에 새 결과가 저장된 뒤 이전 방식의 모델/스케일러 파일 정리 """
+    for path in (legacy_model_path(code), MODEL_DIR / f"{code}.scaler.npz", MODEL_DIR / f"{code}.background.npz"):
+        path.unlink(missing_ok=True)
+    remove_legacy_scalers(SCALER_DIR, code, FEATURES)
+
+def resolve_artifact(code):
+    """
+    종목의 현재 (모델 경로, 스케일러 경로). 없으면 None
+
+    학습 캐시 manifest 의 결과를 우선 사용하고, 없으면 이전 방식의 models/{code}.keras (기존 pickle 스케일러는 변환)
+    """
+    artifact_dir = TrainingCache(MODEL_DIR).current(code)
+    if artifact_dir is not None:
+        return artifact_dir / 'model.keras', artifact_dir / 'scaler.npz'
+
+    scaler_path = MODEL_DIR / f"{code}.scaler.npz"
+    if not legacy_model_path(code).exists():
+        return None
+    if not scaler_path.exists() and load_scaler(scaler_path, SCALER_DIR, code, FEATURES) is None:
+        return None
+    return legacy_model_path(code), scaler_path
+
+def load_stock_data():
+    csv_path = Path.cwd() / 'cache' / 'stock_data.csv'
     try:
-        csv_path = Path.cwd() / 'cache' / 'stock_data.csv'
         df = pd.read_csv(csv_path, dtype={'stock_code': str}, parse_dates=['Date'])
-        df = df.sort_values(['stock_code', 'Date'])
     except FileNotFoundError:
         print(f"[!] 오류: {csv_path} 파일을 찾을 수 없습니다. DataPipeline.py를 먼저 실행하세요.")
-        return
+        return None
+    return df.sort_values(['stock_code', 'Date'])
+
+def predict_latest(codes=None, model_cache=None):
+    """
+    학습 없이 저장된 모델/스케일러로 PREDICT_HORIZONS 시점 종가만 예측 (DB 업로드 없음)
+    INFERENCE_FORMAT=tflite 이면 모델 옆의 model.tflite 를 사용 (없으면 model.keras)
+
+    Returns: [{'stock_code', 'last_price', 'price_predict', 'trend_predict', 'price_predict_{h}d'...}, ...]
+    """
+    df = load_stock_data()
+    if df is None:
+        return []
+
+    items = []
+    for code in (codes or df['stock_code'].unique()):
+        artifact = resolve_artifact(code)
+        stock_df = df[df['stock_code'] == code][FEATURES].dropna()
+
+        if artifact is None or len(stock_df) < SEQUENCE_LENGTH:
+            print(f"[!] {code}: 모델 또는 데이터가 없어 예측을 건너뜁니다.")
+            continue
+
+        model_path, scaler_path = artifact
+        if model_cache is not None:
+            scaler = model_cache.get(scaler_path, FeatureScaler.load)
+        else:
+            scaler = FeatureScaler.load(scaler_path)
+
+        last_window = stock_df.iloc[-SEQUENCE_LENGTH:]
+        X_predict = scaler.transform(last_window.to_numpy())[None]
+        model = load_inference_model(model_path, model_cache) or load_keras_model(model_path, model_cache)
+        items.append((code, model, X_predict, last_window['Close'].iloc[-1], scaler))
+
+    if not items:
+        return []
+
+    predictions = predict_batch([item[1] for item in items], [item[2] for item in items])
+
+    results = []
+    for (code, _, _, last_price, scaler), prediction in zip(items, predictions):
+        prices = horizon_prices(scaler, prediction)
+        results.append({
+            'stock_code': code,
+            'last_price': float(last_price),
+            'price_predict': prices['price_predict'],
+            'trend_predict': "상승" if prices['price_predict'] > last_price else "하락",
+            **{column: price for column, price in prices.items() if column != 'price_predict'}
+        })
+    return results
+
+def run_predictive_modeling(model_cache=None):
+    """ 전체 종목 학습 + 예측 + DB 업로드. 업로드 대상 예측 결과 리스트를 리턴 """
+    if MODEL_ENGINE != 'lstm':
+        return run_engine_modeling(MODEL_ENGINE)
+
+    print("[+] 예측 모델링 프로세스를 시작합니다.")
+    df = load_stock_data()
+    if df is None:
+        return []
 
     stock_codes = df['stock_code'].unique()
     all_results = []
+    prepared = []
+    jobs = []
+    pending = {}
+    cache = TrainingCache(MODEL_DIR)
+    default_config = config_key(FEATURES, TRAINING_HPARAMS)
 
     for code in stock_codes:
         print(f"\n--- 종목 코드 처리 중: {code} ---")
@@ -74,80 +266,181 @@ def run_predictive_modeling():
             print(f"[!] {code}: 데이터가 부족하여 건너뜁니다 (필요: {SEQUENCE_LENGTH+50}, 보유: {len(stock_df)}).")
             continue
 
-        model_path = MODEL_DIR / f"{code}.keras"
-        scaler_paths = {f: SCALER_DIR / f"{code}_{f}_scaler.pkl" for f in FEATURES}
         feature_df = stock_df[FEATURES]
-        scaled_df = pd.DataFrame(index=feature_df.index)
-        scalers = {}
-        for f in FEATURES:
-            scaler = MinMaxScaler()
-            scaled_df[f] = scaler.fit_transform(feature_df[[f]])
-            scalers[f] = scaler
+        scaler = FeatureScaler(FEATURES)
+        scaled_df = pd.DataFrame(scaler.fit_transform(feature_df.to_numpy()), index=feature_df.index, columns=FEATURES)
         
         X_train_full, _ = create_sequences(scaled_df, SEQUENCE_LENGTH)
 
-        if model_path.exists():
-            print(f"[+] {code}: 기존 모델을 불러옵니다.")
-            model = tf.keras.models.load_model(model_path)
-            
-            last_trained_time = datetime.fromtimestamp(model_path.stat().st_mtime).date()
-            last_data_date = stock_df.index[-1].date()
+        # HyperSearch 결과(models/{code}/hparams.json)가 있으면 종목별 모델 구조와 학습 설정 사용 (설정 키도 달라짐)
+        searched = cache.load_hparams(code).get('hparams', {})
+        config = config_key(FEATURES, dict(TRAINING_HPARAMS, model=searched)) if searched else default_config
+        cold_training = dict(COLD_TRAINING, **{name: searched[name] for name in ('epochs', 'batch_size') if name in searched})
 
-            if last_data_date > last_trained_time:
-                print(f"[+] {code}: 새로운 데이터에 대해 추가 학습을 진행합니다.")
-                new_data_df = scaled_df[scaled_df.index.date > last_trained_time]
-                
-                if len(new_data_df) > SEQUENCE_LENGTH:
-                    X_new, y_new = create_sequences(new_data_df, SEQUENCE_LENGTH)
-                    model.fit(X_new, y_new, epochs=10, batch_size=32, verbose=0)
-                    model.save(model_path)
-            else:
-                print(f"[+] {code}: 모델이 이미 최신 상태입니다.")
+        # 학습 데이터/설정/학습 코드가 모두 같은 학습 결과가 있으면 학습을 건너뜀
+        key = data_key(config, feature_df)
+        artifact_dir = cache.lookup(code, key)
+
+        if artifact_dir is not None:
+            print(f"[+] {code}: 학습 입력이 같아 저장된 모델을 사용합니다. ({key})")
+            scaler = FeatureScaler.load(artifact_dir / 'scaler.npz')
+            source = 'hit'
         else:
-            print(f"[+] {code}: 기존 모델이 없어 새로 학습합니다.")
-            if len(X_train_full) == 0:
+            # 데이터만 바뀐 경우 이전 모델에서 이어서 학습 (새 스케일러 기준 전체 데이터로 재학습하여 모델/스케일러를 맞춤)
+            base_dir = cache.latest(code, config)
+            base_model_path = base_dir / 'model.keras' if base_dir is not None else legacy_model_path(code)
+            source = 'warm' if base_model_path.exists() else 'cold'
+
+            # 출력 수가 PREDICT_HORIZONS 와 다른 모델(이전 방식의 1일 모델 등)은 이어서 학습하지 않고 새로 학습
+            if source == 'warm' and model_outputs(base_model_path, model_cache) != len(PREDICT_HORIZONS):
+                print(f"[!] {code}: 기존 모델의 출력 수가 예측 시점 {PREDICT_HORIZONS} 와 달라 새로 학습합니다.")
+                source = 'cold'
+
+            if source == 'cold' and len(X_train_full) == 0:
                 print(f"[!] {code}: 학습용 시퀀스를 만들 수 없어 건너뜁니다.")
                 continue
-            
-            model = build_lstm_model(input_shape=(X_train_full.shape[1], X_train_full.shape[2]))
-            model.fit(X_train_full, _[:len(X_train_full)], epochs=50, batch_size=64, verbose=0)
-            model.save(model_path)
-            
-        for f, scaler in scalers.items():
-            joblib.dump(scaler, scaler_paths[f])
 
-        # 다음 날 종가 예측
-        last_sequence = scaled_df.iloc[-SEQUENCE_LENGTH:].values
-        X_predict = np.reshape(last_sequence, (1, SEQUENCE_LENGTH, len(FEATURES)))
-        
-        predicted_scaled_price = model.predict(X_predict, verbose=0)
-        predicted_price_float = scalers['Close'].inverse_transform(predicted_scaled_price)[0, 0]
-        
+            # 학습은 모든 종목의 작업을 모은 뒤 프로세스 풀에서 병렬로 실행. 결과는 임시 디렉터리에 모델과 스케일러를 함께 저장
+            staging = cache.staging_dir(code, key)
+            scaler.save(staging / 'scaler.npz')
+
+            job = {
+                'code': code,
+                'model_path': str(staging / 'model.keras'),
+                'values': scaled_df.to_numpy(dtype=np.float32),
+                'close_index': FEATURES.index('Close'),
+                'sequence_length': SEQUENCE_LENGTH,
+                'seed': TRAIN_SEED,
+                'budget': TRAIN_JOB_BUDGET,
+                'horizons': PREDICT_HORIZONS,
+                'tflite': TRAINING_HPARAMS['tflite']
+            }
+
+            if source == 'warm':
+                print(f"[+] {code}: 데이터가 바뀌어 기존 모델에서 이어서 학습합니다.")
+                jobs.append(dict(job, mode='finetune', base_model_path=str(base_model_path), streaming=False, **WARM_TRAINING))
+            else:
+                print(f"[+] {code}: 기존 모델이 없어 새로 학습합니다." + (f" (HyperSearch 설정: {searched})" if searched else ""))
+                hparams = {name: searched[name] for name in DEFAULT_MODEL_HPARAMS if name in searched}
+                jobs.append(dict(job, mode='cold', streaming=SEQUENCE_STREAMING, hparams=hparams, **cold_training))
+
+            pending[code] = {'staging': staging, 'base_dir': base_dir}
+
+        # 다음 날 종가 예측용 마지막 시퀀스 (예측은 모든 종목을 모은 뒤 한 번에 수행)
+        last_window = feature_df.iloc[-SEQUENCE_LENGTH:].to_numpy()
+        X_predict = scaler.transform(last_window)[None]
+
+        prepared.append({
+            'code': code,
+            'key': key,
+            'config': config,
+            'source': source,
+            'artifact_dir': artifact_dir,
+            'scaler': scaler,
+            'X_train_full': X_train_full,
+            'X_predict': X_predict,
+            'last_window': last_window,
+            'rows': len(feature_df),
+            'last_date': feature_df.index[-1].strftime('%Y-%m-%d'),
+            'last_real_price': feature_df['Close'].iloc[-1]
+        })
+
+    # 종목별 학습 작업 병렬 실행. 작업별 시간 제한은 전체 제한(TRAIN_BUDGET, TRAIN_DEADLINE)에서 나눠 정함
+    with timer('train_models'):
+        train_results = train_models(jobs, timeout=training_budget())
+    count('stocks_trained', len(jobs))
+
+    # 학습 결과 저장 후 모델 불러오기. 학습에 실패하면 이전 모델(과 그 스케일러)을 사용하고, 없으면 예측에서 제외
+    loaded = []
+    manifest_entries = {}
+    for item in prepared:
+        code = item['code']
+
+        if code in pending:
+            result = train_results.get(code, {'status': 'error', 'epochs_run': 0})
+            staging = pending[code]['staging']
+
+            if result['status'] in ('ok', 'budget_exceeded'):
+                tflite = result.get('tflite')
+                if tflite and tflite['status'] != 'ok':
+                    print(f"[!] {code}: TFLite 변환 결과 {tflite['status']} >> 학습 없는 예측은 keras 모델 사용 ({tflite.get('max_error', tflite.get('error'))})")
+                item['artifact_dir'] = cache.commit(staging, code, item['key'], {
+                    'config_key': item['config'],
+                    'source': item['source'],
+                    'status': result['status'],
+                    'complete': result['status'] == 'ok',
+                    'epochs_run': result['epochs_run'],
+                    'tflite': result.get('tflite'),
+                    'rows': item['rows'],
+                    'last_date': item['last_date']
+                })
+                remove_legacy_artifacts(code)
+            else:
+                cache.discard(staging)
+                base_dir = pending[code]['base_dir']
+                fallback = (base_dir / 'model.keras', base_dir / 'scaler.npz') if base_dir is not None else resolve_artifact(code)
+                if fallback is None:
+                    print(f"[!] {code}: 모델이 없어 예측을 건너뜁니다.")
+                    manifest_entries[code] = {'key': item['key'], 'source': 'failed', 'status': result['status'], 'path': None}
+                    continue
+
+                print(f"[!] {code}: 학습에 실패하여 이전 모델을 사용합니다.")
+                item['artifact_dir'] = base_dir
+                item['source'] = 'failed'
+                item['model_path'] = fallback[0]
+                item['scaler'] = FeatureScaler.load(fallback[1])
+                item['X_predict'] = item['scaler'].transform(item['last_window'])[None]
+
+        if item['artifact_dir'] is not None:
+            item['model_path'] = item['artifact_dir'] / 'model.keras'
+        print(f"[+] {code}: 모델을 불러옵니다. ({item['source']}, {item['model_path'].relative_to(MODEL_DIR).as_posix()})")
+        # 기여도 계산에 gradient 가 필요하므로 학습 실행의 예측은 keras 모델 사용 (model.tflite 는 학습 없는 예측용)
+        item['model'] = load_keras_model(item['model_path'], model_cache)
+        loaded.append(item)
+
+        manifest_entries[code] = {
+            'key': item['artifact_dir'].name if item['artifact_dir'] is not None else None,
+            'source': item['source'],
+            'path': item['artifact_dir'].relative_to(MODEL_DIR).as_posix() if item['artifact_dir'] is not None else None,
+            'rows': item['rows'],
+            'last_date': item['last_date']
+        }
+        if item['artifact_dir'] is not None:
+            cache.prune(code, in_use=[item['artifact_dir']])
+    prepared = loaded
+
+    cache.write_manifest(manifest_entries)
+    print(f"[+] 학습 캐시 manifest 저장: {cache.manifest_path}")
+
+    # 모든 종목의 PREDICT_HORIZONS 시점 종가를 한 번에 예측 (시점별 출력은 모델 1개의 마지막 층에서 함께 계산)
+    predicted_scaled_prices = []
+    if prepared:
+        start_time = time.perf_counter()
+        predicted_scaled_prices = predict_batch([item['model'] for item in prepared], [item['X_predict'] for item in prepared])
+        print(f"\n[+] {len(prepared)}개 종목 예측 완료 ({time.perf_counter() - start_time:.3f}s)")
+
+    # 모든 종목의 top_feature 를 한 번에 계산 (Attribution.ATTRIBUTION_METHOD)
+    from Attribution import explain_top_features
+    top_features = explain_top_features(prepared, FEATURES) if prepared else []
+
+    for index, (item, predicted_scaled_price) in enumerate(zip(prepared, predicted_scaled_prices)):
+        code, scaler = item['code'], item['scaler']
+        print(f"\n--- 예측 결과 정리: {code} ---")
+
         # 최종 예측가를 100 단위로 반올림
-        predicted_price = int(round(predicted_price_float , -2))
-        
+        prices = horizon_prices(scaler, predicted_scaled_price)
+        predicted_price = prices.pop('price_predict')
+
         # 등락 판단
-        last_real_price = feature_df['Close'].iloc[-1]
+        last_real_price = item['last_real_price']
         predicted_trend = "상승" if predicted_price > last_real_price else "하락"
 
-        # SHAP 분석 추가
-        top_feature = 'N/A'
-        try:
-            # SHAP 분석을 위한 배경 데이터 샘플링 (속도 향상)
-            background_data = X_train_full[np.random.choice(X_train_full.shape[0], 100, replace=False)]
-            explainer = shap.GradientExplainer(model, background_data)
-            shap_values = explainer.shap_values(X_predict)
-            
-            # Feature별 중요도 계산 (전체 기간에 대한 평균 영향력)
-            mean_abs_shap = np.mean(np.abs(shap_values[0]), axis=0)
-            top_feature_index = np.argmax(mean_abs_shap)
-            top_feature = FEATURES[top_feature_index]
-            print(f"  [SHAP] 가장 영향력 있는 Feature: {top_feature}")
-        except Exception as e:
-            print(f"  [!] SHAP 분석 중 오류 발생: {e}")
-        
+        top_feature = top_features[index]
+        print(f"  [기여도] 가장 영향력 있는 Feature: {top_feature}")
 
         print(f"[결과] 현재 종가: {last_real_price:,.0f}원 -> 예측 종가: {predicted_price:,.0f}원. 예측 등락: {predicted_trend}")
+        for column, price in prices.items():
+            print(f"  [{column}] {price:,.0f}원" if price is not None else f"  [{column}] 이전 모델이라 예측 없음")
 
         # 결과 저장
         all_results.append({
@@ -155,10 +448,81 @@ def run_predictive_modeling():
             'predict_date': datetime.now().strftime('%Y-%m-%d'),
             'trend_predict': predicted_trend,
             'price_predict': predicted_price,
-            'top_feature': top_feature
+            'top_feature': top_feature,
+            **prices
         })
 
     # 최종 결과를 데이터베이스에 업로드
+    count('predictions', len(all_results))
+    upload_predictions(all_results)
+
+    print("\n[+] 예측 모델링 프로세스를 종료합니다.")
+    return all_results
+
+def run_engine_modeling(engine_name):
+    """
+    TensorFlow 없이 동작하는 엔진(ModelEngines: ridge, gbm 등)으로 전 종목을 한 번에 학습 + 예측 + DB 업로드
+
+    결과는 LSTM 과 같은 predict_modeling 형식 (top_feature: Feature 를 평균으로 바꿨을 때 예측 변화가 가장 큰 Feature)
+    """
+    print(f"[+] 예측 모델링 프로세스를 시작합니다. (엔진: {engine_name})")
+    df = load_stock_data()
+    if df is None:
+        return []
+
+    tasks = {}
+    for code in df['stock_code'].unique():
+        stock_df = df[df['stock_code'] == code][FEATURES].dropna()
+        if len(stock_df) < SEQUENCE_LENGTH + 50:
+            print(f"[!] {code}: 데이터가 부족하여 건너뜁니다 (필요: {SEQUENCE_LENGTH+50}, 보유: {len(stock_df)}).")
+            continue
+        tasks[code] = stock_df.to_numpy(dtype=np.float64)
+
+    if not tasks:
+        print("[!] 처리된 결과가 없어 DB 업로드를 건너뜁니다.")
+        return []
+
+    engine_class = ENGINES[engine_name]
+    engine = engine_class(FEATURES, SEQUENCE_LENGTH, horizons=PREDICT_HORIZONS) if issubclass(engine_class, LaggedFeatureEngine) else engine_class(FEATURES, SEQUENCE_LENGTH)
+    start_time = time.perf_counter()
+    engine.fit(tasks)
+    print(f"[+] {len(tasks)}개 종목 통합 학습 완료 ({time.perf_counter() - start_time:.2f}s)")
+
+    codes = list(tasks)
+    ends = [len(tasks[code]) - 1 for code in codes]
+    start_time = time.perf_counter()
+    if hasattr(engine, 'predict_horizons'):
+        predicted_prices = [engine.predict_horizons(code, tasks[code], [end])[0] for code, end in zip(codes, ends)]
+    else:
+        predicted_prices = [engine.predict(code, tasks[code], [end]) for code, end in zip(codes, ends)]
+    top_features = engine.top_features([tasks[code] for code in codes], ends) if hasattr(engine, 'top_features') else ['N/A'] * len(codes)
+    print(f"[+] {len(codes)}개 종목 예측 완료 ({time.perf_counter() - start_time:.3f}s)")
+    engine.close()
+
+    all_results = []
+    for code, end, predicted_price_floats, top_feature in zip(codes, ends, predicted_prices, top_features):
+        prices = {horizon_column(h): int(round(predicted_price_floats[i], -2)) if i < len(predicted_price_floats) else None for i, h in enumerate(PREDICT_HORIZONS)}
+        predicted_price = prices.pop('price_predict')
+        last_real_price = tasks[code][end, FEATURES.index('Close')]
+        predicted_trend = "상승" if predicted_price > last_real_price else "하락"
+        print(f"[결과] {code} 현재 종가: {last_real_price:,.0f}원 -> 예측 종가: {predicted_price:,.0f}원. 예측 등락: {predicted_trend} (top_feature: {top_feature})")
+
+        all_results.append({
+            'stock_code': code,
+            'predict_date': datetime.now().strftime('%Y-%m-%d'),
+            'trend_predict': predicted_trend,
+            'price_predict': predicted_price,
+            'top_feature': top_feature,
+            **prices
+        })
+
+    upload_predictions(all_results)
+
+    print("\n[+] 예측 모델링 프로세스를 종료합니다.")
+    return all_results
+
+def upload_predictions(all_results):
+    """ DB 에 없는 (stock_code, predict_date) 예측만 predict_modeling 에 업로드 """
     if all_results:
         results_df = pd.DataFrame(all_results)
         try:
@@ -184,7 +548,6 @@ def run_predictive_modeling():
     else:
         print("[!] 처리된 결과가 없어 DB 업로드를 건너뜁니다.")
 
-    print("\n[+] 예측 모델링 프로세스를 종료합니다.")
 
 if __name__ == "__main__":
     run_predictive_modeling()
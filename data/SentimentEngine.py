@@ -0,0 +1,264 @@
+import os
+import re
+import json
+import time
+import joblib
+import requests
+from pathlib import Path
+from NewsDedup import article_body
+from NewsJournal import NewsJournal
+from Telemetry import count
+
+# 로컬 엔진 분류기 저장 경로
+CLASSIFIER_PATH = Path.cwd() / 'models' / 'sentiment_classifier.joblib'
+
+# Gemini 요청 설정 (NewsFixtureServer.py 같은 로컬 대체 서버로 교체 가능)
+# - GEMINI_BASE_URL : 설정 시 SDK 대신 해당 주소로 Gemini REST API(generateContent) 요청
+# - GEMINI_THROTTLE : Gemini 요청 전 대기 시간(초)
+# - GEMINI_BATCH : 요청 1회에 분석하는 뉴스 수
+GEMINI_THROTTLE = 25
+GEMINI_BATCH = 25
+
+# 금융 뉴스 감성 사전 (단어, 가중치)
+POSITIVE_WORDS = {
+    '상승': 1, '급등': 2, '강세': 1, '반등': 1, '신고가': 2, '최고가': 2, '돌파': 1,
+    '호실적': 2, '흑자': 2, '사상 최대': 2, '최대 실적': 2, '어닝 서프라이즈': 2, '성장': 1,
+    '개선': 1, '회복': 1, '수혜': 1, '호재': 2, '매수': 1, '순매수': 1, '상향': 1,
+    '목표가 상향': 2, '수주': 1, '증가': 1, '기대감': 1, '훈풍': 1, '배당 확대': 1
+}
+NEGATIVE_WORDS = {
+    '하락': 1, '급락': 2, '약세': 1, '폭락': 2, '신저가': 2, '적자': 2, '부진': 1,
+    '어닝 쇼크': 2, '쇼크': 1, '감소': 1, '둔화': 1, '악화': 1, '우려': 1, '악재': 2,
+    '매도': 1, '순매도': 1, '하향': 1, '목표가 하향': 2, '손실': 1, '소송': 1,
+    '리스크': 1, '불확실성': 1, '제재': 1, '리콜': 1, '충격': 1, '감산': 1
+}
+
+class SentimentEngine():
+    """
+    뉴스 감성분석 엔진 인터페이스
+
+    score(articles) : [{'text', 'title', 'description', 'pubDate', ...}, ...]
+                      >> 같은 개수/순서의 [{'date', 'score', 'engine'}, ...] (score: 1~100, 51 이상 긍정)
+    """
+    name = 'base'
+
+    def score(self, articles: list) -> list:
+        raise NotImplementedError
+
+def to_score(probability: float) -> int:
+    """ 긍정 확률(0~1) >> 감성 점수(1~100) """
+    return min(100, max(1, int(round(1 + probability * 99))))
+
+class LocalEngine(SentimentEngine):
+    """
+    네트워크 없이 CPU에서 동작하는 감성분석 엔진
+
+    - 금융 감성 사전으로 긍정/부정 단어 가중치를 집계
+    - 학습된 분류기(train_classifier)가 있으면 제목+요약에 대한 분류기 확률을 사용
+    """
+    name = 'local'
+
+    def __init__(self, classifier_path = CLASSIFIER_PATH):
+        self.classifier = None
+
+        if classifier_path and Path(classifier_path).exists():
+            self.classifier = joblib.load(classifier_path)
+            print(f"[LocalEngine] Classifier loaded: {classifier_path}")
+
+    def lexicon_probability(self, text: str) -> float:
+        positive = sum(weight * len(re.findall(word, text)) for word, weight in POSITIVE_WORDS.items())
+        negative = sum(weight * len(re.findall(word, text)) for word, weight in NEGATIVE_WORDS.items())
+
+        # 단어가 없으면 0.5 (중립), 한쪽으로 치우칠수록 0 또는 1에 가까워짐
+        return (positive + 1) / (positive + negative + 2)
+
+    def probabilities(self, articles: list) -> list:
+        if self.classifier is not None:
+            texts = [classifier_text(article) for article in articles]
+            return list(self.classifier.predict_proba(texts)[:, 1])
+
+        return [self.lexicon_probability(f"{classifier_text(article)}\n{article_body(article.get('text', ''))}") for article in articles]
+
+    def score(self, articles: list) -> list:
+        return [
+            {'date': article.get('date'), 'score': to_score(probability), 'engine': self.name}
+            for article, probability in zip(articles, self.probabilities(articles))
+        ]
+
+class HybridEngine(SentimentEngine):
+    """
+    로컬 엔진으로 먼저 분석하고, 점수가 중립(50) 근처라 애매한 뉴스만 원격 엔진(Gemini)으로 재분석
+
+    - margin: |score - 50| < margin 이면 애매한 뉴스로 판단
+    """
+    name = 'hybrid'
+
+    def __init__(self, local_engine: SentimentEngine, remote_engine: SentimentEngine, margin: int = 20):
+        self.local_engine = local_engine
+        self.remote_engine = remote_engine
+        self.margin = margin
+
+    def score(self, articles: list) -> list:
+        results = self.local_engine.score(articles)
+        ambiguous = [index for index, result in enumerate(results) if abs(result['score'] - 50) < self.margin]
+
+        print(f"[HybridEngine] {len(articles) - len(ambiguous)} news scored locally, {len(ambiguous)} news sent to {self.remote_engine.name}")
+
+        if ambiguous:
+            remote_results = self.remote_engine.score([articles[index] for index in ambiguous])
+            for index, remote_result in zip(ambiguous, remote_results):
+                results[index] = remote_result
+
+        return results
+
+def request_gem(text: str, prompt: str, model: str = 'gemini-2.5-flash') -> str:
+    """ Get Reponse from Gemini """
+    contents = [
+        {
+            'role': 'user',
+            'parts': [f'{prompt}\n\n요청사항: {text}']
+        }
+    ]
+
+    time.sleep(float(os.getenv('GEMINI_THROTTLE', GEMINI_THROTTLE)))
+
+    base_url = os.getenv('GEMINI_BASE_URL')
+    if base_url:
+        return request_gem_rest(base_url, contents, model)
+
+    import google.generativeai as genai
+    genai.configure(api_key = os.getenv('GEMINI_API_KEY'))
+    client = genai.GenerativeModel(model)
+    response = client.generate_content(
+        contents = contents
+    )
+
+    return response.text
+
+def request_gem_rest(base_url: str, contents: list, model: str) -> str:
+    """ Gemini REST API(generateContent) 형식으로 직접 요청 """
+    body = {
+        'contents': [
+            {'role': content['role'], 'parts': [{'text': part} for part in content['parts']]}
+            for content in contents
+        ]
+    }
+
+    response = requests.post(
+        f"{base_url.rstrip('/')}/v1beta/models/{model}:generateContent",
+        params = {'key': os.getenv('GEMINI_API_KEY')},
+        json = body,
+        timeout = 120
+    )
+    response.raise_for_status()
+
+    return response.json()['candidates'][0]['content']['parts'][0]['text']
+
+class GeminiEngine(SentimentEngine):
+    """ Gemini 감성분석 엔진 (뉴스 최대 GEMINI_BATCH 개를 한 번의 요청으로 분석) """
+    name = 'gemini'
+
+    def score(self, articles):
+        """ 뉴스 본문 리스트를 Gemini로 감성분석하여 [{'date', 'score', 'engine'}, ...] 형태로 리턴 """
+        results = [article['text'] for article in articles]
+        part = '[next_news]'.join(results)
+
+        prompt_text = """
+        당신은 경제 뉴스 분석 전문가입니다.
+        아래 입력된 뉴스들에 대해 감성분석을 수행하세요.
+        각 뉴스는 문자열 "[next_news]"로 구분되어 있습니다.
+        뉴스 분석 시, 하나의 뉴스가 끝나면 다음 뉴스는 "[next_news]"로 시작합니다.
+
+        [분석 규칙]
+        1. 감성 점수 범위:
+        - 긍정(positive): 51 ~ 100점
+        - 부정(negative): 1 ~ 50점
+        2. 분석 결과는 각 뉴스의 날짜와 점수로만 표현하세요.
+        3. 반드시 무조건 JSON 배열 형식으로 출력하고, 개행 없이 한 줄로 작성하세요.
+        4. 입력된 뉴스와 같은 개수의 결과를 입력된 순서대로 출력하세요.
+
+        [출력 예시]
+        [{"date":"2025-01-01","score":51},{"date":"2025-01-02","score":45}]
+
+        뉴스 데이터:
+        """
+        # 최대 3회 시도: AI가 실수를 할 수 있음 (JSON 형식 오류, 결과 개수 불일치)
+        for challenge in range(1, 4):
+            try:
+                print(f"Challenge {challenge}")
+                count('gemini_calls')
+                prompt_result = request_gem(prompt = prompt_text, text = '[next_news]'+part)
+                prompt_result = prompt_result.strip().strip('`').replace('json', '', 1)
+
+                final_dict = json.loads(prompt_result)
+
+                if not isinstance(final_dict, list) or len(final_dict) != len(results):
+                    raise ValueError(f"Expected {len(results)} results, got {len(final_dict) if isinstance(final_dict, list) else type(final_dict)}")
+
+                print("Translate Dictionary Success!")
+                return [dict(result, engine = self.name) for result in final_dict]
+            except Exception as e:
+                print(f"Challenge {challenge} Failed: {e}")
+                if challenge == 3:
+                    raise
+
+def make_engine(name: str = 'gemini') -> SentimentEngine:
+    """
+    실행별 감성분석 엔진 선택
+
+    - gemini: 모든 뉴스를 Gemini로 분석 (기본값)
+    - local: 사전/분류기 기반 로컬 엔진만 사용 (네트워크 불필요)
+    - hybrid: 로컬 엔진으로 먼저 분석하고 애매한 뉴스만 Gemini로 분석
+    """
+    if name == 'local':
+        return LocalEngine()
+    if name == 'hybrid':
+        return HybridEngine(LocalEngine(), GeminiEngine())
+    if name != 'gemini':
+        print(f"Unknown sentiment engine '{name}', use gemini")
+    return GeminiEngine()
+
+def classifier_text(article: dict) -> str:
+    """ 분류기 입력: 네이버 API의 제목 + 요약 (페이지 메뉴 등 잡음이 없음) """
+    return f"{article.get('title', '')} {article.get('description', '')}"
+
+def load_labeled_articles(journal_dir, engine = 'gemini') -> list:
+    """ 저널에 기록된 기사 단위 Gemini 분석 결과를 학습 데이터로 사용 """
+    articles = []
+    for path in sorted(Path(journal_dir).glob('news_journal_*.jsonl')):
+        for record in NewsJournal(path).records('article'):
+            if record.get('engine', 'gemini') == engine:
+                articles.append(record)
+
+    return articles
+
+def train_classifier(articles: list, classifier_path = CLASSIFIER_PATH):
+    """ 문자 n-gram TF-IDF + 로지스틱 회귀 분류기 학습 (label: score >= 51) """
+    from sklearn.pipeline import make_pipeline
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    texts = [classifier_text(article) for article in articles]
+    labels = [1 if article['score'] >= 51 else 0 for article in articles]
+
+    if len(set(labels)) < 2:
+        raise ValueError("Both positive and negative labels are required to train the classifier")
+
+    classifier = make_pipeline(
+        TfidfVectorizer(analyzer = 'char_wb', ngram_range = (2, 4), min_df = 2, sublinear_tf = True),
+        LogisticRegression(max_iter = 1000, class_weight = 'balanced')
+    )
+    classifier.fit(texts, labels)
+
+    if classifier_path:
+        Path(classifier_path).parent.mkdir(exist_ok = True)
+        joblib.dump(classifier, classifier_path)
+        print(f"[LocalEngine] Classifier saved: {classifier_path} ({len(texts)} news)")
+
+    return classifier
+
+if __name__ == "__main__":
+    # python ./data/SentimentEngine.py : 저널의 Gemini 분석 결과로 로컬 분류기 학습
+    labeled_articles = load_labeled_articles(Path.cwd() / 'cache')
+    print(f"[LocalEngine] {len(labeled_articles)} labeled news found")
+    train_classifier(labeled_articles)
@@ -0,0 +1,251 @@
+# wiz-stock/data/Telemetry.py
+# 파이프라인 실행 기록: 단계별 시간, 최대 메모리(RSS), 처리량 카운터
+#
+# cache/telemetry/runs.jsonl : 실행 1회 = JSON 1줄 (Orchestrator 실행이 끝날 때 추가)
+#
+#   with Run('pipeline', run_id):            # 실행 기록 시작 (RSS 샘플링 스레드 포함)
+#       with timer('prices'):                # 단계 시간/최대 RSS (같은 스레드의 단계 안에서 열면 'prices/...' 하위 단계)
+#           count('price_rows', len(df))     # 현재 단계 카운터 (기록 중인 실행이 없으면 아무 것도 하지 않음)
+#
+# python ./data/Telemetry.py                 : 최근 실행 목록
+# python ./data/Telemetry.py --trend         : 단계별 시간/처리량 추이 (마지막 실행 vs 이전 실행 중앙값)
+import os
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+
+# TELEMETRY_PATH : 실행 기록 파일
+# TELEMETRY_INTERVAL : RSS 샘플링 간격(초)
+# TELEMETRY_REGRESSION : 이전 실행 중앙값 대비 이 배수 이상 느려진 단계를 회귀로 표시
+TELEMETRY_PATH = Path(os.getenv('TELEMETRY_PATH', project_root / 'cache' / 'telemetry' / 'runs.jsonl'))
+TELEMETRY_INTERVAL = float(os.getenv('TELEMETRY_INTERVAL', '0.5'))
+TELEMETRY_REGRESSION = float(os.getenv('TELEMETRY_REGRESSION', '1.5'))
+
+def rss_mb() -> float:
+    """ 현재 프로세스 + 자식 프로세스(학습 프로세스 풀 등) RSS 합계 """
+    try:
+        import psutil
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / 1024 ** 2
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# 프로세스에서 기록 중인 실행 (하나만), 스레드별 열린 단계 스택
+active = None
+local = threading.local()
+
+class Run():
+    """ 실행 1회 기록. with 블록이 끝나면 TELEMETRY_PATH 에 JSON 1줄 추가 """
+    def __init__(self, name, run_id=None, path=TELEMETRY_PATH, interval=TELEMETRY_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.open_stages = set()
+        self.stop_event = threading.Event()
+        self.status = None
+        self.record = {
+            'name': name,
+            'run_id': run_id,
+            'started_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'seconds': None,
+            'status': None,
+            'cpu_count': os.cpu_count(),
+            'peak_rss_mb': 0.0,
+            'counters': {},
+            'stages': {}
+        }
+
+    def sample(self):
+        value = rss_mb()
+        with self.lock:
+            self.record['peak_rss_mb'] = max(self.record['peak_rss_mb'], value)
+            for key in self.open_stages:
+                stage = self.record['stages'][key]
+                stage['peak_rss_mb'] = max(stage['peak_rss_mb'], value)
+
+    def sampler(self):
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        global active
+        active = self
+        self.start_time = time.perf_counter()
+        self.sample()
+        self.thread = threading.Thread(target=self.sampler, name='telemetry', daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        global active
+        self.stop_event.set()
+        self.thread.join()
+        self.sample()
+        active = None
+
+        self.record['finished_at'] = datetime.now().isoformat()
+        self.record['seconds'] = round(time.perf_counter() - self.start_time, 3)
+        self.record['status'] = 'failed' if exc_type else (self.status or 'ok')
+        self.record['peak_rss_mb'] = round(self.record['peak_rss_mb'], 1)
+        for stage in self.record['stages'].values():
+            stage['peak_rss_mb'] = round(stage['peak_rss_mb'], 1)
+            stage['seconds'] = round(stage['seconds'], 3)
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.record, ensure_ascii=False, default=str) + '\n')
+        except OSError as e:
+            print(f"[Telemetry] Write failed: {e}")
+        return False
+
+    def open_stage(self, key, parent):
+        with self.lock:
+            stage = self.record['stages'].setdefault(key, {'parent': parent, 'calls': 0, 'seconds': 0.0, 'peak_rss_mb': 0.0, 'status': 'running', 'counters': {}})
+            stage['calls'] += 1
+            stage['status'] = 'running'
+            self.open_stages.add(key)
+        self.sample()
+
+    def close_stage(self, key, seconds, status):
+        with self.lock:
+            stage = self.record['stages'][key]
+            stage['seconds'] += seconds
+            stage['status'] = status
+            self.open_stages.discard(key)
+
+    def add(self, keys, name, value):
+        with self.lock:
+            for counters in [self.record['counters']] + [self.record['stages'][key]['counters'] for key in keys]:
+                counters[name] = counters.get(name, 0) + value
+
+@contextmanager
+def timer(name):
+    """ 단계 시간 측정 (기록 중인 실행이 없으면 측정하지 않음). 같은 이름은 시간/호출 수를 합산 """
+    run = active
+    if run is None:
+        yield
+        return
+
+    stack = local.__dict__.setdefault('stack', [])
+    key = f"{stack[-1]}/{name}" if stack else name
+    run.open_stage(key, stack[-1] if stack else None)
+    stack.append(key)
+    start_time = time.perf_counter()
+    status = 'failed'
+    try:
+        yield
+        status = 'done'
+    finally:
+        stack.pop()
+        run.close_stage(key, time.perf_counter() - start_time, status)
+
+def count(name, value=1):
+    """ 실행 전체와 현재 스레드에서 열린 단계(상위 단계 포함) 카운터에 value 추가 """
+    run = active
+    if run is None:
+        return
+    run.add(getattr(local, 'stack', []), name, value)
+
+def load_runs(path=TELEMETRY_PATH, limit=20, name=None) -> list:
+    """ 최근 실행 기록 limit 개 (오래된 순) """
+    path = Path(path)
+    if not path.exists():
+        return []
+    runs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if name is None or record.get('name') == name:
+                runs.append(record)
+    return runs[-limit:]
+
+def run_rows(runs) -> list:
+    """ 실행별 요약 (시간이 가장 긴 최상위 단계 포함) """
+    rows = []
+    for record in runs:
+        top_stages = {key: stage for key, stage in record['stages'].items() if stage.get('parent') is None}
+        slowest = max(top_stages, key=lambda key: top_stages[key]['seconds'], default=None)
+        rows.append({
+            'name': record['name'],
+            'run_id': record.get('run_id'),
+            'started_at': record['started_at'][:19],
+            'status': record['status'],
+            'seconds': record['seconds'],
+            'peak_rss_mb': record['peak_rss_mb'],
+            'failed_stages': [key for key, stage in record['stages'].items() if stage['status'] == 'failed'],
+            'slowest_stage': slowest,
+            'slowest_seconds': top_stages[slowest]['seconds'] if slowest else None
+        })
+    return rows
+
+def trend_rows(runs, regression=TELEMETRY_REGRESSION) -> list:
+    """
+    단계별 마지막 실행 vs 이전 실행 중앙값
+
+    throughput: 마지막 실행에서 단계 카운터 / 단계 시간 (초당 처리량)
+    """
+    if not runs:
+        return []
+    last = runs[-1]
+    rows = []
+    for key, stage in last['stages'].items():
+        history = [record['stages'][key]['seconds'] for record in runs[:-1] if key in record['stages']]
+        median = float(np.median(history)) if history else None
+        ratio = stage['seconds'] / median if median else None
+        rows.append({
+            'stage': key,
+            'seconds': stage['seconds'],
+            'median_seconds': round(median, 3) if median is not None else None,
+            'ratio': round(ratio, 2) if ratio is not None else None,
+            'regression': bool(ratio is not None and ratio >= regression),
+            'peak_rss_mb': stage['peak_rss_mb'],
+            'throughput': {name: round(value / stage['seconds'], 2) for name, value in stage['counters'].items() if stage['seconds'] > 0},
+            'runs': len(history) + 1
+        })
+    return rows
+
+def report(limit=20, name=None, path=TELEMETRY_PATH) -> dict:
+    """ 엔드포인트/CLI 공용: {'runs': 실행별 요약, 'trend': 단계별 추이} """
+    runs = load_runs(path, limit, name)
+    return {'runs': run_rows(runs), 'trend': trend_rows(runs)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'pipeline telemetry report')
+    parser.add_argument('--limit', type = int, default = 20, help = '조회할 최근 실행 수')
+    parser.add_argument('--name', help = '실행 이름 (예: pipeline)')
+    parser.add_argument('--trend', action = 'store_true', help = '단계별 시간/처리량 추이')
+    args = parser.parse_args()
+
+    result = report(args.limit, args.name)
+    if not result['runs']:
+        print(f"[!] {TELEMETRY_PATH} 에 실행 기록이 없습니다.")
+        raise SystemExit(0)
+
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_colwidth', 60)
+    if args.trend:
+        print(f"\n[Telemetry] 단계별 추이 (마지막 실행 vs 이전 {len(result['runs']) - 1}개 실행 중앙값, 회귀 기준 x{TELEMETRY_REGRESSION})")
+        print(pd.DataFrame(result['trend']).set_index('stage').to_string())
+    else:
+        print(f"\n[Telemetry] 최근 실행 {len(result['runs'])}개")
+        print(pd.DataFrame(result['runs']).set_index('started_at').to_string())
@@ -0,0 +1,123 @@
+# wiz-stock/data/TradingCalendar.py
+# 거래일 달력: 가격 데이터(stock_data.csv)에 있는 날짜 = 거래일, 그 밖의 날짜는 평일/휴장일 규칙으로 판단
+#
+# cache/market_holidays.txt : (선택) 휴장일 목록, 한 줄에 YYYY-MM-DD 하나 (# 뒤는 주석)
+#                             가격 데이터가 아직 없는 날(오늘, 미래)의 거래일 여부에 사용
+import os
+import bisect
+from pathlib import Path
+from datetime import date, datetime, timedelta
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+
+# MARKET_HOLIDAYS_PATH : 휴장일 목록 파일 경로
+MARKET_HOLIDAYS_PATH = Path(os.getenv('MARKET_HOLIDAYS_PATH', project_root / 'cache' / 'market_holidays.txt'))
+
+def to_date(day) -> date:
+    if isinstance(day, str):
+        return date.fromisoformat(day[:10])
+    if isinstance(day, datetime):  # pd.Timestamp 포함
+        return day.date()
+    return day
+
+def load_holidays(path=MARKET_HOLIDAYS_PATH) -> set:
+    """ 휴장일 목록 (파일이 없으면 빈 집합) """
+    path = Path(path)
+    if not path.exists():
+        return set()
+    holidays = set()
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            holidays.add(date.fromisoformat(line))
+    return holidays
+
+class TradingCalendar():
+    """
+    거래일 조회 (이전/다음 거래일, N 거래일 이동)
+
+    가격 데이터의 첫 날 ~ 마지막 날 사이는 날짜별 위치표를 미리 만들어 O(1) 로 조회하고,
+    범위 밖은 주말/휴장일을 건너뛰는 규칙으로 계산 (연휴 길이만큼만 반복)
+    """
+    def __init__(self, trading_days=(), holidays=()):
+        self.holidays = frozenset(to_date(day) for day in holidays)
+        self.days = sorted(set(to_date(day) for day in trading_days) - self.holidays)
+        self.position = {day: index for index, day in enumerate(self.days)}
+
+        # floor[offset]: 첫 거래일 + offset 일 이하의 마지막 거래일 위치
+        self.floor = []
+        if self.days:
+            for offset in range((self.days[-1] - self.days[0]).days + 1):
+                day = self.days[0] + timedelta(days=offset)
+                self.floor.append(self.position[day] if day in self.position else self.floor[-1])
+
+    @classmethod
+    def from_price_index(cls, price_index: pd.Series, holidays=None):
+        """ GradePredictions.load_price_index 의 (stock_code, Date) 인덱스 >> 달력 """
+        holidays = load_holidays() if holidays is None else holidays
+        return cls(price_index.index.get_level_values('Date').unique(), holidays)
+
+    @classmethod
+    def from_csv(cls, csv_path, holidays=None):
+        holidays = load_holidays() if holidays is None else holidays
+        dates = pd.to_datetime(pd.read_csv(csv_path, usecols=['Date'])['Date']).dt.normalize().unique()
+        return cls(dates, holidays)
+
+    @property
+    def first(self):
+        return self.days[0] if self.days else None
+
+    @property
+    def last(self):
+        return self.days[-1] if self.days else None
+
+    def in_range(self, day) -> bool:
+        return bool(self.days) and self.days[0] <= day <= self.days[-1]
+
+    def is_trading_day(self, day) -> bool:
+        day = to_date(day)
+        if self.in_range(day):
+            return day in self.position
+        return day.weekday() < 5 and day not in self.holidays
+
+    def step(self, day, direction):
+        """ 범위 밖 날짜: direction(+1/-1) 방향으로 가장 가까운 거래일 (day 제외) """
+        day += timedelta(days=direction)
+        while not self.is_trading_day(day):
+            day += timedelta(days=direction)
+        return day
+
+    def on_or_before(self, day) -> date:
+        """ day 가 거래일이면 day, 아니면 직전 거래일 """
+        day = to_date(day)
+        if self.in_range(day):
+            return self.days[self.floor[(day - self.days[0]).days]]
+        return day if self.is_trading_day(day) else self.step(day, -1)
+
+    def previous(self, day) -> date:
+        """ day 이전의 마지막 거래일 (day 제외) """
+        return self.on_or_before(to_date(day) - timedelta(days=1))
+
+    def next(self, day) -> date:
+        """ day 이후의 첫 거래일 (day 제외) """
+        day = to_date(day)
+        if self.days and self.days[0] <= day < self.days[-1]:
+            return self.days[self.floor[(day - self.days[0]).days] + 1]
+        return self.step(day, 1)
+
+    def shift(self, day, count) -> date:
+        """ day 이하의 마지막 거래일에서 count 거래일 이동 (음수면 과거) """
+        day = self.on_or_before(day)
+        if day in self.position:
+            index = self.position[day] + count
+            if 0 <= index < len(self.days):
+                return self.days[index]
+        for _ in range(abs(count)):
+            day = self.next(day) if count > 0 else self.previous(day)
+        return day
+
+    def trading_days(self, start, end) -> list:
+        """ [start, end) 안의 가격 데이터 거래일 """
+        start, end = to_date(start), to_date(end)
+        return self.days[bisect.bisect_left(self.days, start):bisect.bisect_left(self.days, end)]
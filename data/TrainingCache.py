@@ -0,0 +1,167 @@
+# wiz-stock/data/TrainingCache.py
+# 학습 입력(데이터 + Feature + 하이퍼파라미터 + 학습 코드)의 해시로 모델/스케일러를 함께 보관하는 학습 캐시
+#
+# models/{code}/{key}/model.keras, scaler.npz, meta.json   : 학습 결과 1개 (디렉터리 단위로 원자적 저장)
+# models/{code}/hparams.json                               : HyperSearch 가 고른 종목별 학습 설정 (없으면 기본 설정)
+# models/manifest.json                                     : 마지막 실행에서 종목별로 사용한 결과 (hit / warm / cold / failed)
+import os
+import json
+import shutil
+import inspect
+import hashlib
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+# TRAINING_CACHE_KEEP : 종목별로 보관할 학습 결과 수 (현재 사용 중인 결과 포함)
+TRAINING_CACHE_KEEP = int(os.getenv('TRAINING_CACHE_KEEP', '2'))
+
+def code_version() -> str:
+    """ 학습 결과에 영향을 주는 학습 코드(모델 구조, 학습 루프, 시퀀스 생성)의 해시 """
+    import ModelTraining
+
+    digest = hashlib.sha256()
+    for function in (ModelTraining.build_lstm_model, ModelTraining.train_job, ModelTraining.window_arrays, ModelTraining.window_dataset):
+        digest.update(inspect.getsource(function).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+def config_key(features: list, hparams: dict) -> str:
+    """ 데이터를 제외한 학습 설정 키 (같으면 이전 모델에서 이어서 학습 가능) """
+    config = {'features': list(features), 'hparams': hparams, 'code_version': code_version()}
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def data_key(config: str, feature_df) -> str:
+    """ 학습 설정 + 학습 데이터(날짜, Feature 값) 키 """
+    digest = hashlib.sha256(config.encode('utf-8'))
+    digest.update(np.ascontiguousarray(feature_df.index.values.astype('datetime64[ns]')).tobytes())
+    digest.update(np.ascontiguousarray(feature_df.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()[:16]
+
+def write_json(path, data):
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class TrainingCache():
+    """
+    종목별 학습 결과 저장소
+
+    - lookup: 같은 키의 완료된 학습 결과가 있으면 학습을 건너뜀
+    - latest: 데이터만 바뀐 경우(설정 키가 같은 이전 결과) 이어서 학습할 기준 모델
+    - staging >> commit: 임시 디렉터리에 모델과 스케일러를 모두 쓴 뒤 os.replace 로 한 번에 교체
+    """
+    def __init__(self, model_dir):
+        self.model_dir = Path(model_dir)
+        self.manifest_path = self.model_dir / 'manifest.json'
+
+    def artifact_dir(self, code, key) -> Path:
+        return self.model_dir / code / key
+
+    @staticmethod
+    def read_meta(artifact_dir):
+        try:
+            with open(Path(artifact_dir) / 'meta.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def lookup(self, code, key):
+        """ 같은 키로 끝까지 학습된 결과 디렉터리 (없으면 None) """
+        artifact_dir = self.artifact_dir(code, key)
+        meta = self.read_meta(artifact_dir)
+        if meta and meta.get('complete') and (artifact_dir / 'model.keras').exists() and (artifact_dir / 'scaler.npz').exists():
+            return artifact_dir
+        return None
+
+    def artifacts(self, code) -> list:
+        """ 종목의 학습 결과 [(디렉터리, meta), ...] (최신순) """
+        code_dir = self.model_dir / code
+        if not code_dir.exists():
+            return []
+
+        artifacts = []
+        for artifact_dir in code_dir.iterdir():
+            meta = self.read_meta(artifact_dir) if artifact_dir.is_dir() and not artifact_dir.name.startswith('.') else None
+            if meta and (artifact_dir / 'model.keras').exists():
+                artifacts.append((artifact_dir, meta))
+        return sorted(artifacts, key=lambda artifact: artifact[1].get('created_at', ''), reverse=True)
+
+    def latest(self, code, config):
+        """ 설정 키가 같은 가장 최근 학습 결과 (데이터만 바뀐 경우 이어서 학습할 기준) """
+        for artifact_dir, meta in self.artifacts(code):
+            if meta.get('config_key') == config:
+                return artifact_dir
+        return None
+
+    def staging_dir(self, code, key) -> Path:
+        staging = self.model_dir / code / f".tmp-{key}-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        return staging
+
+    def commit(self, staging, code, key, meta: dict) -> Path:
+        """ 모델과 스케일러가 모두 쓰인 임시 디렉터리를 학습 결과 디렉터리로 교체 """
+        write_json(Path(staging) / 'meta.json', dict(meta, key=key, created_at=datetime.now().isoformat()))
+
+        artifact_dir = self.artifact_dir(code, key)
+        if artifact_dir.exists():
+            shutil.rmtree(artifact_dir)
+        os.replace(staging, artifact_dir)
+        return artifact_dir
+
+    def discard(self, staging):
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def prune(self, code, in_use, keep=TRAINING_CACHE_KEEP):
+        """ 사용 중인 결과를 제외하고 오래된 학습 결과 삭제 (종목당 keep 개 유지) """
+        in_use = {Path(path) for path in in_use}
+        for index, (artifact_dir, _) in enumerate(self.artifacts(code)):
+            if index >= keep and artifact_dir not in in_use:
+                shutil.rmtree(artifact_dir, ignore_errors=True)
+
+        for staging in (self.model_dir / code).glob('.tmp-*'):
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def hparams_path(self, code) -> Path:
+        return self.model_dir / code / 'hparams.json'
+
+    def load_hparams(self, code) -> dict:
+        """ HyperSearch 결과 {'hparams': {...}, 'val_loss', ...} (없으면 빈 dict) """
+        try:
+            with open(self.hparams_path(code), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save_hparams(self, code, result: dict):
+        self.hparams_path(code).parent.mkdir(parents=True, exist_ok=True)
+        write_json(self.hparams_path(code), dict(result, searched_at=datetime.now().isoformat()))
+
+    def load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {'stocks': {}}
+
+    def write_manifest(self, entries: dict):
+        """
+        entries: {code: {'key', 'source', 'path'(models/ 기준 상대 경로), ...}}
+        이번 실행에서 처리하지 않은 종목은 이전 기록 유지
+        """
+        manifest = self.load_manifest()
+        manifest.setdefault('stocks', {}).update(entries)
+        manifest['updated_at'] = datetime.now().isoformat()
+        manifest['last_run'] = {source: sum(1 for entry in entries.values() if entry['source'] == source) for source in ('hit', 'warm', 'cold', 'failed')}
+        write_json(self.manifest_path, manifest)
+
+    def current(self, code):
+        """ manifest 에 기록된 종목의 현재 학습 결과 디렉터리 (없으면 None) """
+        entry = self.load_manifest().get('stocks', {}).get(code)
+        if entry and entry.get('path') and (self.model_dir / entry['path'] / 'model.keras').exists():
+            return self.model_dir / entry['path']
+        return None
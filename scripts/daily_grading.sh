@@ -5,4 +5,4 @@ cd /path/to/your/project
 python data/GradePredictions.py
 
 # 또는 API 호출 방식
-# curl -X POST http://localhost:8000/stock-predict/grade-predictions
\ No newline at end of file
+# curl -X POST -H "X-Admin-Key: $ADMIN_API_KEY" http://localhost:8000/stock-predict/grade-predictions
\ No newline at end of file
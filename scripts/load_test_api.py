@@ -0,0 +1,88 @@
+# python ./scripts/load_test_api.py --url http://127.0.0.1:8000 --job news --duration 20
+# 파이프라인 작업이 실행 중일 때 API 응답 시간 측정 (서버가 실행 중이어야 함)
+#
+# 1. baseline : 작업 없이 --path 에 --concurrency 개 동시 요청을 --duration 초 동안 반복
+# 2. job      : POST /jobs/{job} 로 작업을 시작하고 같은 부하를 다시 측정
+# 작업 중 p95 가 baseline p95 x --max-ratio (최소 baseline + 50ms) 를 넘으면 실패 (종료 코드 1)
+# /jobs 는 관리자 API: 서버에 ADMIN_API_KEY 가 지정되어 있으면 --admin-key 로 같은 키를 넘김
+import os
+import time
+import asyncio
+import argparse
+import httpx
+import numpy as np
+
+async def measure(client, path, concurrency, duration):
+    """ duration 초 동안 concurrency 개 요청을 계속 보내고 응답 시간(ms)/오류 수 리턴 """
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start_time) * 1000)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return np.array(latencies), errors
+
+def summary(name, latencies, errors, duration):
+    return {
+        'phase': name,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 1),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 1),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 1),
+        'max_ms': round(float(latencies.max()), 1)
+    }
+
+async def main(args):
+    headers = {'X-Admin-Key': args.admin_key} if args.admin_key else {}
+    async with httpx.AsyncClient(base_url = args.url, timeout = 30, headers = headers) as client:
+        print(f"[+] baseline: {args.path} x {args.concurrency} ({args.duration}s)")
+        rows = [summary('baseline', *await measure(client, args.path, args.concurrency, args.duration), args.duration)]
+
+        response = await client.post(f"/jobs/{args.job}")
+        response.raise_for_status()
+        print(f"[+] job '{args.job}' started: {response.json()}")
+
+        rows.append(summary(f"job:{args.job}", *await measure(client, args.path, args.concurrency, args.duration), args.duration))
+
+        running = [job['name'] for job in (await client.get('/jobs')).json()['running']]
+        if args.job not in running:
+            print(f"[!] '{args.job}' 작업이 측정 중에 끝났습니다. --duration 을 줄이거나 더 긴 작업을 사용하세요.")
+        if args.cancel and args.job in running:
+            await client.post(f"/jobs/{args.job}/cancel")
+            print(f"[+] job '{args.job}' cancelled")
+
+    for row in rows:
+        print('  ' + ', '.join(f"{key}={value}" for key, value in row.items()))
+
+    baseline, loaded = rows
+    limit = max(baseline['p95_ms'] * args.max_ratio, baseline['p95_ms'] + 50)
+    passed = loaded['p95_ms'] <= limit and loaded['errors'] == 0
+    print(f"\n[{'+' if passed else '!'}] 작업 중 p95 {loaded['p95_ms']}ms (허용 {limit:.1f}ms), 오류 {loaded['errors']}개 >> {'PASS' if passed else 'FAIL'}")
+    return passed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'API latency load test while a pipeline job runs')
+    parser.add_argument('--url', default = 'http://127.0.0.1:8000')
+    parser.add_argument('--path', default = '/jobs', help = '측정할 GET 경로')
+    parser.add_argument('--job', default = 'news', help = '측정 중 실행할 작업 (pipeline / news / predict / grading)')
+    parser.add_argument('--concurrency', type = int, default = 20)
+    parser.add_argument('--duration', type = float, default = 10, help = '단계별 측정 시간(초)')
+    parser.add_argument('--max-ratio', type = float, default = 3, help = '허용하는 p95 증가 배수')
+    parser.add_argument('--admin-key', default = os.getenv('ADMIN_API_KEY'), help = '관리자 API 키 (X-Admin-Key)')
+    parser.add_argument('--cancel', action = 'store_true', help = '측정 후 작업 취소')
+    args = parser.parse_args()
+
+    raise SystemExit(0 if asyncio.run(main(args)) else 1)
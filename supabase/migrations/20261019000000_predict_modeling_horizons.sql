@@ -0,0 +1,5 @@
+-- 여러 시점 예측 컬럼 (data/PredictModel.py 의 PREDICT_HORIZONS)
+-- PREDICT_HORIZONS 에 1 외의 시점(3, 5)을 넣기 전에 먼저 실행. 값이 없는 예측(이전 예측, 다음 날 전용 모델)은 NULL
+alter table public.predict_modeling
+    add column if not exists price_predict_3d integer,
+    add column if not exists price_predict_5d integer;
@@ -0,0 +1,7 @@
+# python -m pytest tests
+# data/ 스크립트는 data/ 를 sys.path 에 두고 flat import 하므로 테스트도 같은 방식으로 import
+# (DB / 네이버 / Gemini / 학습된 모델 없이 실행되는 순수 로직만 테스트)
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'data'))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler
+from FeatureScaler import FeatureScaler, load_scaler, legacy_scaler_paths
+
+FEATURES = ['Open', 'Close', 'Volume']
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    values = rng.random((50, len(FEATURES))) * [1000, 1000, 1e6]
+    values[:, 2] = 7.0  # 값의 범위가 0 인 Feature
+    return values
+
+def test_matches_per_feature_minmax_scaler(values):
+    scaler = FeatureScaler(FEATURES).fit(values)
+    scaled = scaler.transform(values)
+
+    for index in range(len(FEATURES)):
+        legacy = MinMaxScaler(feature_range=(0, 1)).fit(values[:, [index]])
+        np.testing.assert_allclose(scaled[:, index], legacy.transform(values[:, [index]])[:, 0])
+        np.testing.assert_allclose(scaler.inverse_transform_feature(scaled[:, index], FEATURES[index]),
+                                   legacy.inverse_transform(scaled[:, [index]])[:, 0])
+
+def test_inverse_transform_roundtrip(values):
+    scaler = FeatureScaler(FEATURES).fit(values)
+    np.testing.assert_allclose(scaler.inverse_transform(scaler.transform(values)), values)
+
+def test_save_and_load(tmp_path, values):
+    scaler = FeatureScaler(FEATURES).fit(values)
+    path = tmp_path / 'code.scaler.npz'
+    scaler.save(path)
+
+    loaded = FeatureScaler.load(path)
+    assert loaded.feature_names == FEATURES
+    np.testing.assert_array_equal(loaded.transform(values), scaler.transform(values))
+    assert list(tmp_path.iterdir()) == [path]
+
+def test_load_scaler_converts_legacy_pickles(tmp_path, values):
+    import joblib
+
+    for index, (feature, path) in enumerate(legacy_scaler_paths(tmp_path, 'A', FEATURES).items()):
+        joblib.dump(MinMaxScaler().fit(values[:, [index]]), path)
+
+    path = tmp_path / 'A.scaler.npz'
+    scaler = load_scaler(path, tmp_path, 'A', FEATURES)
+    np.testing.assert_allclose(scaler.transform(values), FeatureScaler(FEATURES).fit(values).transform(values))
+    assert path.exists()
+    assert not any(p.exists() for p in legacy_scaler_paths(tmp_path, 'A', FEATURES).values())
+
+def test_load_scaler_missing(tmp_path):
+    assert load_scaler(tmp_path / 'B.scaler.npz', tmp_path, 'B', FEATURES) is None
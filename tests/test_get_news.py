@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from GetNews import GetNewsData, is_seen, next_watermark, load_watermarks, save_watermarks
+
+KST = timezone(timedelta(hours=9))
+
+def pub_date(hour, minute=0):
+    return datetime(2026, 10, 19, hour, minute, tzinfo=KST).strftime('%a, %d %b %Y %H:%M:%S %z')
+
+def news(link, hour, minute=0):
+    return {'link': link, 'pubDate': pub_date(hour, minute), 'title': link, 'description': ''}
+
+def test_is_seen():
+    watermark = {'pubDate': datetime(2026, 10, 19, 12, tzinfo=KST).isoformat(), 'links': ['b']}
+    assert is_seen(news('a', 11), watermark)
+    assert is_seen(news('b', 12), watermark)
+    assert not is_seen(news('c', 12), watermark)
+    assert not is_seen(news('d', 13), watermark)
+    assert not is_seen(news('a', 11), None)
+
+def test_next_watermark_keeps_links_at_same_time():
+    watermark = next_watermark([news('a', 11), news('b', 12), news('c', 12)], None)
+    assert watermark == {'pubDate': datetime(2026, 10, 19, 12, tzinfo=KST).isoformat(), 'links': ['b', 'c']}
+
+    # 같은 시각의 기사가 나중에 더 올라온 경우 링크를 합침
+    assert next_watermark([news('d', 12)], watermark)['links'] == ['b', 'c', 'd']
+    assert next_watermark([news('e', 13)], watermark)['links'] == ['e']
+    assert next_watermark([], watermark) is watermark
+
+def test_watermarks_roundtrip(tmp_path):
+    path = tmp_path / 'cache' / 'news_watermark.json'
+    assert load_watermarks(path) == {}
+    save_watermarks(path, {'삼성전자': {'pubDate': '2026-10-19T12:00:00+09:00', 'links': ['a']}})
+    assert load_watermarks(path) == {'삼성전자': {'pubDate': '2026-10-19T12:00:00+09:00', 'links': ['a']}}
+
+    path.write_text('{broken', encoding='utf-8')
+    assert load_watermarks(path) == {}
+
+class PagedNews(GetNewsData):
+    """ 네이버 검색 API 대신 최신순 기사 목록을 display 개씩 돌려주는 수집기 """
+    def __init__(self, items):
+        super().__init__(engine=object())
+        self.items = items
+        self.requests = []
+
+    def get_news_data(self, query, display=25, start=1, sort='date'):
+        self.requests.append(start)
+        return self.items[start - 1:start - 1 + display]
+
+@pytest.fixture
+def items():
+    # 최신순: 14:00 ~ 10:00, 12:00 에 두 건
+    return [news('e', 14), news('d', 13), news('c', 12), news('b', 12), news('a', 10)]
+
+def test_get_new_items_stops_at_watermark(items):
+    collector = PagedNews(items)
+    watermark = {'pubDate': datetime(2026, 10, 19, 12, tzinfo=KST).isoformat(), 'links': ['b']}
+
+    new_items = collector.get_new_items('삼성전자', watermark=watermark, display=2)
+    assert [item['link'] for item in new_items] == ['e', 'd', 'c']
+    assert collector.requests == [1, 3]
+
+def test_get_new_items_first_run_is_limited_to_max_pages(items):
+    collector = PagedNews(items)
+    new_items = collector.get_new_items('삼성전자', display=2, max_pages=1)
+    assert [item['link'] for item in new_items] == ['e', 'd']
+    assert collector.requests == [1]
+
+def test_get_new_items_skips_repeated_links_between_pages(items):
+    # 수집 중에 새 기사가 올라와 다음 페이지에 같은 기사가 다시 나오는 경우
+    collector = PagedNews(items[:2] + items[1:])
+    new_items = collector.get_new_items('삼성전자', watermark={'pubDate': datetime(2026, 10, 19, 9, tzinfo=KST).isoformat()}, display=2)
+    assert [item['link'] for item in new_items] == ['e', 'd', 'c', 'b', 'a']
@@ -0,0 +1,111 @@
+from datetime import date
+import pandas as pd
+import pytest
+from TradingCalendar import TradingCalendar
+from GradePredictions import grade_frame, grading_window, update_graded, GRADED_COLUMNS
+
+@pytest.fixture
+def price_index():
+    # 2026-10-08(목), 10-12(월), 10-13(화) 거래일 (10-09 휴장, 주말)
+    rows = [
+        ('A', '2026-10-08', 100), ('A', '2026-10-12', 110), ('A', '2026-10-13', 105),
+        ('B', '2026-10-08', 200), ('B', '2026-10-12', 190),
+    ]
+    frame = pd.DataFrame(rows, columns=['stock_code', 'Date', 'Close'])
+    frame['Date'] = pd.to_datetime(frame['Date'])
+    return frame.set_index(['stock_code', 'Date'])['Close'].sort_index()
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(['2026-10-08', '2026-10-12', '2026-10-13'], holidays=[date(2026, 10, 9)])
+
+def prediction(id, stock_code, prediction_date, predicted_trend, **columns):
+    return dict({'id': id, 'user_id': 'u', 'stock_code': stock_code, 'prediction_date': prediction_date,
+                 'predicted_trend': predicted_trend, 'is_checked': False}, **columns)
+
+def test_grade_frame(price_index, calendar):
+    pending = pd.DataFrame([
+        prediction(1, 'A', '2026-10-08', '상승'),   # 100 >> 110
+        prediction(2, 'B', '2026-10-08', '상승'),   # 200 >> 190
+        prediction(3, 'A', '2026-10-10', '하락'),   # 토요일: 기준 10-08 종가, 결과 10-12 종가
+        prediction(4, 'A', '2026-10-12', '하락'),   # 110 >> 105
+        prediction(5, 'B', '2026-10-12', '상승'),   # 다음 거래일 종가 없음 >> 채점 안 함
+    ])
+    graded = grade_frame(pending, price_index, calendar).set_index('id')
+
+    assert list(graded.index) == [1, 2, 3, 4]
+    assert list(graded['actual_trend']) == ['상승', '하락', '상승', '하락']
+    assert list(graded['result']) == [True, False, False, True]
+    assert graded['is_checked'].all()
+    assert graded['points_awarded'].isna().all()
+
+def test_grade_frame_skips_checked_and_duplicate_ids(price_index, calendar):
+    pending = pd.DataFrame([
+        prediction(1, 'A', '2026-10-08', '상승'),
+        prediction(1, 'A', '2026-10-08', '상승'),
+        prediction(2, 'A', '2026-10-08', '상승', is_checked=True),
+    ])
+    graded = grade_frame(pending, price_index, calendar)
+    assert list(graded['id']) == [1]
+
+def test_grade_frame_empty(price_index, calendar):
+    pending = pd.DataFrame([prediction(1, 'A', '2026-10-08', '상승', is_checked=True)])
+    assert grade_frame(pending, price_index, calendar).empty
+
+def test_grading_window(calendar):
+    # 오늘이 가격 데이터 이후면 마지막 거래일까지, lookback 거래일 전부터
+    assert grading_window(calendar, date(2026, 10, 15), lookback=2) == (date(2026, 10, 8), date(2026, 10, 13))
+    assert grading_window(calendar, date(2026, 10, 12), lookback=1) == (date(2026, 10, 8), date(2026, 10, 12))
+
+class RecordingClient():
+    """ supabase.table(...).update(...).in_(...).eq(...).execute() 요청 기록 """
+    def __init__(self):
+        self.requests = []
+
+    def table(self, name):
+        self.request = {'table': name, 'filters': []}
+        return self
+
+    def update(self, data):
+        self.request['data'] = data
+        return self
+
+    def in_(self, column, values):
+        self.request['filters'].append(('in', column, list(values)))
+        return self
+
+    def eq(self, column, value):
+        self.request['filters'].append(('eq', column, value))
+        return self
+
+    def execute(self):
+        self.requests.append(self.request)
+        return self
+
+def test_update_graded_sends_only_graded_columns(price_index, calendar):
+    pending = pd.DataFrame([
+        prediction(1, 'A', '2026-10-08', '상승', reasoning='memo'),
+        prediction(2, 'A', '2026-10-08', '상승', reasoning='memo'),
+        prediction(3, 'A', '2026-10-08', '상승', reasoning='memo'),
+        prediction(4, 'B', '2026-10-08', '상승', reasoning='memo'),
+    ])
+    graded = grade_frame(pending, price_index, calendar)
+    client = RecordingClient()
+    progress = []
+
+    assert update_graded(client, graded, chunk_size=2, progress=lambda done, total: progress.append((done, total))) == 4
+
+    # 채점 결과가 같은 예측끼리 chunk_size 개씩 묶어서 update (다른 컬럼은 보내지 않음)
+    assert [request['data']['actual_trend'] for request in client.requests] == ['상승', '상승', '하락']
+    assert [request['filters'][0] for request in client.requests] == [('in', 'id', [1, 2]), ('in', 'id', [3]), ('in', 'id', [4])]
+    for request in client.requests:
+        assert request['table'] == 'predict_game'
+        assert sorted(request['data']) == sorted(GRADED_COLUMNS)
+        assert ('eq', 'is_checked', False) in request['filters']
+        assert all(type(value) in (bool, str, type(None)) for value in request['data'].values())
+    assert progress == [(2, 4), (3, 4), (4, 4)]
+
+def test_update_graded_empty():
+    client = RecordingClient()
+    assert update_graded(client, pd.DataFrame()) == 0
+    assert client.requests == []
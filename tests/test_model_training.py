@@ -0,0 +1,62 @@
+from datetime import datetime
+import numpy as np
+from ModelTraining import window_arrays, seconds_until, training_budget, thread_budget
+
+def make_values(rows=30, features=3):
+    return np.arange(rows * features, dtype=np.float64).reshape(rows, features)
+
+def test_window_arrays_matches_loop():
+    values = make_values()
+    sequences, targets = window_arrays(values, 5, close_index=1)
+
+    expected_sequences = np.stack([values[i:i + 5] for i in range(len(values) - 5)])
+    expected_targets = values[5:, 1]
+    assert sequences.shape == (25, 5, 3)
+    assert sequences.dtype == np.float32
+    np.testing.assert_array_equal(sequences, expected_sequences)
+    np.testing.assert_array_equal(targets, expected_targets)
+
+def test_window_arrays_is_read_only_view():
+    sequences, _ = window_arrays(make_values(), 5, close_index=0)
+    assert not sequences.flags.writeable
+
+def test_window_arrays_horizon_targets():
+    values = make_values()
+    horizons = (1, 3, 5)
+    sequences, targets = window_arrays(values, 5, close_index=2, horizons=horizons)
+
+    # 마지막 시점(5 거래일 뒤) 종가가 있는 윈도우만
+    assert sequences.shape == (30 - 5 - 5 + 1, 5, 3)
+    assert targets.shape == (len(sequences), len(horizons))
+    for i in range(len(sequences)):
+        np.testing.assert_array_equal(sequences[i], values[i:i + 5])
+        for j, h in enumerate(horizons):
+            assert targets[i, j] == values[i + 5 - 1 + h, 2]
+
+def test_window_arrays_next_day_horizon_matches_default():
+    values = make_values()
+    sequences, targets = window_arrays(values, 5, close_index=1)
+    horizon_sequences, horizon_targets = window_arrays(values, 5, close_index=1, horizons=(1,))
+    np.testing.assert_array_equal(sequences, horizon_sequences)
+    np.testing.assert_array_equal(targets, horizon_targets[:, 0])
+
+def test_window_arrays_too_short():
+    sequences, targets = window_arrays(make_values(rows=5), 5, close_index=0)
+    assert sequences.shape == (0, 5, 3) and targets.shape == (0,)
+
+    sequences, targets = window_arrays(make_values(rows=8), 5, close_index=0, horizons=(1, 5))
+    assert sequences.shape == (0, 5, 3) and targets.shape == (0, 2)
+
+def test_seconds_until_rolls_over_to_next_day():
+    now = datetime(2026, 10, 19, 15, 30)
+    assert seconds_until('16:00', now) == 30 * 60
+    assert seconds_until('15:30', now) == 24 * 3600
+    assert seconds_until('09:00', now) == 17.5 * 3600
+
+def test_training_budget_uses_earlier_limit():
+    assert training_budget(budget=60, deadline='00:00') <= 60
+
+def test_thread_budget_never_exceeds_jobs():
+    workers, intra, inter = thread_budget(2, workers=8, threads=0)
+    assert 1 <= workers <= 2
+    assert intra >= 1 and inter >= 1
@@ -0,0 +1,34 @@
+from NewsDedup import simhash, hamming_distance, group_near_duplicates, dedup_news, MIN_LINE_LENGTH
+
+BODY = ("삼성전자가 3분기 잠정 실적을 발표했다. 매출은 전년 같은 기간보다 12% 늘었고 영업이익은 시장 예상치를 웃돌았다. "
+        "반도체 부문의 고대역폭 메모리 판매가 늘어난 것이 실적 개선을 이끌었다는 분석이 나온다.")
+OTHER = ("카카오가 새로운 인공지능 서비스를 공개했다. 회사는 메신저 안에서 바로 쓸 수 있는 대화형 비서를 연내 출시하고 "
+         "광고와 커머스 사업에도 적용할 계획이라고 밝혔다. 업계에서는 이용자 확보 경쟁이 치열해질 것으로 본다.")
+
+def test_simhash_is_stable_and_ignores_punctuation():
+    assert simhash(BODY) == simhash(BODY)
+    assert simhash(BODY) == simhash(BODY.replace('.', ' !'))
+    assert hamming_distance(simhash(BODY), simhash(OTHER)) > 3
+
+def test_group_near_duplicates():
+    republished = '[속보] ' + BODY
+    groups = group_near_duplicates([BODY, OTHER, republished, BODY])
+    assert groups == [[0, 2, 3], [1]]
+
+def test_dedup_news_keeps_first_of_each_group():
+    menu = "홈\n로그인\n구독\n"
+    items = [{'link': 'a', 'title': 't1'}, {'link': 'b', 'title': 't2'}, {'link': 'c', 'title': 't3'}]
+    texts = [menu + BODY, menu + OTHER, "다른 메뉴\n" + BODY]
+
+    representatives, representative_texts, members = dedup_news(items, texts)
+    assert [item['link'] for item in representatives] == ['a', 'b']
+    assert representative_texts == [texts[0], texts[1]]
+    assert [[item['link'] for item in group] for group in members] == [['a', 'c'], ['b']]
+
+def test_dedup_news_falls_back_to_title_and_description():
+    # 본문 추출에 실패한(짧은 줄만 있는) 기사는 제목/요약으로 비교
+    assert len("짧은 줄") < MIN_LINE_LENGTH
+    items = [{'link': 'a', 'title': '삼성전자 실적 발표', 'description': '영업이익 증가'},
+             {'link': 'b', 'title': '카카오 인공지능 비서 공개', 'description': '연내 출시'}]
+    representatives, _, _ = dedup_news(items, ["짧은 줄", "짧은 줄"])
+    assert [item['link'] for item in representatives] == ['a', 'b']
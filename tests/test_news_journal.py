@@ -0,0 +1,46 @@
+from NewsJournal import NewsJournal, recent_journals, prune_journals
+
+def article(query, link, duplicates=()):
+    return {'type': 'article', 'query': query, 'link': link, 'date': '2026-10-19', 'score': 70, 'duplicates': list(duplicates)}
+
+def test_open_run_resumes_until_committed(tmp_path):
+    journal = NewsJournal.open_run(tmp_path)
+    journal.append(article('삼성전자', 'a'))
+
+    resumed = NewsJournal.open_run(tmp_path)
+    assert resumed.path == journal.path
+    assert resumed.scored_links('삼성전자') == {'a'}
+
+    resumed.commit(1)
+    assert resumed.is_committed()
+    # 이름이 겹치지 않도록 이전 저널보다 나중 파일명으로 새 저널 생성
+    journal.path.rename(tmp_path / 'news_journal_20000101_000000.jsonl')
+    fresh = NewsJournal.open_run(tmp_path)
+    assert not fresh.path.exists()
+    assert fresh.scored_links('삼성전자') == set()
+
+def test_scored_links_include_duplicates_per_query(tmp_path):
+    journal = NewsJournal(tmp_path / 'news_journal_20261019_100000.jsonl')
+    journal.extend([article('삼성전자', 'a', ['a2', 'a3']), article('카카오', 'b'), {'type': 'dedup', 'query': '삼성전자'}])
+    assert journal.scored_links('삼성전자') == {'a', 'a2', 'a3'}
+    assert journal.scored_links('카카오') == {'b'}
+
+def test_records_skip_broken_last_line(tmp_path):
+    journal = NewsJournal(tmp_path / 'news_journal_20261019_100000.jsonl')
+    journal.append(article('삼성전자', 'a'))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "article", "query": "삼성')
+
+    assert [record['link'] for record in journal.records('article')] == ['a']
+    assert not journal.is_committed()
+
+def test_recent_journals_and_prune(tmp_path):
+    old = NewsJournal(tmp_path / 'news_journal_20261001_100000.jsonl')
+    old.commit(0)
+    unfinished = NewsJournal(tmp_path / 'news_journal_20261002_100000.jsonl')
+    unfinished.append(article('삼성전자', 'a'))
+    assert [journal.path for journal in recent_journals(tmp_path)] == [old.path, unfinished.path]
+
+    # 완료되지 않은 저널은 오래되어도 남김
+    prune_journals(tmp_path, keep_days=-1)
+    assert [journal.path for journal in recent_journals(tmp_path)] == [unfinished.path]
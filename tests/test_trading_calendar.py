@@ -0,0 +1,54 @@
+from datetime import date
+import pytest
+from TradingCalendar import TradingCalendar, load_holidays
+
+# 2026-10-05(월) ~ 2026-10-16(금), 10-09(금) 한글날 휴장
+TRADING_DAYS = ['2026-10-05', '2026-10-06', '2026-10-07', '2026-10-08', '2026-10-12',
+                '2026-10-13', '2026-10-14', '2026-10-15', '2026-10-16']
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(TRADING_DAYS, holidays=[date(2026, 10, 9), date(2026, 12, 25)])
+
+def test_on_or_before_in_range(calendar):
+    assert calendar.on_or_before(date(2026, 10, 8)) == date(2026, 10, 8)
+    assert calendar.on_or_before(date(2026, 10, 9)) == date(2026, 10, 8)
+    assert calendar.on_or_before(date(2026, 10, 11)) == date(2026, 10, 8)
+    assert calendar.on_or_before('2026-10-12') == date(2026, 10, 12)
+
+def test_next_in_range(calendar):
+    assert calendar.next(date(2026, 10, 8)) == date(2026, 10, 12)
+    assert calendar.next(date(2026, 10, 10)) == date(2026, 10, 12)
+    assert calendar.next(date(2026, 10, 5)) == date(2026, 10, 6)
+
+def test_out_of_range_uses_weekday_and_holiday_rules(calendar):
+    # 가격 데이터 마지막 날 이후: 주말 건너뜀
+    assert calendar.next(date(2026, 10, 16)) == date(2026, 10, 19)
+    assert calendar.on_or_before(date(2026, 10, 18)) == date(2026, 10, 16)
+    # 가격 데이터 첫 날 이전
+    assert calendar.previous(date(2026, 10, 5)) == date(2026, 10, 2)
+    # 범위 밖 휴장일
+    assert calendar.next(date(2026, 12, 24)) == date(2026, 12, 28)
+    assert not calendar.is_trading_day(date(2026, 12, 25))
+
+def test_holiday_in_price_data_is_dropped():
+    calendar = TradingCalendar(['2026-10-08', '2026-10-09', '2026-10-12'], holidays=[date(2026, 10, 9)])
+    assert calendar.days == [date(2026, 10, 8), date(2026, 10, 12)]
+    assert not calendar.is_trading_day(date(2026, 10, 9))
+
+def test_shift_and_trading_days(calendar):
+    assert calendar.shift(date(2026, 10, 12), -1) == date(2026, 10, 8)
+    assert calendar.shift(date(2026, 10, 11), 2) == date(2026, 10, 13)
+    assert calendar.shift(date(2026, 10, 16), 1) == date(2026, 10, 19)
+    assert calendar.trading_days(date(2026, 10, 8), date(2026, 10, 13)) == [date(2026, 10, 8), date(2026, 10, 12)]
+
+def test_empty_calendar():
+    calendar = TradingCalendar()
+    assert calendar.last is None
+    assert calendar.next(date(2026, 10, 16)) == date(2026, 10, 19)
+
+def test_load_holidays(tmp_path):
+    path = tmp_path / 'market_holidays.txt'
+    path.write_text("2026-10-09  # 한글날\n\n# 주석\n2026-12-25\n", encoding='utf-8')
+    assert load_holidays(path) == {date(2026, 10, 9), date(2026, 12, 25)}
+    assert load_holidays(tmp_path / 'missing.txt') == set()